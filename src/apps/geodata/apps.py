@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class GeodataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.geodata"
+
+    def ready(self):
+        from .signals import invalidate_geodata_cache
+
+        for model in self.get_models():
+            post_save.connect(invalidate_geodata_cache, sender=model)
+            post_delete.connect(invalidate_geodata_cache, sender=model)
@@ -0,0 +1,214 @@
+import csv
+from itertools import islice
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import translation
+from modeltranslation.settings import AVAILABLE_LANGUAGES, DEFAULT_LANGUAGE
+from modeltranslation.utils import build_localized_fieldname
+
+from project.utils.cache import bump_cache_version, get_cache_version
+
+from .models import City, Country, Region1, Region2, Region3, ZipCode
+
+NAME_FIELD = build_localized_fieldname("name", DEFAULT_LANGUAGE)
+
+
+def get_geodata_version():
+    return get_cache_version("geodata")
+
+
+def bump_geodata_version():
+    bump_cache_version("geodata")
+
+
+def get_geodata_fragment(name, parent_id, render):
+    """
+    Returns the rendered options (or bundle) of a geodata level for a parent,
+    cached for the current language until geodata changes.
+    """
+    key = "geodata:{}:{}:{}:{}".format(
+        name, parent_id, translation.get_language(), get_geodata_version()
+    )
+    return cache.get_or_set(key, render, timeout=None)
+
+
+class GeodataLoader:
+    """
+    Loads a gazetteer file (CSV or TSV with a header row) for one level of the
+    geodata hierarchy. Rows are streamed and written in chunks, so memory
+    doesn't depend on the size of the file, and loading the same file again
+    doesn't create duplicates.
+
+    Each level is identified by its name (or code, for zip codes) and its
+    parents, which are referenced by name in the default language:
+
+    - country: name
+    - region1: country, name
+    - region2: country, region1, name
+    - region3: country, region1, region2, name
+    - city: country, region1, region2, region3, name
+    - zipcode: country, region1, city, code
+
+    Names in other languages can be given with ``name_<language>`` columns.
+    """
+
+    LEVELS = {
+        "country": Country,
+        "region1": Region1,
+        "region2": Region2,
+        "region3": Region3,
+        "city": City,
+        "zipcode": ZipCode,
+    }
+
+    # Fields (besides the name or code) that identify a row of each level
+    KEY_FIELDS = {
+        "country": [],
+        "region1": ["country_id"],
+        "region2": ["country_id", "region1_id"],
+        "region3": ["country_id", "region1_id", "region2_id"],
+        "city": ["country_id", "region1_id"],
+        "zipcode": ["city_id"],
+    }
+
+    # Columns used to find the parents of each level, in hierarchical order
+    PARENTS = {
+        "country": [],
+        "region1": ["country"],
+        "region2": ["country", "region1"],
+        "region3": ["country", "region1", "region2"],
+        "city": ["country", "region1", "region2", "region3"],
+        "zipcode": ["country", "region1", "city"],
+    }
+
+    def __init__(self, level, chunk_size=5000):
+        if level not in self.LEVELS:
+            raise ValueError(f"Unknown geodata level '{level}'")
+        self.level = level
+        self.model = self.LEVELS[level]
+        self.chunk_size = chunk_size
+        self.name_field = "code" if level == "zipcode" else NAME_FIELD
+        self.key_fields = self.KEY_FIELDS[level]
+        self.stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        self._parents = {}
+
+    def load(self, file, delimiter=","):
+        reader = csv.DictReader(file, delimiter=delimiter)
+        self.translated_fields = [
+            column
+            for column in reader.fieldnames or []
+            if column.startswith("name_")
+            and column.removeprefix("name_") in AVAILABLE_LANGUAGES
+            and column != NAME_FIELD
+        ]
+        with translation.override(DEFAULT_LANGUAGE):
+            while chunk := list(islice(reader, self.chunk_size)):
+                self.load_chunk(chunk)
+        # Bulk operations don't send signals
+        bump_geodata_version()
+        return self.stats
+
+    @transaction.atomic
+    def load_chunk(self, rows):
+        values_by_key = {}
+        for row in rows:
+            values = self.get_values(row)
+            if values is None:
+                self.stats["skipped"] += 1
+                continue
+            key = tuple(values[f] for f in self.key_fields) + (values[self.name_field],)
+            values_by_key[key] = values
+
+        update_fields = [
+            f
+            for f in self.get_parent_fields() + self.translated_fields
+            if f not in self.key_fields
+        ]
+        existing = self.model.objects.filter(
+            **{f"{self.name_field}__in": {key[-1] for key in values_by_key}}
+        ).only("id", self.name_field, *self.key_fields, *update_fields)
+
+        to_update = []
+        for obj in existing:
+            key = tuple(getattr(obj, f) for f in self.key_fields) + (
+                getattr(obj, self.name_field),
+            )
+            values = values_by_key.pop(key, None)
+            if values is None:
+                continue
+            if any(getattr(obj, f) != values[f] for f in update_fields):
+                for f in update_fields:
+                    setattr(obj, f, values[f])
+                to_update.append(obj)
+            else:
+                self.stats["unchanged"] += 1
+
+        if to_update:
+            self.model.objects.bulk_update(to_update, update_fields)
+            self.stats["updated"] += len(to_update)
+        if values_by_key:
+            self.model.objects.bulk_create(
+                [self.build_object(values) for values in values_by_key.values()]
+            )
+            self.stats["created"] += len(values_by_key)
+
+    def build_object(self, values):
+        if self.level == "zipcode":
+            return self.model(**values)
+        values = dict(values)
+        # Sets both the original field and its default language translation
+        values["name"] = values.pop(NAME_FIELD)
+        return self.model(**values)
+
+    def get_parent_fields(self):
+        return [
+            f"{parent}_id"
+            for parent in self.PARENTS[self.level]
+            if parent in {f.name for f in self.model._meta.concrete_fields}
+        ]
+
+    def get_values(self, row):
+        """
+        Returns the field values of a row, or None if the row is empty or any of
+        the parents it references doesn't exist.
+        """
+        name = (row.get("code" if self.level == "zipcode" else "name") or "").strip()
+        if not name:
+            return None
+        values = {self.name_field: name}
+        for column in self.translated_fields:
+            values[column] = (row.get(column) or "").strip() or None
+
+        parent_ids = {}
+        for parent in self.PARENTS[self.level]:
+            parent_name = (row.get(parent) or "").strip()
+            if not parent_name:
+                parent_ids[f"{parent}_id"] = None
+                continue
+            parent_key = tuple(parent_ids[f] for f in self.KEY_FIELDS[parent]) + (
+                parent_name,
+            )
+            parent_id = self.get_parent_map(parent).get(parent_key)
+            if parent_id is None:
+                return None
+            parent_ids[f"{parent}_id"] = parent_id
+
+        for field in self.get_parent_fields():
+            values[field] = parent_ids[field]
+        if any(values[f] is None for f in self.key_fields):
+            return None
+        return values
+
+    def get_parent_map(self, level):
+        """
+        Returns a map from the natural key of every row of a parent level to its
+        id, loaded once per level.
+        """
+        if level not in self._parents:
+            fields = self.KEY_FIELDS[level] + [NAME_FIELD]
+            self._parents[level] = {
+                tuple(values[:-1]): values[-1]
+                for values in self.LEVELS[level].objects.values_list(*fields, "id")
+            }
+        return self._parents[level]
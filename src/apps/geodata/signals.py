@@ -0,0 +1,5 @@
+from .helpers import bump_geodata_version
+
+
+def invalidate_geodata_cache(sender, **kwargs):
+    bump_geodata_version()
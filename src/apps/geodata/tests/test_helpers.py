@@ -0,0 +1,65 @@
+import io
+
+from django.test import TestCase
+
+from apps.geodata.helpers import GeodataLoader
+from apps.geodata.models import City, Country, Region1, ZipCode
+
+
+class GeodataLoaderTestCase(TestCase):
+    def load(self, level, content, chunk_size=2):
+        return GeodataLoader(level, chunk_size=chunk_size).load(
+            io.StringIO(content), delimiter="\t"
+        )
+
+    def test_load_hierarchy(self):
+        self.load("country", "name\tname_ca\nSpain\tEspanya\nFrance\tFrança\n")
+        self.load(
+            "region1",
+            "country\tname\nSpain\tCatalonia\nSpain\tGalicia\nFrance\tBrittany\n",
+        )
+        self.load(
+            "city",
+            "country\tregion1\tname\tname_ca\n"
+            "Spain\tCatalonia\tGirona\tGirona\n"
+            "Spain\tCatalonia\tLleida\tLleida\n"
+            "Spain\tUnknown\tNowhere\t\n",
+        )
+        stats = self.load(
+            "zipcode",
+            "country\tregion1\tcity\tcode\n"
+            "Spain\tCatalonia\tGirona\t17001\n"
+            "Spain\tCatalonia\tGirona\t17002\n"
+            "Spain\tCatalonia\tLleida\t25001\n",
+        )
+
+        self.assertEqual(stats["created"], 3)
+        self.assertEqual(Country.objects.get(name="Spain").name_ca, "Espanya")
+        catalonia = Region1.objects.get(name="Catalonia")
+        self.assertEqual(catalonia.country.name, "Spain")
+        self.assertEqual(
+            list(City.objects.filter(region1=catalonia).values_list("name", flat=True)),
+            ["Girona", "Lleida"],
+        )
+        self.assertFalse(City.objects.filter(name="Nowhere").exists())
+        self.assertEqual(
+            list(
+                ZipCode.objects.filter(city__name="Girona").values_list(
+                    "code", flat=True
+                )
+            ),
+            ["17001", "17002"],
+        )
+
+    def test_load_is_idempotent(self):
+        content = "name\tname_ca\nSpain\tEspanya\nFrance\tFrança\nItaly\tItàlia\n"
+        self.load("country", content)
+        stats = self.load("country", content)
+        self.assertEqual(
+            stats, {"created": 0, "updated": 0, "unchanged": 3, "skipped": 0}
+        )
+
+        stats = self.load("country", "name\tname_ca\nSpain\tEspanya (Regne)\n")
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(Country.objects.count(), 3)
+        self.assertEqual(Country.objects.get(name="Spain").name_ca, "Espanya (Regne)")
@@ -1,13 +1,17 @@
 import json
 
 from adminsortable2.admin import SortableAdminBase, SortableStackedInline
+from django.conf import settings
 from django.contrib import admin
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.http import HttpResponse
-from django.shortcuts import get_object_or_404, render
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.html import escapejs, format_html
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 from import_export import fields, resources
 from import_export.widgets import ForeignKeyWidget, ManyToManyWidget
@@ -15,10 +19,15 @@ from modeltranslation.admin import TabbedTranslationAdmin, TranslationStackedInl
 from unfold.contrib.forms.widgets import WysiwygWidget
 
 from apps.geodata.models import Region1
-from apps.methods.mixins import prepare_method_fill_context, save_indicator_results
+from apps.methods.mixins import (
+    prepare_method_fill_context,
+    save_indicator_results,
+    save_survey_snapshot,
+)
 from apps.settings.models import LegalStructure
 from project.admin import ImportExportModelAdmin, ModelAdmin, gov_admin_site
 from project.decorators import gov_admin_register, register_with_default_templates
+from project.utils.background import run_in_background
 from project.utils.mixins import NetworkFilterMixin
 
 from .forms import (
@@ -30,8 +39,10 @@ from .forms import (
     SectionInlineForm,
 )
 from .helpers import (
-    get_form_sections,
-    get_survey_stats,
+    clone_method,
+    get_survey_render_cache_key,
+    update_campaign_comparisons,
+    update_surveys_status,
 )
 from .models import (
     Campaign,
@@ -39,18 +50,27 @@ from .models import (
     Group,
     GroupItem,
     Indicator,
+    IndicatorComparison,
     IndicatorResult,
     IndicatorsSet,
     Invitation,
     List,
     ListItem,
     Method,
+    SearchEntry,
     Section,
     Survey,
     Topic,
 )
-from .services import send_survey_status_update_email
-from .views import BalanceReviewView
+from .reports import generate_survey_reports
+from .search import SearchIndexAdminMixin
+from .services import send_survey_status_update_emails
+from .views import (
+    BalanceReviewView,
+    get_review_surveys,
+    get_status_options,
+    prepare_review_rows,
+)
 
 
 class TopicResource(resources.ModelResource):
@@ -62,8 +82,9 @@ class TopicResource(resources.ModelResource):
 @register_with_default_templates(admin.site, model=Topic)
 # Add admin views with custom templates
 @gov_admin_register(gov_admin_site, model=Topic)
-class TopicAdmin(ImportExportModelAdmin, TabbedTranslationAdmin):
+class TopicAdmin(SearchIndexAdminMixin, ImportExportModelAdmin, TabbedTranslationAdmin):
     search_fields = ["name"]
+    search_index_kind = SearchEntry.Kind.TOPIC
     autocomplete_fields = ["parent"]
 
     list_display = (
@@ -116,11 +137,15 @@ class IndicatorResource(resources.ModelResource):
 # Add admin views with custom templates
 @gov_admin_register(gov_admin_site, model=Indicator)
 class IndicatorAdmin(
-    NetworkFilterMixin, ImportExportModelAdmin, TabbedTranslationAdmin
+    NetworkFilterMixin,
+    SearchIndexAdminMixin,
+    ImportExportModelAdmin,
+    TabbedTranslationAdmin,
 ):
     autocomplete_fields = ["topics", "list_options"]
     form = IndicatorForm
     search_fields = ["code", "name"]
+    search_index_kind = SearchEntry.Kind.INDICATOR
 
     list_display = (
         "code",
@@ -211,11 +236,15 @@ class IndicatorsSetResource(resources.ModelResource):
 # Add admin views with custom templates
 @gov_admin_register(gov_admin_site, model=IndicatorsSet)
 class IndicatorsSetAdmin(
-    NetworkFilterMixin, ImportExportModelAdmin, TabbedTranslationAdmin
+    NetworkFilterMixin,
+    SearchIndexAdminMixin,
+    ImportExportModelAdmin,
+    TabbedTranslationAdmin,
 ):
     autocomplete_fields = []
     form = IndicatorsSetForm
     search_fields = ["code", "name"]
+    search_index_kind = SearchEntry.Kind.INDICATORS_SET
 
     list_display = (
         "code",
@@ -344,6 +373,20 @@ class MethodAdmin(
 
     resource_classes = [MethodResource]
 
+    actions = ["clone_methods"]
+
+    @admin.action(description=_("Clone selected methods as a new version"))
+    def clone_methods(self, request, queryset):
+        for method in queryset:
+            clone_method(
+                method, version=_("%(version)s (copy)") % {"version": method.version}
+            )
+        self.message_user(
+            request,
+            _("%(count)d methods cloned. Update the version of the new copies.")
+            % {"count": len(queryset)},
+        )
+
     def formfield_for_manytomany(self, db_field, request, **kwargs):
         if db_field.name == "external_surveys":
             kwargs["queryset"] = Method.objects.filter(
@@ -502,6 +545,22 @@ class CampaignAdmin(NetworkFilterMixin, ModelAdmin, TabbedTranslationAdmin):
     search_fields = ["name"]
     autocomplete_fields = ["previous_campaign"]
 
+    actions = ["update_comparisons"]
+
+    @admin.action(description=_("Compare with the previous campaigns"))
+    def update_comparisons(self, request, queryset):
+        # It goes through the answers of all the chain of campaigns
+        for campaign in queryset:
+            run_in_background(update_campaign_comparisons, campaign.pk)
+        self.message_user(
+            request,
+            _(
+                "The comparisons of %(count)d campaigns are being updated, they "
+                "will be ready in a few minutes."
+            )
+            % {"count": len(queryset)},
+        )
+
     def get_fieldsets(self, request, obj=None):
         return self.build_fieldsets(
             main_fields=[
@@ -517,6 +576,34 @@ class CampaignAdmin(NetworkFilterMixin, ModelAdmin, TabbedTranslationAdmin):
         )
 
 
+# Add superadmin views with default Unfold templates
+@register_with_default_templates(admin.site, model=IndicatorComparison)
+# Add admin views with custom templates
+@gov_admin_register(gov_admin_site, model=IndicatorComparison)
+class IndicatorComparisonAdmin(NetworkFilterMixin, ModelAdmin):
+    list_display = (
+        "organization",
+        "project",
+        "indicator",
+        "item",
+        "previous_value",
+        "value",
+        "delta",
+        "relative_delta",
+        "trend",
+    )
+    list_filter = ("campaign",)
+    list_select_related = ("organization", "project", "indicator")
+    search_fields = ["organization__name", "indicator__code"]
+    ordering = ("organization__name", "indicator__code", "item")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # Add superadmin views with default Unfold templates
 @register_with_default_templates(admin.site, model=Survey)
 # Add admin views with custom templates
@@ -561,18 +648,31 @@ class SurveyAdmin(ModelAdmin):
     # @method_decorator(require_GET)
     def review_survey_action(self, request, pk, **kwargs):
         if request.method == "GET":
-            method_fill_context = prepare_method_fill_context(
-                pk, None, None, None, None, request, None
+            survey = get_object_or_404(
+                Survey.objects.select_related("organization"), pk=pk
             )
-            survey = get_object_or_404(Survey, pk=pk)
-            method_fill_context.update(
-                {
-                    "survey_id": survey.id,
-                    "validate_survey": True
-                    if request.GET.get("action") == "info"
-                    else False,
-                }
+            validate_survey = request.GET.get("action") == "info"
+
+            # Reviewers open many surveys in a row, and rendering them is slow
+            cache_key = get_survey_render_cache_key(
+                survey, survey.status, validate_survey
             )
+            content = cache.get(cache_key)
+            if content is None:
+                method_fill_context = prepare_method_fill_context(
+                    pk, None, None, None, None, request, None
+                )
+                method_fill_context.update(
+                    {"survey_id": survey.id, "validate_survey": validate_survey}
+                )
+                content = render_to_string(
+                    "admin/methods/method_fill.html",
+                    method_fill_context,
+                    request=request,
+                )
+                cache.set(
+                    cache_key, content, timeout=settings.SURVEY_RENDER_CACHE_TIMEOUT
+                )
 
             if request.GET.get("action") == "edit":
                 # Display edit modal event
@@ -588,14 +688,7 @@ class SurveyAdmin(ModelAdmin):
             elif request.GET.get("action") == "info":
                 headers = {}
 
-            return HttpResponse(
-                render(
-                    request,
-                    "admin/methods/method_fill.html",
-                    method_fill_context,
-                ),
-                headers=headers,
-            )
+            return HttpResponse(content, headers=headers)
 
         elif request.method == "POST":
             action = request.POST.get("action")
@@ -610,9 +703,14 @@ class SurveyAdmin(ModelAdmin):
 
             survey.modified_date = current_date
 
-            survey.save()
+            # The survey and its results are saved together, as the report of
+            # the survey is generated from them once they are committed
+            with transaction.atomic():
+                survey.save()
 
-            save_indicator_results(survey.method.id, request, survey)
+                save_indicator_results(survey.method.id, request, survey)
+                if survey.status >= Survey.Status.CLOSED:
+                    save_survey_snapshot(survey)
 
             msg = _("Balance successfuly updated.")
 
@@ -627,54 +725,33 @@ class SurveyAdmin(ModelAdmin):
             )
 
     def survey_status_update(self, request, pk, **kwargs):
-        survey = get_object_or_404(Survey, pk=pk)
-        survey.status = int(request.POST.get("status-selection"))
-
-        current_date = timezone.now()
-        if survey.status == Survey.Status.CLOSED:
-            survey.closed_date = current_date
-        elif survey.status == Survey.Status.TECH_VALIDATED:
-            survey.validated_date = current_date
-        elif survey.status == Survey.Status.QUALITY_CHECKED:
-            survey.evaluated_date = current_date
-
-        survey.save()
-
-        email_log = None
-        notification_type = "success"
-        try:
-            result = send_survey_status_update_email(request, pk, survey.status)
-            if result:
-                email_log = _("An email to the contact has been sent.") + f"[{result}]"
-        except Exception as error:
-            email_log = str(error)
-            notification_type = "error"
-
-        survey.method.sections = get_form_sections(survey.method)
-        stats = get_survey_stats(survey, survey.method, survey.campaign)
-        survey.totalProgress = stats["totalProgress"]
-
-        status = []
-        for s in Survey.Status:
-            status.append({"id": s.value, "name": s.label})
+        get_object_or_404(Survey, pk=pk)
+        status = Survey.Status(int(request.POST.get("status-selection")))
+
+        if update_surveys_status(Survey.objects.filter(pk=pk), status):
+            run_in_background(
+                send_survey_status_update_emails,
+                [pk],
+                status,
+                request.user.pk,
+                get_language(),
+            )
+            if status == Survey.Status.QUALITY_CHECKED:
+                run_in_background(generate_survey_reports, [pk])
 
+        [survey] = prepare_review_rows([get_review_surveys().get(pk=pk)])
         msg = _("Balance status successfuly updated.")
-        if email_log:
-            msg = "".join([msg, email_log])
 
         return HttpResponse(
-            render(
-                request,
+            render_to_string(
                 "components/methods/survey_review_row.html",
-                {"survey": survey, "status": status},
+                {"survey": survey, "status": get_status_options()},
+                request=request,
             ),
             headers={
-                "HX-Trigger": "{ "
-                + '"notification": { "type": "'
-                + notification_type
-                + '", "text": "'
-                + msg
-                + '" } }',
+                "HX-Trigger": json.dumps(
+                    {"notification": {"type": "success", "text": msg}}
+                ),
             },
         )
 
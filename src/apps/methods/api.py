@@ -0,0 +1,258 @@
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max, Q
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views import View
+from django.views.decorators.gzip import gzip_page
+
+from project.utils.mixins import NetworkFilterMixin
+
+from .changes import get_gap_seq
+from .models import Change, ChangeCompaction, IndicatorResult, Survey
+
+
+class ApiError(Exception):
+    """
+    A request that can't be answered, with the message for the client and the
+    HTTP status of the response.
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(moment, position):
+    value = json.dumps([moment.isoformat(), str(position)])
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, convert):
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        moment, position = json.loads(value)
+        moment = parse_datetime(moment)
+        position = convert(position)
+    except (binascii.Error, ValueError, TypeError):
+        raise ApiError("Invalid cursor") from None
+    if moment is None:
+        raise ApiError("Invalid cursor")
+    return moment, position
+
+
+@method_decorator(gzip_page, name="dispatch")
+class CursorApiView(NetworkFilterMixin, View):
+    """
+    Read-only JSON list of the objects of a model that the user can see (see
+    NetworkFilterMixin), for external tools to sync them. Objects are sorted by
+    (updated_at, id) and paginated with a cursor, the position of the last
+    object of the previous page, so every page is a range of an index instead
+    of an OFFSET, and objects updated meanwhile show up at the end.
+
+    Query parameters:
+    - fields: comma separated fields to return (all of them by default)
+    - cursor: the "cursor" of the previous page, or of the last one to get
+      what changed since
+    - limit: objects per page, up to API_MAX_PAGE_SIZE
+    - the filters of the view, by exact value
+
+    Rows are read with values_list(), without building model instances.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    model = None
+    # Name in the response: lookup of the field
+    fields = {}
+    # Query parameter: lookup and converter of its value
+    filters = {}
+
+    def get(self, request):
+        try:
+            fields = self.get_fields(request)
+            limit = self.get_limit(request)
+            rows, cursor, more = self.get_page(
+                request,
+                self.get_queryset(request),
+                [self.fields[name] for name in fields],
+                limit,
+            )
+        except ApiError as e:
+            return JsonResponse({"error": str(e)}, status=e.status)
+
+        content = json.dumps(
+            {
+                "results": [dict(zip(fields, row, strict=True)) for row in rows],
+                "cursor": cursor,
+                "next": self.get_next_url(request, cursor) if more else None,
+            },
+            cls=DjangoJSONEncoder,
+        ).encode()
+        etag = quote_etag(hashlib.sha256(content).hexdigest())
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            content, content_type="application/json"
+        )
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_page(self, request, queryset, lookups, limit):
+        """
+        Returns the values of the objects of the page after the cursor of the
+        request, the cursor of its last object (or the same one, to sync again
+        later from there) and whether there are more.
+        """
+        cursor = request.GET.get("cursor")
+        if cursor:
+            updated_at, pk = decode_cursor(cursor, uuid.UUID)
+            queryset = queryset.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk)
+            )
+        rows = list(
+            queryset.order_by("updated_at", "id").values_list(
+                "updated_at", "id", *lookups
+            )[: limit + 1]
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            cursor = encode_cursor(rows[-1][0], rows[-1][1])
+        return [row[2:] for row in rows], cursor or None, more
+
+    def get_fields(self, request):
+        if not request.GET.get("fields"):
+            return list(self.fields)
+        fields = [name.strip() for name in request.GET["fields"].split(",")]
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(fields))
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.GET.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError("Invalid limit") from None
+        if limit < 1:
+            raise ApiError("Invalid limit")
+        return min(limit, settings.API_MAX_PAGE_SIZE)
+
+    def get_queryset(self, request):
+        queryset = self.filter_queryset_by_network(request, self.model.objects.all())
+        for param, (lookup, convert) in self.filters.items():
+            if param in request.GET:
+                try:
+                    value = convert(request.GET[param])
+                except ValueError:
+                    raise ApiError(f"Invalid {param}") from None
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_next_url(self, request, cursor):
+        query = request.GET.copy()
+        query["cursor"] = cursor
+        return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+class SurveyApiView(CursorApiView):
+    model = Survey
+    fields = {
+        "id": "id",
+        "method": "method_id",
+        "campaign": "campaign_id",
+        "organization": "organization_id",
+        "project": "project_id",
+        "status": "status",
+        "start_date": "start_date",
+        "closed_date": "closed_date",
+        "modified_date": "modified_date",
+        "validated_date": "validated_date",
+        "evaluated_date": "evaluated_date",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+    filters = {
+        "campaign": ("campaign_id", uuid.UUID),
+        "method": ("method_id", uuid.UUID),
+        "status": ("status", int),
+    }
+
+
+class IndicatorResultApiView(CursorApiView):
+    model = IndicatorResult
+    fields = {
+        "id": "id",
+        "survey": "survey_id",
+        "indicator": "indicator_id",
+        "indicator_code": "indicator__code",
+        "group_item": "group_item_id",
+        "group_2_item": "group_2_item_id",
+        "gender": "gender",
+        "is_total": "is_total",
+        "instance_number": "instance_number",
+        "value": "value",
+        "not_applicable": "not_applicable",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+    filters = {
+        "survey": ("survey_id", uuid.UUID),
+        "campaign": ("survey__campaign_id", uuid.UUID),
+        "method": ("survey__method_id", uuid.UUID),
+        "status": ("survey__status", int),
+    }
+
+
+class ChangeFeedView(CursorApiView):
+    """
+    Changes of the surveys and results after a cursor, from the change log
+    (see apps.methods.changes), in the order they were made. Deleted objects
+    are only in the feed, so consumers can sync incrementally instead of
+    downloading everything again. Pages stop before a gap in the sequence
+    that a running transaction may still fill (see get_gap_seq), so no change
+    is skipped.
+    """
+
+    model = Change
+    fields = {
+        "seq": "seq",
+        "kind": "kind",
+        "id": "object_id",
+        "operation": "operation",
+        "survey": "survey_id",
+        "method": "method_id",
+        "created_at": "created_at",
+    }
+    filters = {
+        "kind": ("kind", Change.Kind),
+        "survey": ("survey_id", uuid.UUID),
+        "method": ("method_id", uuid.UUID),
+    }
+
+    def get_page(self, request, queryset, lookups, limit):
+        seq = 0
+        if cursor := request.GET.get("cursor"):
+            _, seq = decode_cursor(cursor, int)
+            # Deletes after it may have been compacted (see compact_changes)
+            purged = ChangeCompaction.objects.aggregate(seq=Max("purged_seq"))["seq"]
+            if purged is not None and seq < purged:
+                raise ApiError("Expired cursor, sync again from the start", 410)
+
+        queryset = queryset.filter(seq__gt=seq)
+        if (gap_seq := get_gap_seq(seq)) is not None:
+            queryset = queryset.filter(seq__lt=gap_seq)
+        rows = list(queryset.order_by("seq").values_list("seq", *lookups)[: limit + 1])
+        more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = encode_cursor(timezone.now(), rows[-1][0] if rows else seq)
+        return [row[1:] for row in rows], cursor, more
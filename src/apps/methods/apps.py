@@ -1,6 +1,75 @@
 from django.apps import AppConfig
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
 
 
 class MethodsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.methods"
+
+    def ready(self):
+        from .models import Group, Indicator, IndicatorsSet, List, Method, Section
+        from .signals import (
+            changed_object_deleted,
+            changed_object_saved,
+            organization_publication_saved,
+            project_publication_saved,
+            search_index_migrated,
+            search_object_saved,
+            search_topics_changed,
+            structure_changed,
+            structure_saved,
+            survey_report_saved,
+            survey_saved,
+        )
+
+        post_save.connect(survey_saved, sender="methods.Survey")
+        post_delete.connect(survey_saved, sender="methods.Survey")
+        # The reports of the surveys (see apps.methods.reports)
+        post_save.connect(survey_report_saved, sender="methods.Survey")
+        post_save.connect(
+            organization_publication_saved, sender="organizations.Organization"
+        )
+        post_save.connect(project_publication_saved, sender="organizations.Project")
+
+        # The change log of the surveys and results (see apps.methods.changes)
+        for model in ["Survey", "IndicatorResult"]:
+            post_save.connect(changed_object_saved, sender=f"methods.{model}")
+            post_delete.connect(changed_object_deleted, sender=f"methods.{model}")
+
+        # The structure of the methods (see get_method_structure_version)
+        for model in [
+            "Method",
+            "Section",
+            "IndicatorsSet",
+            "Indicator",
+            "List",
+            "ListItem",
+            "Group",
+            "GroupItem",
+        ]:
+            post_save.connect(structure_saved, sender=f"methods.{model}")
+            # Before deleting them, while they are still related to the methods
+            pre_delete.connect(structure_saved, sender=f"methods.{model}")
+        for through in [
+            Method.indicators.through,
+            Method.indicators_sets.through,
+            Section.indicators.through,
+            Section.indicators_sets.through,
+            IndicatorsSet.indicators.through,
+            List.items.through,
+            Group.items.through,
+        ]:
+            m2m_changed.connect(structure_changed, sender=through)
+
+        # The catalogue search index (see apps.methods.search)
+        for model in ["Indicator", "IndicatorsSet", "Topic"]:
+            post_save.connect(search_object_saved, sender=f"methods.{model}")
+            post_delete.connect(search_object_saved, sender=f"methods.{model}")
+        m2m_changed.connect(search_topics_changed, sender=Indicator.topics.through)
+        post_migrate.connect(search_index_migrated, sender=self)
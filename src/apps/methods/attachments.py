@@ -0,0 +1,264 @@
+import io
+import mimetypes
+import os
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import storages
+from django.db import transaction
+from django.db.models import CharField, Exists, OuterRef
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from project.utils.background import run_in_background
+
+from .models import Attachment, IndicatorResult
+
+logger = structlog.get_logger(__name__)
+
+CLEANUP_CACHE_KEY = "attachments:cleanup"
+
+
+class AttachmentError(Exception):
+    """
+    An upload that can't be accepted, with the message for the user and the
+    HTTP status of the response.
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class StreamReader(io.RawIOBase):
+    """
+    Reads at most ``length`` bytes of a stream, like the body of a request,
+    counting them, so storages can copy it in chunks without holding it in
+    memory.
+    """
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.size = length
+        self.remaining = length
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(min(len(buffer), self.remaining))
+        size = len(data)
+        buffer[:size] = data
+        self.remaining -= size
+        self.count += size
+        return size
+
+
+class PartsReader(io.RawIOBase):
+    """
+    Reads the parts of an upload one after the other, opening each of them
+    only while it's read.
+    """
+
+    def __init__(self, storage, names, size):
+        self.storage = storage
+        self.names = list(names)
+        self.size = size
+        self.part = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.names or self.part:
+            if self.part is None:
+                self.part = self.storage.open(self.names.pop(0), "rb")
+            data = self.part.read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                return len(data)
+            self.part.close()
+            self.part = None
+        return 0
+
+    def close(self):
+        if self.part is not None:
+            self.part.close()
+        super().close()
+
+
+def get_attachments_storage():
+    return storages["attachments"]
+
+
+def get_parts_dir(attachment_id):
+    return f"attachments/parts/{attachment_id}"
+
+
+def get_part_name(attachment_id, offset):
+    # Zero padded, so they sort by their offset
+    return f"{get_parts_dir(attachment_id)}/{offset:015d}"
+
+
+def create_attachment(indicator, name, size, user=None, token=""):
+    """
+    Starts the upload of a file for an attachment indicator, checking it's
+    allowed. Its content type is guessed from its name.
+    """
+    name = os.path.basename(name or "").strip()
+    extension = os.path.splitext(name)[1].lstrip(".").lower()
+    if extension not in settings.ATTACHMENT_EXTENSIONS:
+        raise AttachmentError(
+            _("Files of this type can't be attached. Allowed types: %(types)s")
+            % {"types": ", ".join(settings.ATTACHMENT_EXTENSIONS)}
+        )
+    if size <= 0:
+        raise AttachmentError(_("The file is empty."))
+    if size > settings.ATTACHMENT_MAX_SIZE:
+        raise AttachmentError(
+            _("The file is too big. The maximum size is %(size)d MB.")
+            % {"size": settings.ATTACHMENT_MAX_SIZE // (1024 * 1024)},
+            status=413,
+        )
+
+    attachment = Attachment.objects.create(
+        indicator=indicator,
+        created_by=user,
+        token=token,
+        name=name[:255],
+        content_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        size=size,
+    )
+    schedule_attachments_cleanup()
+    return attachment
+
+
+def receive_chunk(attachment_id, offset, stream, length):
+    """
+    Stores the chunk of an upload that starts at ``offset`` streaming it from
+    ``stream``, and joins the parts once every chunk is received. Chunks must
+    be sent in order, so an interrupted upload is resumed from the offset of
+    the attachment. Returns the attachment.
+    """
+    storage = get_attachments_storage()
+    with transaction.atomic():
+        # Locked, so the same chunk isn't stored twice at the same time
+        attachment = Attachment.objects.select_for_update().get(pk=attachment_id)
+        if attachment.status != Attachment.Status.UPLOADING:
+            raise AttachmentError(_("The file is already uploaded."), status=409)
+        if offset != attachment.offset:
+            raise AttachmentError(_("Unexpected chunk offset."), status=409)
+        if length <= 0 or length > settings.ATTACHMENT_CHUNK_SIZE:
+            raise AttachmentError(_("Invalid chunk size."), status=413)
+        if offset + length > attachment.size:
+            raise AttachmentError(_("The chunk exceeds the file size."), status=413)
+
+        name = get_part_name(attachment.pk, offset)
+        # Left by an interrupted request
+        storage.delete(name)
+        reader = StreamReader(stream, length)
+        storage.save(name, File(reader, name=name))
+        if reader.count != length:
+            storage.delete(name)
+            raise AttachmentError(_("The chunk is incomplete."))
+
+        attachment.offset += length
+        if attachment.offset == attachment.size:
+            attachment.status = Attachment.Status.UPLOADED
+            run_in_background(assemble_attachment, attachment.pk)
+        attachment.save(update_fields=["offset", "status", "updated_at"])
+    return attachment
+
+
+def assemble_attachment(attachment_id):
+    """
+    Joins the parts of an uploaded attachment into its file, streaming them,
+    and deletes them.
+    """
+    attachment = Attachment.objects.get(pk=attachment_id)
+    if attachment.status != Attachment.Status.UPLOADED:
+        return
+    storage = get_attachments_storage()
+    parts_dir = get_parts_dir(attachment.pk)
+    names = [f"{parts_dir}/{name}" for name in sorted(storage.listdir(parts_dir)[1])]
+    with PartsReader(storage, names, attachment.size) as reader:
+        attachment.path = storage.save(
+            "attachments/{:%Y/%m}/{}/{}".format(
+                attachment.created_at, attachment.pk, attachment.name
+            ),
+            File(reader),
+        )
+    attachment.status = Attachment.Status.COMPLETE
+    attachment.save(update_fields=["path", "status", "updated_at"])
+    delete_parts(storage, attachment.pk)
+
+
+def delete_parts(storage, attachment_id):
+    parts_dir = get_parts_dir(attachment_id)
+    try:
+        names = storage.listdir(parts_dir)[1]
+    except FileNotFoundError:
+        return
+    for name in names:
+        storage.delete(f"{parts_dir}/{name}")
+
+
+def get_answer_attachment(value, indicator, survey, user=None, token=""):
+    """
+    Returns the uploaded attachment an answer refers to, or None if it isn't an
+    attachment of the indicator that can be answered in the survey: already in
+    it, or not in any survey yet and uploaded by the same user or with the same
+    invitation token.
+    """
+    try:
+        attachment = Attachment.objects.get(pk=value, indicator=indicator)
+    except (Attachment.DoesNotExist, ValidationError):
+        return None
+    if attachment.status == Attachment.Status.UPLOADING:
+        return None
+    if attachment.survey_id is None:
+        uploaded_by_user = user is not None and attachment.created_by_id == user.pk
+        uploaded_with_token = bool(token) and attachment.token == token
+        if not (uploaded_by_user or uploaded_with_token):
+            return None
+    elif attachment.survey_id != survey.pk:
+        return None
+    return attachment
+
+
+def schedule_attachments_cleanup():
+    # At most once per interval
+    if cache.add(CLEANUP_CACHE_KEY, True, settings.ATTACHMENT_CLEANUP_INTERVAL):
+        run_in_background(clean_attachments)
+
+
+def clean_attachments():
+    """
+    Deletes the uploads that weren't finished before they expired, and the
+    uploaded attachments no answer refers to anymore (never saved, or
+    replaced), with their files. Returns the number of deleted attachments.
+    """
+    limit = timezone.now() - timedelta(seconds=settings.ATTACHMENT_EXPIRY)
+    answered = IndicatorResult.objects.filter(
+        indicator=OuterRef("indicator"),
+        value=Cast(OuterRef("pk"), output_field=CharField()),
+    )
+    attachments = Attachment.objects.filter(updated_at__lt=limit).exclude(
+        Exists(answered)
+    )
+    storage = get_attachments_storage()
+    count = 0
+    for attachment in attachments.iterator():
+        delete_parts(storage, attachment.pk)
+        if attachment.path:
+            storage.delete(attachment.path)
+        attachment.delete()
+        count += 1
+    logger.info("attachments_cleaned", count=count)
+    return count
@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, F, Max, OuterRef, Value, Window
+from django.db.models.functions import Lag
+from django.utils import timezone
+
+from project.utils.background import run_in_background
+
+from .models import Change, ChangeCompaction, IndicatorResult, Survey
+
+logger = structlog.get_logger(__name__)
+
+COMPACTION_CACHE_KEY = "changes:compaction"
+
+# Changes recorded in the current collect_changes() block, if any
+pending_changes = ContextVar("pending_changes", default=None)
+
+
+def get_change(instance, operation):
+    """
+    Returns the change of the log (not saved) of an operation on a survey or
+    an indicator result.
+    """
+    if isinstance(instance, Survey):
+        return Change(
+            kind=Change.Kind.SURVEY,
+            object_id=instance.pk,
+            operation=operation,
+            survey_id=instance.pk,
+            method_id=instance.method_id,
+        )
+    # Without loading the survey, if it isn't (see write_changes)
+    return Change(
+        kind=Change.Kind.RESULT,
+        object_id=instance.pk,
+        operation=operation,
+        survey_id=instance.survey_id,
+        method_id=instance.survey.method_id
+        if IndicatorResult.survey.is_cached(instance)
+        else None,
+    )
+
+
+def record_changes(changes):
+    # Written at the end of the collect_changes() block, or right away
+    pending = pending_changes.get()
+    if pending is None:
+        write_changes(changes)
+    else:
+        pending.extend(changes)
+
+
+@contextmanager
+def collect_changes():
+    """
+    Collects the changes recorded in the block, like the ones of the signals
+    of the surveys and results, and writes them with a single INSERT at its
+    end, so saving a form adds one query instead of one for each answer.
+    Nothing is written if the block fails.
+    """
+    if pending_changes.get() is not None:
+        yield
+        return
+
+    pending = []
+    token = pending_changes.set(pending)
+    try:
+        yield
+    finally:
+        pending_changes.reset(token)
+    write_changes(merge_changes(pending))
+
+
+def merge_changes(changes):
+    # The last change of each object, as an insert if it was inserted in the
+    # block, or none if it was also deleted
+    merged = {}
+    for change in changes:
+        previous = merged.pop((change.kind, change.object_id), None)
+        if previous is not None and previous.operation == Change.Operation.INSERT:
+            if change.operation == Change.Operation.DELETE:
+                continue
+            change.operation = Change.Operation.INSERT
+        merged[(change.kind, change.object_id)] = change
+    return list(merged.values())
+
+
+def write_changes(changes):
+    if not changes:
+        return
+
+    # The methods of the surveys of results, from the surveys of the same
+    # changes, which may have been deleted, or with a single query
+    method_ids = {
+        change.survey_id: change.method_id for change in changes if change.method_id
+    }
+    missing = {change.survey_id for change in changes} - method_ids.keys()
+    if missing:
+        method_ids.update(
+            Survey.objects.filter(pk__in=missing).values_list("pk", "method_id")
+        )
+    now = timezone.now()
+    for change in changes:
+        change.method_id = method_ids.get(change.survey_id)
+        change.created_at = now
+    Change.objects.bulk_create(changes)
+    schedule_changes_compaction()
+
+
+def schedule_changes_compaction():
+    # At most once per interval
+    if cache.add(COMPACTION_CACHE_KEY, True, settings.CHANGE_LOG_COMPACTION_INTERVAL):
+        run_in_background(compact_changes)
+
+
+def get_gap_seq(after):
+    """
+    Returns the sequence number of the first change after a gap in the log that
+    may still be filled, or None. Sequence numbers are taken when the changes
+    are inserted, not when they are committed, so a missing one after a change
+    of the last CHANGE_FEED_GAP_TIMEOUT seconds may belong to a running
+    transaction. Older gaps are of rolled back transactions, or compacted.
+    """
+    limit = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_GAP_TIMEOUT)
+    settled = (
+        Change.objects.filter(seq__gt=after, created_at__lte=limit)
+        .order_by("-seq")
+        .values_list("seq", flat=True)
+        .first()
+    )
+    start = settled or after
+    # Without any change before, the first one starts the log
+    previous = Lag("seq", default=Value(start) if start else None)
+    return (
+        Change.objects.filter(seq__gt=start)
+        .annotate(previous=Window(previous, order_by="seq"))
+        .filter(seq__gt=F("previous") + 1)
+        .order_by("seq")
+        .values_list("seq", flat=True)
+        .first()
+    )
+
+
+def compact_changes():
+    """
+    Deletes the changes superseded by a later change of the same object, which
+    consumers get anyway, and the deletes older than CHANGE_LOG_RETENTION, so
+    the log keeps the last change of each existing object. Consumers whose
+    cursor is before the last deleted delete have to sync again from the start
+    (see ChangeFeedView). Changes of the last CHANGE_FEED_GAP_TIMEOUT seconds
+    are kept, so the gaps they'd leave aren't waited for (see get_gap_seq).
+    Returns the number of deleted changes.
+    """
+    later = Change.objects.filter(
+        kind=OuterRef("kind"), object_id=OuterRef("object_id"), seq__gt=OuterRef("seq")
+    )
+    recent = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_GAP_TIMEOUT)
+    superseded, _ = Change.objects.filter(
+        Exists(later), created_at__lte=recent
+    ).delete()
+    limit = timezone.now() - timedelta(seconds=settings.CHANGE_LOG_RETENTION)
+    purged_seq = Change.objects.filter(
+        operation=Change.Operation.DELETE, created_at__lt=limit
+    ).aggregate(seq=Max("seq"))["seq"]
+    expired = 0
+    if purged_seq is not None:
+        # Recorded first, so no cursor misses the deletes in between
+        ChangeCompaction.objects.create(purged_seq=purged_seq)
+        expired, _ = Change.objects.filter(
+            operation=Change.Operation.DELETE, seq__lte=purged_seq
+        ).delete()
+    logger.info("changes_compacted", superseded=superseded, expired=expired)
+    return superseded + expired
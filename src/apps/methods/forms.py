@@ -9,6 +9,7 @@ from unfold.widgets import (
 )
 
 from apps.methods.widgets import syh_forms
+from apps.methods.widgets.widgets import ProtectedFileWidget
 
 from .models import Indicator, IndicatorsSet, Invitation, Method, Section
 
@@ -26,8 +27,15 @@ class MethodForm(forms.ModelForm):
         }
         widgets = {
             "networks": UnfoldAdminSelect2Widget(attrs=htmx_attrs),
+            "documentation": ProtectedFileWidget(),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        documentation = self.fields.get("documentation")
+        if documentation is not None:
+            documentation.widget.url = self.instance.get_documentation_url()
+
     def clean_pdf_file(self):
         file = self.cleaned_data.get("pdf_file", False)
         if file and not file.name.endswith(".pdf"):
@@ -1,8 +1,40 @@
+import hashlib
+import json
+import math
 import re
-
+import statistics
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.utils import timezone
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 
-from .models import IndicatorResult, Invitation, Method, Section
+from apps.settings.helpers import invalidate_documents_summary
+from apps.settings.models import Network
+from project.utils.cache import bump_cache_version, get_cache_version
+
+from .changes import record_changes
+from .models import (
+    Campaign,
+    Change,
+    Group,
+    GroupItem,
+    Indicator,
+    IndicatorComparison,
+    IndicatorResult,
+    IndicatorsSet,
+    Invitation,
+    List,
+    ListItem,
+    Method,
+    Section,
+    Survey,
+)
 
 
 class ParseExternalInvitations:
@@ -61,7 +93,346 @@ def get_external_survey_filter(networks__id):
     )
 
 
-def get_survey_stats(survey, method, campaign):
+def get_answered_indicator_ids(surveys):
+    """
+    Returns the ids of the indicators answered (with a value or marked as not
+    applicable) in every survey, in a single query.
+    """
+    answered = {survey.pk: set() for survey in surveys}
+    results = (
+        IndicatorResult.objects.filter(survey__in=answered, is_total=False)
+        .filter(Q(not_applicable=True) | ~Q(value=""))
+        .values_list("survey_id", "indicator_id")
+        .distinct()
+    )
+    for survey_id, indicator_id in results:
+        answered[survey_id].add(indicator_id)
+    return answered
+
+
+def get_current_surveys_stats(user):
+    """
+    Returns the stats of the surveys of the user for every method of its
+    organization in the open campaigns (the home dashboard). They are built
+    with a fixed number of queries and cached until any survey of the user is
+    saved.
+    """
+    key = "home-dashboard:{}:{}:{}".format(
+        user.pk, get_language(), get_cache_version(f"home-dashboard:{user.pk}")
+    )
+
+    def build_stats():
+        organization_methods = Method.objects.filter(
+            id__in=user.profile.organization.methods.values("id")
+        ).prefetch_related("external_surveys")
+        open_campaigns = Campaign.objects.filter(status=True).prefetch_related(
+            Prefetch(
+                "methods", queryset=organization_methods, to_attr="organization_methods"
+            )
+        )
+        method_list = []
+        for open_campaign in open_campaigns:
+            for method in open_campaign.organization_methods:
+                method.campaign = {"id": open_campaign.id, "name": open_campaign.name}
+                method_list.append(method)
+
+        sections = get_methods_form_sections(method_list)
+        surveys = {}
+        for survey in Survey.objects.filter(user=user, campaign__status=True):
+            surveys.setdefault((survey.method_id, survey.campaign_id), survey)
+        answered_indicator_ids = get_answered_indicator_ids(surveys.values())
+
+        current_surveys_stats = []
+        for method in method_list:
+            method.sections = sections[method.pk]
+            survey = surveys.get((method.id, method.campaign["id"]))
+            current_surveys_stats.append(
+                get_survey_stats(
+                    survey,
+                    method,
+                    method.campaign,
+                    answered_indicator_ids.get(survey.pk) if survey else None,
+                )
+            )
+        return current_surveys_stats
+
+    return cache.get_or_set(
+        key, build_stats, timeout=settings.HOME_DASHBOARD_CACHE_TIMEOUT
+    )
+
+
+def invalidate_current_surveys_stats(user_id):
+    bump_cache_version(f"home-dashboard:{user_id}")
+
+
+def get_method_structure_version(method_id):
+    """
+    Returns the version of the structure of a method (its sections, sets and
+    indicators, with their lists and groups), to be part of the keys of the
+    values cached from it, and of what is stored from it (see SurveySnapshot).
+    It's kept in the database, and cached, or None if the method doesn't exist.
+    """
+    return cache.get_or_set(
+        f"method-structure:{method_id}",
+        lambda: (
+            Method.objects.filter(pk=method_id)
+            .values_list("structure_version", flat=True)
+            .first()
+        ),
+        timeout=None,
+    )
+
+
+def get_methods_structure_versions(method_ids):
+    """
+    Returns the structure version (see get_method_structure_version) of each
+    method by id, reading the ones that aren't cached with a single query.
+    """
+    keys = {method_id: f"method-structure:{method_id}" for method_id in method_ids}
+    cached = cache.get_many(keys.values())
+    versions = {
+        method_id: cached[key] for method_id, key in keys.items() if key in cached
+    }
+    missing = keys.keys() - versions.keys()
+    if missing:
+        found = dict(
+            Method.objects.filter(pk__in=missing).values_list("pk", "structure_version")
+        )
+        cache.set_many(
+            {keys[method_id]: found[method_id] for method_id in found}, timeout=None
+        )
+        versions.update({method_id: found.get(method_id) for method_id in missing})
+    return versions
+
+
+def invalidate_method_structure(method_ids):
+    Method.objects.filter(pk__in=method_ids).update(
+        structure_version=F("structure_version") + 1
+    )
+    cache.delete_many([f"method-structure:{method_id}" for method_id in method_ids])
+
+
+def get_structure_method_ids(instance):
+    """
+    Returns the ids of the methods whose structure includes a method, section,
+    set or indicator, or the lists and groups (and their items) of its
+    indicators.
+    """
+    if isinstance(instance, Method):
+        return {instance.pk}
+    if isinstance(instance, Section):
+        return {instance.method_id}
+    if isinstance(instance, IndicatorsSet):
+        query = Q(indicators_sets=instance) | Q(section__indicators_sets=instance)
+    else:
+        if isinstance(instance, Indicator):
+            indicators = [instance]
+        elif isinstance(instance, List):
+            indicators = Indicator.objects.filter(list_options=instance)
+        elif isinstance(instance, ListItem):
+            indicators = Indicator.objects.filter(list_options__items=instance)
+        elif isinstance(instance, Group):
+            indicators = Indicator.objects.filter(
+                Q(group=instance) | Q(group_2=instance)
+            )
+        elif isinstance(instance, GroupItem):
+            indicators = Indicator.objects.filter(
+                Q(group__items=instance) | Q(group_2__items=instance)
+            )
+        else:
+            return set()
+        query = (
+            Q(indicators__in=indicators)
+            | Q(section__indicators__in=indicators)
+            | Q(section__indicators_sets__indicators__in=indicators)
+        )
+    return set(Method.objects.filter(query).values_list("pk", flat=True))
+
+
+def get_method_metadata(method_id):
+    """
+    Returns the metadata of the indicators and sets of a method that its form
+    needs in the browser (see indicatorsStore.js) as JSON, with its ETag (a hash
+    of the content), or None if the method doesn't exist. It's cached for the
+    current language until the structure of the method changes.
+    """
+    key = "method-metadata:{}:{}:{}".format(
+        method_id, get_language(), get_method_structure_version(method_id)
+    )
+
+    def build_metadata():
+        if not Method.objects.filter(pk=method_id).exists():
+            return None
+        content = json.dumps(build_method_metadata(method_id), cls=DjangoJSONEncoder)
+        return content, hashlib.sha256(content.encode()).hexdigest()
+
+    return cache.get_or_set(key, build_metadata, timeout=None)
+
+
+def build_method_metadata(method_id):
+    indicators = list(Indicator.objects.filter(methods=method_id).values())
+    lists = List.objects.filter(
+        pk__in={i["list_options_id"] for i in indicators}
+    ).prefetch_related("items")
+    lists = {list_options.pk: list_options for list_options in lists}
+    groups = Group.objects.filter(
+        pk__in={i["group_id"] for i in indicators}
+        | {i["group_2_id"] for i in indicators}
+    ).prefetch_related("items")
+    groups = {group.pk: group for group in groups}
+
+    for i in indicators:
+        i["unit"] = Indicator.Unit(i["unit"]).label if i["unit"] else ""
+        # Add options value
+        if i["list_options_id"] is not None:
+            i["options"] = [
+                {"id": o.id, "value": o.value}
+                for o in lists[i["list_options_id"]].items.all()
+            ]
+        # Add group and group_2 data
+        for prefix in ("group", "group_2"):
+            if i[f"{prefix}_id"] is not None:
+                group = groups[i[f"{prefix}_id"]]
+                i[f"{prefix}_title"] = group.title
+                i[f"{prefix}_items"] = [
+                    {"id": o.id, "title": o.title, "suffix": o.suffix}
+                    for o in group.items.all()
+                ]
+
+    indicators_sets = list(IndicatorsSet.objects.filter(methods=method_id).values())
+    indicators_ids = {}
+    for code, indicator_id in Indicator.objects.filter(
+        sets__code__in=[indicators_set["code"] for indicators_set in indicators_sets]
+    ).values_list("sets__code", "id"):
+        indicators_ids.setdefault(code, []).append(str(indicator_id))
+    for indicators_set in indicators_sets:
+        indicators_set["indicators_ids"] = indicators_ids.get(
+            indicators_set["code"], []
+        )
+
+    return {"indicators": indicators, "indicators_sets": indicators_sets}
+
+
+def get_surveys_progress(surveys):
+    """
+    Returns the total progress (see get_survey_stats) of each survey by id. It's
+    cached for every survey until its modified_date (set whenever its answers
+    are saved) or the structure of its method change, and the missing ones are
+    computed together, with the same number of queries no matter how many.
+    """
+    versions = get_methods_structure_versions({survey.method_id for survey in surveys})
+    keys = {
+        survey.pk: "survey-progress:{}:{}:{}".format(
+            survey.pk,
+            survey.modified_date.timestamp() if survey.modified_date else "",
+            versions[survey.method_id],
+        )
+        for survey in surveys
+    }
+    cached = cache.get_many(keys.values())
+    progress = {
+        survey.pk: cached[keys[survey.pk]]
+        for survey in surveys
+        if keys[survey.pk] in cached
+    }
+
+    missing = [survey for survey in surveys if survey.pk not in progress]
+    if missing:
+        sections = get_methods_form_sections(
+            {survey.method_id: survey.method for survey in missing}.values()
+        )
+        answered_indicator_ids = get_answered_indicator_ids(missing)
+        for survey in missing:
+            survey.method.sections = sections[survey.method_id]
+            progress[survey.pk] = get_survey_stats(
+                survey, survey.method, None, answered_indicator_ids[survey.pk]
+            )["totalProgress"]
+        cache.set_many(
+            {keys[survey.pk]: progress[survey.pk] for survey in missing},
+            timeout=settings.SURVEY_PROGRESS_CACHE_TIMEOUT,
+        )
+    return progress
+
+
+def get_survey_render_cache_key(survey, *parts):
+    """
+    Returns the cache key of a rendered survey form. It changes when its answers
+    are saved (see invalidate_survey_render), the survey is modified or the
+    structure of its method changes, and it's different for each language. The
+    parts are whatever else changes the rendered form.
+    """
+    return "survey-render:{}:{}:{}:{}:{}:{}".format(
+        survey.pk,
+        survey.modified_date.timestamp() if survey.modified_date else "",
+        get_method_structure_version(survey.method_id),
+        get_cache_version(f"survey-render:{survey.pk}"),
+        get_language(),
+        ":".join(str(part) for part in parts),
+    )
+
+
+def invalidate_survey_render(survey_id):
+    bump_cache_version(f"survey-render:{survey_id}")
+
+
+# Date stamped when a survey moves to each status
+SURVEY_STATUS_DATE_FIELDS = {
+    Survey.Status.CLOSED: "closed_date",
+    Survey.Status.TECH_VALIDATED: "validated_date",
+    Survey.Status.QUALITY_CHECKED: "evaluated_date",
+}
+
+
+@transaction.atomic
+def update_surveys_status(surveys, status):
+    """
+    Moves the surveys of a queryset to a status with a single UPDATE, stamping
+    the date of the new status. Surveys already in that status are left as they
+    are. As no signals are sent, the caches that depend on the status are
+    invalidated, and the changes logged, here. Returns the ids of the updated
+    surveys.
+    """
+    rows = list(
+        surveys.exclude(status=status)
+        .select_for_update(of=("self",))
+        .values_list("pk", "user_id", "organization_id", "method_id")
+    )
+    if not rows:
+        return []
+
+    survey_ids = [survey_id for survey_id, _, _, _ in rows]
+    now = timezone.now()
+    fields = {"status": status, "updated_at": now}
+    if date_field := SURVEY_STATUS_DATE_FIELDS.get(status):
+        fields[date_field] = now
+    Survey.objects.filter(pk__in=survey_ids).update(**fields)
+    record_changes(
+        [
+            Change(
+                kind=Change.Kind.SURVEY,
+                object_id=survey_id,
+                operation=Change.Operation.UPDATE,
+                survey_id=survey_id,
+                method_id=method_id,
+            )
+            for survey_id, _, _, method_id in rows
+        ]
+    )
+
+    user_ids = {user_id for _, user_id, _, _ in rows if user_id}
+    organization_ids = {org_id for _, _, org_id, _ in rows if org_id}
+
+    def invalidate():
+        for user_id in user_ids:
+            invalidate_current_surveys_stats(user_id)
+        for organization_id in organization_ids:
+            invalidate_documents_summary(organization_id)
+
+    transaction.on_commit(invalidate)
+    return survey_ids
+
+
+def get_survey_stats(survey, method, campaign, answered_indicator_ids=None):
     stats = {
         "totalProgress": 0,
         "totalCompleted": 0,
@@ -75,9 +446,8 @@ def get_survey_stats(survey, method, campaign):
     }
 
     if survey:
-        indicator_results = IndicatorResult.objects.filter(
-            survey=survey,
-        )
+        if answered_indicator_ids is None:
+            answered_indicator_ids = get_answered_indicator_ids([survey])[survey.pk]
         total_indicators = 0
         total_answered__indicators = 0
         if hasattr(method, "sections"):
@@ -88,7 +458,6 @@ def get_survey_stats(survey, method, campaign):
                 total_indicators += len(section_direct_indicators)
                 total_section_indicators = len(section_direct_indicators)
                 indicators_list = section_direct_indicators
-                answered_indicators = 0
 
                 # Indicators in sets in sections
                 for indicators_set in section.indicators_sets.all():
@@ -123,19 +492,9 @@ def get_survey_stats(survey, method, campaign):
                         total_section_indicators += len(indicators)
                         indicators_list += indicators
 
-                for i in indicators_list:
-                    indicator_result = next(
-                        (
-                            ii
-                            for ii in indicator_results
-                            if i.code == ii.indicator.code and not ii.is_total
-                        ),
-                        None,
-                    )
-                    if indicator_result and (
-                        indicator_result.value or indicator_result.not_applicable
-                    ):
-                        answered_indicators += 1
+                answered_indicators = sum(
+                    1 for i in indicators_list if i.pk in answered_indicator_ids
+                )
 
                 total_answered__indicators += answered_indicators
 
@@ -220,30 +579,42 @@ def parse_indicators_from_expression(expr: str):
 
 
 def get_form_sections(method):
-    result = {}
-    sections = Section.objects.filter(method=method).order_by("order")
-    top_level_sections = sections.filter(parent__isnull=True)
+    return get_methods_form_sections([method])[method.pk]
+
+
+def get_methods_form_sections(methods):
+    """
+    Returns the sections tree of every method (see get_form_sections) with all
+    their indicators and sets prefetched, using the same number of queries no
+    matter how many methods or sections there are.
+    """
+    result = {method.pk: {} for method in methods}
+    sections = list(
+        Section.objects.filter(method__in=result)
+        .order_by("order")
+        .prefetch_related("indicators", "indicators_sets__indicators")
+    )
+    subsections = {}
+    for section in sections:
+        if section.parent_id:
+            subsections.setdefault(section.parent_id, []).append(section)
 
-    for section in top_level_sections:
-        indicators = get_indicators_list(section.indicators.all())
-        indicators_sets = get_indicators_sets_list(section.indicators_sets.all())
+    for section in sections:
+        if section.parent_id:
+            continue
 
-        subsections = sections.filter(parent=section)
         subsections_dict = {}
-        for subsection in subsections:
-            child_indicators = get_indicators_list(subsection.indicators.all())
-            child_indicators_sets = get_indicators_sets_list(
-                subsection.indicators_sets.all()
-            )
-
+        for subsection in subsections.get(section.pk, []):
             subsections_dict[subsection] = {
-                "indicators": child_indicators,
-                "indicators_sets": child_indicators_sets,
+                "indicators": get_indicators_list(subsection.indicators.all()),
+                "indicators_sets": get_indicators_sets_list(
+                    subsection.indicators_sets.all()
+                ),
             }
 
-        result[section] = {
-            "indicators": indicators,
-            "indicators_sets": indicators_sets,
+        result[section.method_id][section] = {
+            "indicators": get_indicators_list(section.indicators.all()),
+            "indicators_sets": get_indicators_sets_list(section.indicators_sets.all()),
             "subsections": subsections_dict,
         }
 
@@ -272,3 +643,269 @@ def get_indicators_sets_list(indicators_sets_list):
             {"set_name": "set_" + str(s.id), "indicators_set": i_set}
         )
     return indicators_sets
+
+
+def _clone_through_rows(through, source_attname, target_attname, id_map):
+    """
+    Copies the rows of an M2M ``through`` table from the keys of ``id_map`` to
+    their clones with one SELECT and one INSERT. Extra columns (the
+    ``sort_value`` of sorted M2M fields) are kept as they are, and targets that
+    have been cloned in the same operation are remapped too.
+    """
+    extra_attnames = [
+        f.attname
+        for f in through._meta.concrete_fields
+        if not f.primary_key and f.attname not in (source_attname, target_attname)
+    ]
+    rows = through.objects.filter(
+        **{f"{source_attname}__in": list(id_map)}
+    ).values_list(source_attname, target_attname, *extra_attnames)
+    return through.objects.bulk_create(
+        [
+            through(
+                **{
+                    source_attname: id_map[source_id],
+                    target_attname: id_map.get(target_id, target_id),
+                    **dict(zip(extra_attnames, extra, strict=True)),
+                }
+            )
+            for source_id, target_id, *extra in rows
+        ]
+    )
+
+
+@transaction.atomic
+def clone_method(method, version=None, name=None):
+    """
+    Creates a copy of ``method`` (sections, indicators, sets, networks, regions
+    and the rest of its relations) to be used as a new version in a campaign.
+    Everything is copied with bulk statements, so the number of queries does
+    not depend on the size of the method.
+    """
+    source_id = method.pk
+    clone = Method.objects.get(pk=source_id)
+    clone.pk = uuid.uuid4()
+    clone._state.adding = True
+    if version is not None:
+        clone.version = version
+    if name is not None:
+        clone.name = name
+    clone.save()
+    method_map = {source_id: clone.pk}
+
+    for field_name in (
+        "indicators",
+        "indicators_sets",
+        "legal_structures",
+        "sectors",
+        "region1",
+    ):
+        field = Method._meta.get_field(field_name)
+        _clone_through_rows(
+            field.remote_field.through,
+            field.m2m_column_name(),
+            field.m2m_reverse_name(),
+            method_map,
+        )
+
+    # External surveys are a symmetrical relation, so both directions are kept
+    external_surveys = Method._meta.get_field("external_surveys")
+    through = external_surveys.remote_field.through
+    rows = _clone_through_rows(
+        through,
+        external_surveys.m2m_column_name(),
+        external_surveys.m2m_reverse_name(),
+        method_map,
+    )
+    through.objects.bulk_create(
+        [
+            through(from_method_id=row.to_method_id, to_method_id=row.from_method_id)
+            for row in rows
+            if row.to_method_id != row.from_method_id
+        ]
+    )
+
+    networks = Network._meta.get_field("methods")
+    _clone_through_rows(
+        networks.remote_field.through,
+        networks.m2m_reverse_name(),
+        networks.m2m_column_name(),
+        method_map,
+    )
+
+    # Sections get their new ids beforehand so that parents can be remapped and
+    # the whole tree inserted at once
+    sections = list(Section.objects.filter(method_id=source_id))
+    section_map = {section.pk: uuid.uuid4() for section in sections}
+    for section in sections:
+        section.pk = section_map[section.pk]
+        section._state.adding = True
+        section.method_id = clone.pk
+        if section.parent_id:
+            section.parent_id = section_map[section.parent_id]
+    Section.objects.bulk_create(sections)
+
+    for field_name in ("indicators", "indicators_sets"):
+        field = Section._meta.get_field(field_name)
+        _clone_through_rows(
+            field.remote_field.through,
+            field.m2m_column_name(),
+            field.m2m_reverse_name(),
+            section_map,
+        )
+
+    return clone
+
+
+# Indicators whose values can be compared across campaigns
+NUMERIC_DATA_TYPES = [
+    Indicator.DataType.INTEGER,
+    Indicator.DataType.DECIMAL,
+    Indicator.DataType.INTEGERGENDER,
+    Indicator.DataType.DECIMALGENDER,
+]
+
+
+def get_campaign_chain(campaign):
+    """
+    Returns a campaign and the previous ones it follows, from the oldest one.
+    """
+    chain = [campaign]
+    while chain[0].previous_campaign_id and chain[0].previous_campaign_id not in {
+        c.pk for c in chain
+    }:
+        chain.insert(0, Campaign.objects.get(pk=chain[0].previous_campaign_id))
+    return chain
+
+
+def parse_number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def get_trend(values):
+    """
+    Returns the slope of the least squares line of a series of values, ignoring
+    the missing ones, or None if there aren't two of them.
+    """
+    points = [(x, y) for x, y in enumerate(values) if y is not None]
+    if len(points) < 2:
+        return None
+    return statistics.linear_regression(*zip(*points, strict=True)).slope
+
+
+@transaction.atomic
+def update_indicator_comparisons(campaign):
+    """
+    Compares the numeric answers of every organization in a campaign with its
+    answers in the previous campaigns of the chain, replacing the comparisons
+    of the campaign. Answers are aligned by organization, project, indicator
+    (shared by the versions of a method, see clone_method) and gender or group
+    items (indicators of sets are left out, as their instances don't correspond
+    across campaigns). All of them are fetched with a single query and compared
+    as columns. Returns the number of comparisons.
+    """
+    chain = get_campaign_chain(campaign)
+    positions = {c.pk: position for position, c in enumerate(chain)}
+    results = (
+        IndicatorResult.objects.filter(
+            survey__campaign__in=chain,
+            survey__status__gte=Survey.Status.CLOSED,
+            survey__organization__in=Survey.objects.filter(
+                campaign=campaign, status__gte=Survey.Status.CLOSED
+            ).values("organization_id"),
+            indicator__data_type__in=NUMERIC_DATA_TYPES,
+            is_total=False,
+            instance_number=0,
+        )
+        .exclude(not_applicable=True)
+        .values_list(
+            "survey__campaign_id",
+            "survey__organization_id",
+            "survey__project_id",
+            "indicator_id",
+            "gender",
+            "group_item__suffix",
+            "group_2_item__suffix",
+            "value",
+        )
+    )
+
+    # Values of each answer aligned by campaign
+    series = {}
+    for (
+        campaign_id,
+        organization_id,
+        project_id,
+        indicator_id,
+        gender,
+        suffix,
+        suffix_2,
+        value,
+    ) in results.iterator(chunk_size=5000):
+        number = parse_number(value)
+        if number is None:
+            continue
+        if gender is not None:
+            item = get_gender_suffix(gender)
+        else:
+            item = "_".join(suffix for suffix in (suffix, suffix_2) if suffix)
+        key = (organization_id, project_id, indicator_id, item)
+        series.setdefault(key, [None] * len(chain))[positions[campaign_id]] = number
+
+    # Only the answers of the campaign are compared
+    keys = [key for key, values in series.items() if values[-1] is not None]
+    values = [series[key] for key in keys]
+    current = [v[-1] for v in values]
+    previous = [v[-2] if len(chain) > 1 else None for v in values]
+    deltas = [
+        c - p if p is not None else None for c, p in zip(current, previous, strict=True)
+    ]
+    relative_deltas = [
+        d / abs(p) if p else None for d, p in zip(deltas, previous, strict=True)
+    ]
+    trends = [get_trend(v) for v in values]
+
+    IndicatorComparison.objects.filter(campaign=campaign).delete()
+    IndicatorComparison.objects.bulk_create(
+        [
+            IndicatorComparison(
+                campaign=campaign,
+                organization_id=organization_id,
+                project_id=project_id,
+                indicator_id=indicator_id,
+                item=item,
+                values=v,
+                value=c,
+                previous_value=p,
+                delta=d,
+                relative_delta=r,
+                trend=t,
+            )
+            for (
+                organization_id,
+                project_id,
+                indicator_id,
+                item,
+            ), v, c, p, d, r, t in zip(
+                keys,
+                values,
+                current,
+                previous,
+                deltas,
+                relative_deltas,
+                trends,
+                strict=True,
+            )
+        ],
+        batch_size=1000,
+    )
+    return len(keys)
+
+
+def update_campaign_comparisons(campaign_id):
+    # For the background jobs, whose arguments are ids
+    return update_indicator_comparisons(Campaign.objects.get(pk=campaign_id))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:17
+
+import django.db.models.deletion
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0015_surveysnapshot'),
+        ('organizations', '0004_organization_network_managed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorComparison',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('item', models.CharField(blank=True, max_length=601, verbose_name='Item')),
+                ('values', models.JSONField(default=list, verbose_name='Values')),
+                ('value', models.FloatField(verbose_name='Value')),
+                ('previous_value', models.FloatField(blank=True, null=True, verbose_name='Previous value')),
+                ('delta', models.FloatField(blank=True, null=True, verbose_name='Delta')),
+                ('relative_delta', models.FloatField(blank=True, null=True, verbose_name='Relative delta')),
+                ('trend', models.FloatField(blank=True, null=True, verbose_name='Trend')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='methods.campaign', verbose_name='Campaign')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+                ('indicator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='methods.indicator', verbose_name='Indicator')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='organizations.organization', verbose_name='Organization')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='organizations.project', verbose_name='Project')),
+            ],
+            options={
+                'verbose_name': 'indicator comparison',
+                'verbose_name_plural': 'indicator comparisons',
+                'indexes': [models.Index(fields=['campaign', 'indicator'], name='methods_ind_campaig_99cdf4_idx')],
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:19
+
+import django.db.models.deletion
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0016_indicatorcomparison'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyReport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('fingerprint', models.CharField(max_length=100, verbose_name='Fingerprint')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+                ('survey', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='report', to='methods.survey')),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
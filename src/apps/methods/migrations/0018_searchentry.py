@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:25
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0017_surveyreport'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('kind', models.CharField(choices=[('indicator', 'Indicator'), ('indicators_set', 'Indicators set'), ('topic', 'Topic')], max_length=20, verbose_name='Kind')),
+                ('object_id', models.UUIDField(verbose_name='Object id')),
+                ('language', models.CharField(max_length=10, verbose_name='Language')),
+                ('code', models.CharField(blank=True, max_length=50, verbose_name='Code')),
+                ('document', django.contrib.postgres.search.SearchVectorField(verbose_name='Document')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+            ],
+            options={
+                'verbose_name': 'search entry',
+                'verbose_name_plural': 'search entries',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['document'], name='methods_sea_documen_a2f0cf_gin'), models.Index(fields=['kind', 'language', 'code'], name='search_entry_code_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops', 'varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id', 'language'), name='unique_search_entry')],
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:32
+
+import django.db.models.deletion
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0018_searchentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attachment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('token', models.CharField(blank=True, max_length=400, verbose_name='Invitation token')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('content_type', models.CharField(max_length=100, verbose_name='Content type')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Size')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Offset')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Uploading'), (1, 'Uploaded'), (2, 'Complete')], default=0, verbose_name='Status')),
+                ('path', models.CharField(blank=True, max_length=500, verbose_name='Path')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+                ('indicator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='methods.indicator')),
+                ('survey', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='methods.survey')),
+            ],
+            options={
+                'verbose_name': 'attachment',
+                'verbose_name_plural': 'attachments',
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
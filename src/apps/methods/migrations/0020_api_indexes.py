@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0019_attachment'),
+        ('organizations', '0005_organization_logo_renditions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='indicatorresult',
+            index=models.Index(fields=['updated_at', 'id'], name='result_updated_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survey',
+            index=models.Index(fields=['updated_at', 'id'], name='survey_updated_at_id_idx'),
+        ),
+    ]
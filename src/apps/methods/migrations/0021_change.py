@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0020_api_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False, verbose_name='Sequence')),
+                ('kind', models.CharField(choices=[('survey', 'Survey'), ('result', 'Indicator result')], max_length=10, verbose_name='Kind')),
+                ('object_id', models.UUIDField(verbose_name='Object id')),
+                ('operation', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], max_length=10, verbose_name='Operation')),
+                ('survey_id', models.UUIDField(verbose_name='Survey id')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created at')),
+                ('method', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='methods.method')),
+            ],
+            options={
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['kind', 'object_id', 'seq'], name='change_object_idx'), models.Index(fields=['created_at'], name='change_created_at_idx')],
+            },
+        ),
+    ]
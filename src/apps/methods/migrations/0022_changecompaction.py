@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0021_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCompaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purged_seq', models.BigIntegerField(verbose_name='Purged sequence')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created at')),
+            ],
+        ),
+    ]
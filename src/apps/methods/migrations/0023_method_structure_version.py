@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0022_changecompaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='method',
+            name='structure_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Structure version'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:35
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations
+
+
+def delete_public_survey_reports(apps, schema_editor):
+    # Reports were rendered to the public media storage. They are rendered again
+    # to the private one with `python manage.py generate_survey_reports`
+    SurveyReport = apps.get_model("methods", "SurveyReport")
+    for survey_id in SurveyReport.objects.values_list("survey_id", flat=True):
+        for language, _name in settings.LANGUAGES:
+            default_storage.delete(f"reports/{survey_id}/{language}.html")
+    SurveyReport.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('methods', '0023_method_structure_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_public_survey_reports, migrations.RunPython.noop),
+    ]
@@ -4,25 +4,29 @@ from collections import defaultdict
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.http import HttpResponseRedirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.http import urlencode
 
+from .attachments import get_answer_attachment
+from .changes import collect_changes
 from .forms import get_dynamic_form
 from .helpers import (
     get_form_sections,
     get_gender_field_value,
     get_gender_suffix,
+    get_method_structure_version,
+    invalidate_survey_render,
     is_gendered,
 )
 from .models import (
     Campaign,
-    Group,
     Indicator,
     IndicatorResult,
-    List,
     Method,
     Section,
     Survey,
+    SurveySnapshot,
 )
 
 
@@ -94,6 +98,10 @@ class MethodFillMixin:
 
         save_indicator_results(method_id, request, survey)
 
+        # Closed surveys are rendered from the snapshot of their answers
+        if survey.status >= Survey.Status.CLOSED:
+            save_survey_snapshot(survey)
+
         if action == "submit":
             return HttpResponseRedirect(reverse_lazy("methods:method_fill_success"))
         else:
@@ -129,76 +137,49 @@ def prepare_method_fill_context(
             )
 
         readonly = survey.status == Survey.Status.CLOSED
-        placeholder_dict = get_previous_campaign_answers(
-            survey.campaign.id, survey.method.id, survey.user
-        )
+        if survey.status >= Survey.Status.CLOSED:
+            snapshot = get_survey_snapshot(survey)
+            placeholder_dict = snapshot.placeholders
+            initial_values = snapshot.initial_values
+        else:
+            placeholder_dict = get_previous_campaign_answers(
+                survey.campaign_id, survey.method_id, survey.user
+            )
+            initial_values = get_initial_values(survey)
         form = get_dynamic_form(
             survey.method,
             IndicatorResult.objects.filter(survey=survey),
             readonly,
             placeholder_dict,
         )
+        attachment_files = {
+            str(attachment.pk): {"name": attachment.name, "url": attachment.get_url()}
+            for attachment in survey.attachments.only("pk", "name")
+        }
 
     except ObjectDoesNotExist:
         # If there is none, get new survey
         readonly = False
         placeholder_dict = get_previous_campaign_answers(campaign_id, method.id, user)
+        initial_values = {}
         form = get_dynamic_form(method, [], False, placeholder_dict)
+        attachment_files = {}
 
     sections = get_sections(method, form(data=request.POST or None))
 
-    try:
-        indicators = list(Method.objects.get(id=method.id).indicators.all().values())
-        for i in indicators:
-            i["unit"] = Indicator.Unit(i["unit"]).label if i["unit"] else ""
-            # Add options value
-            if i["list_options_id"] is not None:
-                list_options = List.objects.get(id=i["list_options_id"])
-                options = list_options.items.all().values()
-                i["options"] = []
-                for o in options:
-                    i["options"].append({"id": o["id"], "value": o["value"]})
-            # Add group data
-            if i["group_id"] is not None:
-                group = Group.objects.get(id=i["group_id"])
-                group_items = group.items.all().values()
-                i["group_title"] = group.title
-                i["group_items"] = []
-                for o in group_items:
-                    i["group_items"].append(
-                        {"id": o["id"], "title": o["title"], "suffix": o["suffix"]}
-                    )
-            # Add group_2 data
-            if i["group_2_id"] is not None:
-                group = Group.objects.get(id=i["group_2_id"])
-                group_items = group.items.all().values()
-                i["group_2_title"] = group.title
-                i["group_2_items"] = []
-                for o in group_items:
-                    i["group_2_items"].append(
-                        {"id": o["id"], "title": o["title"], "suffix": o["suffix"]}
-                    )
-
-        indicators_sets = list(
-            Method.objects.get(id=method.id).indicators_sets.all().values()
-        )
-
-        for indicators_set in indicators_sets:
-            indicators_set.update(
-                {
-                    "indicators_ids": [
-                        str(indicator["id"])
-                        for indicator in list(
-                            Indicator.objects.filter(sets__code=indicators_set["code"])
-                            .all()
-                            .values()
-                        )
-                    ]
-                }
-            )
+    # The metadata of the indicators is loaded apart (see method_metadata),
+    # versioned with the structure of the method so browsers can cache it
+    indicators_metadata_url = "{}?{}".format(
+        reverse("methods:method_metadata", args=[method.id]),
+        urlencode({"v": get_method_structure_version(method.id)}),
+    )
 
-    except Method.DoesNotExist:
-        indicators = list([])
+    # Files are uploaded apart, in chunks (see apps.methods.attachments)
+    attachments_url = reverse("methods:create_attachment_upload")
+    if token is not None:
+        attachments_url += "?" + urlencode({"token": token})
+        for attachment_file in attachment_files.values():
+            attachment_file["url"] += "?" + urlencode({"token": token})
 
     return {
         "method_name": method.name,
@@ -207,15 +188,18 @@ def prepare_method_fill_context(
         "form": form,
         "sections": sections,
         "sections_data": get_sections_data(method),
-        "indicators": indicators,
-        "initial_values": get_initial_values(survey) if "survey" in locals() else {},
+        "indicators_metadata_url": indicators_metadata_url,
+        "attachments_config": {"url": attachments_url, "files": attachment_files},
+        "initial_values": initial_values,
         "placeholders": placeholder_dict,
-        "indicators_sets": indicators_sets,
     }
 
 
+# The changes of the results are logged at once
+@collect_changes()
 def save_indicator_results(method_id, request, survey):
     method = Method.objects.get(pk=method_id)
+    transaction.on_commit(lambda: invalidate_survey_render(survey.pk))
 
     for indicator in method.indicators.all():
         field_name = f"question_{indicator.id}"
@@ -416,6 +400,19 @@ def save_indicator_result(request, survey, indicator, field_name, instance_numbe
             else f"{field_name}"
         )
         values = request.POST.getlist(name)
+        if indicator.data_type == Indicator.DataType.ATTACHMENT:
+            # The id of an uploaded attachment (see apps.methods.attachments)
+            attachment = get_answer_attachment(
+                values[0] if values else None,
+                indicator,
+                survey,
+                user=request.user if request.user.is_authenticated else None,
+                token=survey.token,
+            )
+            values = [str(attachment.pk)] if attachment else []
+            if attachment and attachment.survey_id is None:
+                attachment.survey = survey
+                attachment.save(update_fields=["survey", "updated_at"])
         formatted_values = "|".join(values)
         if formatted_values or na:
             IndicatorResult.objects.update_or_create(
@@ -462,9 +459,13 @@ def get_previous_campaign_answers(campaign_id, current_method_id, user):
                 if previous_survey:
                     indicator_results = IndicatorResult.objects.filter(
                         survey=previous_survey,
-                    )
+                    ).select_related("indicator", "group_item", "group_2_item")
 
                     for r in indicator_results:
+                        # Totals are computed by the form, and would replace the
+                        # values of the group items
+                        if r.is_total:
+                            continue
                         code = r.indicator.code
                         if r.gender is not None:
                             placeholder_dict[code][get_gender_suffix(r.gender)] = (
@@ -484,10 +485,46 @@ def get_previous_campaign_answers(campaign_id, current_method_id, user):
     return placeholder_dict
 
 
+def get_survey_snapshot(survey):
+    """
+    Returns the snapshot of the answers of a closed survey, taking it again if
+    the survey has been modified or the structure of its method has changed.
+    """
+    structure_version = get_method_structure_version(survey.method_id)
+    snapshot = SurveySnapshot.objects.filter(survey=survey).first()
+    if (
+        snapshot is None
+        or snapshot.modified_date != survey.modified_date
+        or snapshot.structure_version != structure_version
+    ):
+        snapshot = save_survey_snapshot(survey, structure_version)
+    return snapshot
+
+
+def save_survey_snapshot(survey, structure_version=None):
+    """
+    Freezes the initial values and placeholders of the method form of a survey.
+    """
+    if structure_version is None:
+        structure_version = get_method_structure_version(survey.method_id)
+    snapshot, _ = SurveySnapshot.objects.update_or_create(
+        survey=survey,
+        defaults={
+            "modified_date": survey.modified_date,
+            "structure_version": structure_version,
+            "initial_values": get_initial_values(survey),
+            "placeholders": get_previous_campaign_answers(
+                survey.campaign_id, survey.method_id, survey.user
+            ),
+        },
+    )
+    return snapshot
+
+
 def get_initial_values(survey):
     indicator_results = IndicatorResult.objects.filter(
         survey=survey,
-    ).all()
+    ).select_related("indicator__group", "group_item", "group_2_item")
     initial_values = {}
     for i in indicator_results:
         instance_id = (
@@ -1,12 +1,16 @@
 import re
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import (
     MultipleObjectsReturned,
     ObjectDoesNotExist,
     ValidationError,
 )
 from django.db import models
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from sortedm2m.fields import SortedManyToManyField
 
@@ -469,6 +473,10 @@ class Method(BaseModel):
         default=ExternalSurveyCategory.WORK,
         blank=False,
     )
+    # Incremented whenever its structure changes (see invalidate_method_structure)
+    structure_version = models.PositiveBigIntegerField(
+        _("Structure version"), default=0, editable=False
+    )
 
     def __str__(self):
         if self.version:
@@ -490,6 +498,23 @@ class Method(BaseModel):
             )
         super().delete(*args, **kwargs)
 
+    def save(self, *args, **kwargs):
+        # The structure version of the instance may be outdated, so it's never
+        # written back over the one incremented in the database
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "structure_version"
+            ]
+        super().save(*args, **kwargs)
+
+    def get_documentation_url(self):
+        # Served checking who can see it (see project.views.protected_media)
+        if not self.documentation:
+            return ""
+        return reverse("protected_media", args=["documentation", self.pk])
+
 
 class Campaign(BaseModel):
     name = models.CharField(_("Name"), max_length=400, blank=True)
@@ -570,9 +595,111 @@ class Survey(BaseModel):
     validated_date = models.DateTimeField(_("Validated date"), blank=True, null=True)
     evaluated_date = models.DateTimeField(_("Evaluated date"), blank=True, null=True)
 
+    class Meta:
+        # Pages of the API (see apps.methods.api)
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="survey_updated_at_id_idx")
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__original_status = self.status
+
     def __str__(self):
         return self.method.name + " | " + self.campaign.year
 
+    @property
+    def status_has_changed(self):
+        return self.status != self.__original_status
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.__original_status = self.status
+
+
+class SurveySnapshot(BaseModel):
+    """
+    Answers of a closed survey frozen as the method form needs them, so the
+    read-only views don't rebuild them from its results every time. It's valid
+    while the survey isn't modified and the structure of its method doesn't
+    change (see get_survey_snapshot).
+    """
+
+    survey = models.OneToOneField(
+        Survey, on_delete=models.CASCADE, related_name="snapshot"
+    )
+    modified_date = models.DateTimeField(_("Modified date"), blank=True, null=True)
+    structure_version = models.PositiveBigIntegerField(_("Structure version"))
+    initial_values = models.JSONField(_("Initial values"), default=dict)
+    placeholders = models.JSONField(_("Placeholders"), default=dict)
+
+    def __str__(self):
+        return str(self.survey)
+
+
+class SurveyReport(BaseModel):
+    """
+    Public report of a quality checked survey, rendered to the storage (see
+    generate_survey_report) so publishing it doesn't touch its results. The
+    fingerprint tells what it was rendered from.
+    """
+
+    survey = models.OneToOneField(
+        Survey, on_delete=models.CASCADE, related_name="report"
+    )
+    fingerprint = models.CharField(_("Fingerprint"), max_length=100)
+
+    def __str__(self):
+        return str(self.survey)
+
+
+class Attachment(BaseModel):
+    """
+    File answered to an attachment indicator, uploaded in chunks straight to
+    the attachments storage (see apps.methods.attachments). The results of the
+    indicator store its id, and it's linked to their survey once they are
+    saved. It's uploaded by a user or through an invitation token.
+    """
+
+    class Status(models.IntegerChoices):
+        UPLOADING = 0, _("Uploading")
+        # Every chunk is received, and they are being joined
+        UPLOADED = 1, _("Uploaded")
+        COMPLETE = 2, _("Complete")
+
+    indicator = models.ForeignKey(
+        Indicator, on_delete=models.CASCADE, related_name="attachments"
+    )
+    survey = models.ForeignKey(
+        Survey,
+        on_delete=models.CASCADE,
+        related_name="attachments",
+        blank=True,
+        null=True,
+    )
+    token = models.CharField(_("Invitation token"), max_length=400, blank=True)
+    name = models.CharField(_("Name"), max_length=255)
+    content_type = models.CharField(_("Content type"), max_length=100)
+    size = models.PositiveBigIntegerField(_("Size"))
+    # Bytes received so far
+    offset = models.PositiveBigIntegerField(_("Offset"), default=0)
+    status = models.PositiveSmallIntegerField(
+        _("Status"), choices=Status.choices, default=Status.UPLOADING
+    )
+    # Name of the file in the attachments storage, once it's complete
+    path = models.CharField(_("Path"), max_length=500, blank=True)
+
+    class Meta:
+        verbose_name = _("attachment")
+        verbose_name_plural = _("attachments")
+
+    def __str__(self):
+        return self.name
+
+    def get_url(self):
+        # Served checking who can see it (see project.views.protected_media)
+        return reverse("protected_media", args=["attachment", self.pk])
+
 
 class IndicatorResult(BaseModel):
     class Gender(models.IntegerChoices):
@@ -622,6 +749,157 @@ class IndicatorResult(BaseModel):
                 fields=["survey", "indicator", "gender"], name="pk_indicator_result"
             )
         ]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="result_updated_at_id_idx")
+        ]
+
+
+class Change(models.Model):
+    """
+    Entry of the append-only log of the inserts, updates and deletes of the
+    surveys and their results, for external tools to sync them incrementally
+    (see apps.methods.changes). Not a BaseModel, as its sequential key is the
+    position in the log. The survey and method are kept as they were, even once
+    they are deleted.
+    """
+
+    class Kind(models.TextChoices):
+        SURVEY = "survey", _("Survey")
+        RESULT = "result", _("Indicator result")
+
+    class Operation(models.TextChoices):
+        INSERT = "insert", _("Insert")
+        UPDATE = "update", _("Update")
+        DELETE = "delete", _("Delete")
+
+    seq = models.BigAutoField(_("Sequence"), primary_key=True)
+    kind = models.CharField(_("Kind"), max_length=10, choices=Kind.choices)
+    object_id = models.UUIDField(_("Object id"))
+    operation = models.CharField(
+        _("Operation"), max_length=10, choices=Operation.choices
+    )
+    survey_id = models.UUIDField(_("Survey id"))
+    # To scope it to the networks of the method (see NetworkFilterMixin)
+    method = models.ForeignKey(
+        Method,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        blank=True,
+        null=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(_("created at"), default=timezone.now)
+
+    class Meta:
+        ordering = ["seq"]
+        indexes = [
+            models.Index(fields=["kind", "object_id", "seq"], name="change_object_idx"),
+            models.Index(fields=["created_at"], name="change_created_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.seq} {self.operation} {self.kind} {self.object_id}"
+
+
+class ChangeCompaction(models.Model):
+    """
+    Compaction of the change log that deleted expired deletes, with the last
+    position it deleted: cursors before it may have missed them, so they have
+    to sync again from the start (see ChangeFeedView).
+    """
+
+    purged_seq = models.BigIntegerField(_("Purged sequence"))
+    created_at = models.DateTimeField(_("created at"), default=timezone.now)
+
+    def __str__(self):
+        return f"{self.created_at} {self.purged_seq}"
+
+
+class IndicatorComparison(BaseModel):
+    """
+    Value of a numeric indicator (or one of its gender or group items) answered
+    by an organization in a campaign, compared with the previous campaigns of
+    its chain (see update_indicator_comparisons).
+    """
+
+    campaign = models.ForeignKey(
+        Campaign, on_delete=models.CASCADE, verbose_name=_("Campaign")
+    )
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        verbose_name=_("Organization"),
+    )
+    project = models.ForeignKey(
+        "organizations.Project",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        verbose_name=_("Project"),
+    )
+    indicator = models.ForeignKey(
+        Indicator, on_delete=models.CASCADE, verbose_name=_("Indicator")
+    )
+    # The gender or group items suffixes, as in the formulas of the indicators
+    item = models.CharField(_("Item"), max_length=601, blank=True)
+    # One value per campaign of the chain, from the oldest one
+    values = models.JSONField(_("Values"), default=list)
+    value = models.FloatField(_("Value"))
+    previous_value = models.FloatField(_("Previous value"), blank=True, null=True)
+    delta = models.FloatField(_("Delta"), blank=True, null=True)
+    relative_delta = models.FloatField(_("Relative delta"), blank=True, null=True)
+    # Slope of the least squares line of the values, per campaign
+    trend = models.FloatField(_("Trend"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("indicator comparison")
+        verbose_name_plural = _("indicator comparisons")
+        indexes = [models.Index(fields=["campaign", "indicator"])]
+
+    def __str__(self):
+        code = self.indicator.code
+        return f"{code}_{self.item}" if self.item else code
+
+
+class SearchEntry(BaseModel):
+    """
+    Text of an indicator, set or topic in one language, as the catalogue
+    search matches it: its HTML stripped name and description, the names of
+    its topics and its code (see apps.methods.search).
+    """
+
+    class Kind(models.TextChoices):
+        INDICATOR = "indicator", _("Indicator")
+        INDICATORS_SET = "indicators_set", _("Indicators set")
+        TOPIC = "topic", _("Topic")
+
+    kind = models.CharField(_("Kind"), max_length=20, choices=Kind.choices)
+    object_id = models.UUIDField(_("Object id"))
+    language = models.CharField(_("Language"), max_length=10)
+    # Lowercase and without accents, for prefix matching
+    code = models.CharField(_("Code"), max_length=50, blank=True)
+    document = SearchVectorField(_("Document"))
+
+    class Meta:
+        verbose_name = _("search entry")
+        verbose_name_plural = _("search entries")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id", "language"],
+                name="unique_search_entry",
+            )
+        ]
+        indexes = [
+            GinIndex(fields=["document"]),
+            models.Index(
+                fields=["kind", "language", "code"],
+                name="search_entry_code_idx",
+                opclasses=["varchar_pattern_ops"] * 3,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} ({self.language})"
 
 
 class ExternalSurveyInvitation(BaseModel):
@@ -0,0 +1,216 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.http import quote_etag
+from django.utils.translation import gettext_lazy as _
+
+from .helpers import (
+    get_form_sections,
+    get_method_structure_version,
+    is_gendered,
+    parse_number,
+)
+from .mixins import get_survey_snapshot
+from .models import Indicator, Survey, SurveyReport
+
+# Items of the gendered indicators, in the order they are charted
+GENDER_ITEMS = [
+    ("female", _("Women")),
+    ("male", _("Men")),
+    ("non_binary", _("Non-binary")),
+]
+
+
+# Size in pixels of the bars of the charts
+BAR_HEIGHT = 28
+BAR_LABEL_WIDTH = 180
+BAR_MAX_WIDTH = 300
+
+
+def get_reports_storage():
+    # Private, so reports are only served while they can be published (see
+    # survey_report)
+    return storages["attachments"]
+
+
+def get_report_path(survey_id, language):
+    return f"reports/{survey_id}/{language}.html"
+
+
+def get_report_fingerprint(survey):
+    """
+    Returns what the report of a survey is rendered from: its answers (through
+    modified_date), the structure of its method and its organization.
+    """
+    return "{}:{}:{}".format(
+        survey.modified_date.timestamp() if survey.modified_date else "",
+        get_method_structure_version(survey.method_id),
+        survey.organization.updated_at.timestamp(),
+    )
+
+
+def get_report_fingerprint_etag(fingerprint, language):
+    return quote_etag(hashlib.sha256(f"{fingerprint}:{language}".encode()).hexdigest())
+
+
+def is_report_public(survey):
+    """
+    Whether the report of a survey can be published, as its organization (and
+    project, if any) allow it.
+    """
+    return (
+        survey.status == Survey.Status.QUALITY_CHECKED
+        and survey.organization.bs_allow_public
+        and (survey.project is None or survey.project.publish_results)
+    )
+
+
+def get_bar_chart(items):
+    """
+    Returns the bars of a chart of (label, value) items, their lengths relative
+    to the biggest value, or None if no item has a value.
+    """
+    items = [(label, parse_number(value)) for label, value in items]
+    items = [(label, value) for label, value in items if value is not None]
+    if not items:
+        return None
+    maximum = max(abs(value) for label, value in items) or 1
+    bars = []
+    for position, (label, value) in enumerate(items):
+        width = round(abs(value) * BAR_MAX_WIDTH / maximum, 1)
+        bars.append(
+            {
+                "label": label,
+                "value": value,
+                "width": width,
+                "value_x": width + BAR_LABEL_WIDTH + 10,
+                "y": position * BAR_HEIGHT,
+            }
+        )
+    return {"height": len(items) * BAR_HEIGHT, "bars": bars}
+
+
+def get_report_indicator(indicator, values):
+    """
+    Returns what the report shows of an answered numeric indicator: its value,
+    or the chart of its gender or group items.
+    """
+    answer = values.get(str(indicator.pk))
+    if not answer or answer.get("not_applicable"):
+        return None
+
+    value = answer["value"]
+    chart = None
+    if is_gendered(indicator.data_type):
+        chart = get_bar_chart(
+            (label, (value or {}).get(suffix)) for suffix, label in GENDER_ITEMS
+        )
+        value = None
+    elif indicator.is_group_indicator and indicator.group_2_id is None:
+        items = {item.suffix: item.title for item in indicator.group.items.all()}
+        chart = get_bar_chart(
+            (items.get(suffix, suffix), item_value)
+            for suffix, item_value in (value or {}).items()
+        )
+        value = None
+    elif indicator.data_type in (
+        Indicator.DataType.INTEGER,
+        Indicator.DataType.DECIMAL,
+    ):
+        value = parse_number(value)
+    else:
+        # Only numbers are published
+        return None
+
+    if value is None and chart is None:
+        return None
+    return {
+        "indicator": indicator,
+        "unit": Indicator.Unit(indicator.unit).label if indicator.unit else "",
+        "value": value,
+        "chart": chart,
+    }
+
+
+def get_report_sections(sections, values):
+    report_sections = []
+    for section, section_data in sections.items():
+        indicators = [item["indicator"] for item in section_data["indicators"]]
+        for subsection in section_data["subsections"]:
+            indicators += list(subsection.indicators.all())
+        report_indicators = [
+            report_indicator
+            for report_indicator in (
+                get_report_indicator(indicator, values) for indicator in indicators
+            )
+            if report_indicator
+        ]
+        if report_indicators:
+            report_sections.append(
+                {"section": section, "indicators": report_indicators}
+            )
+    return report_sections
+
+
+def generate_survey_report(survey_id):
+    """
+    Renders the public report of a quality checked survey (HTML with static SVG
+    charts) to the private storage, in every language, unless it's already rendered
+    from the same data. Indicators of sets aren't included, as they can have any
+    number of instances. Returns the report, or None if the survey isn't quality
+    checked.
+    """
+    survey = Survey.objects.select_related(
+        "method", "campaign", "organization", "project"
+    ).get(pk=survey_id)
+    if survey.status != Survey.Status.QUALITY_CHECKED:
+        return None
+
+    fingerprint = get_report_fingerprint(survey)
+    report = SurveyReport.objects.filter(survey=survey).first()
+    if report and report.fingerprint == fingerprint:
+        return report
+
+    values = get_survey_snapshot(survey).initial_values
+    sections = get_form_sections(survey.method)
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            content = render_to_string(
+                "methods/survey_report.html",
+                {
+                    "survey": survey,
+                    "organization": survey.organization,
+                    "sections": get_report_sections(sections, values),
+                },
+            )
+        path = get_report_path(survey.pk, language)
+        storage = get_reports_storage()
+        storage.delete(path)
+        storage.save(path, ContentFile(content.encode()))
+
+    report, _created = SurveyReport.objects.update_or_create(
+        survey=survey, defaults={"fingerprint": fingerprint}
+    )
+    return report
+
+
+def generate_survey_reports(survey_ids):
+    for survey_id in survey_ids:
+        generate_survey_report(survey_id)
+
+
+def delete_survey_reports(survey_ids):
+    """
+    Deletes the rendered reports of surveys that can't be published anymore, in
+    every language.
+    """
+    storage = get_reports_storage()
+    reports = SurveyReport.objects.filter(survey_id__in=survey_ids)
+    for survey_id in reports.values_list("survey_id", flat=True):
+        for language, _name in settings.LANGUAGES:
+            storage.delete(get_report_path(survey_id, language))
+    reports.delete()
@@ -0,0 +1,216 @@
+import html
+import re
+import unicodedata
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import transaction
+from django.db.models import Case, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.utils import translation
+from django.utils.html import strip_tags
+from modeltranslation.settings import AVAILABLE_LANGUAGES, DEFAULT_LANGUAGE
+from modeltranslation.utils import build_localized_fieldname
+
+from .models import Indicator, IndicatorsSet, SearchEntry, Topic
+
+# Model and translated fields of what's indexed of each kind of object
+SEARCH_INDEX = {
+    SearchEntry.Kind.INDICATOR: (Indicator, ["name", "description"]),
+    SearchEntry.Kind.INDICATORS_SET: (
+        IndicatorsSet,
+        ["name", "description", "instance_name"],
+    ),
+    SearchEntry.Kind.TOPIC: (Topic, ["name", "description"]),
+}
+
+# Searching shorter words matches too many entries
+MIN_WORD_LENGTH = 2
+
+
+def normalize_text(text):
+    """
+    Returns the plain text of some HTML in lowercase and without accents, so
+    "Economía" and "economia" are the same word.
+    """
+    text = html.unescape(strip_tags(text or ""))
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def get_search_config(language):
+    return settings.SEARCH_CONFIGS.get(language, "simple")
+
+
+def get_search_language(language=None):
+    language = translation.get_supported_language_variant(
+        language or translation.get_language() or settings.LANGUAGE_CODE
+    )
+    language = language.split("-")[0]
+    return language if language in AVAILABLE_LANGUAGES else DEFAULT_LANGUAGE
+
+
+def get_translation(values, field, language):
+    # Like modeltranslation, untranslated fields fall back to the default
+    # language
+    return (
+        values[build_localized_fieldname(field, language)]
+        or values[build_localized_fieldname(field, DEFAULT_LANGUAGE)]
+    )
+
+
+def get_topic_names(kind, object_ids):
+    """
+    Returns the values of the names of the topics of each object, in every
+    language: the topics of the indicators, and the parent of the topics.
+    """
+    name_fields = [
+        build_localized_fieldname("name", language) for language in AVAILABLE_LANGUAGES
+    ]
+    if kind == SearchEntry.Kind.INDICATOR:
+        rows = Indicator.topics.through.objects.filter(
+            indicator_id__in=object_ids
+        ).values_list("indicator_id", *[f"topic__{field}" for field in name_fields])
+    elif kind == SearchEntry.Kind.TOPIC:
+        rows = Topic.objects.filter(
+            pk__in=object_ids, parent__isnull=False
+        ).values_list("pk", *[f"parent__{field}" for field in name_fields])
+    else:
+        return {}
+
+    topics = {}
+    for object_id, *names in rows:
+        topics.setdefault(object_id, []).append(
+            dict(zip(name_fields, names, strict=True))
+        )
+    return topics
+
+
+def update_search_index(kind, object_ids=None):
+    """
+    Indexes the objects of a kind (all of them by default) in every language,
+    replacing their entries, and removes the entries of the ones that don't
+    exist anymore. Returns the number of indexed objects.
+    """
+    model, fields = SEARCH_INDEX[kind]
+    objects = model.objects.all()
+    if object_ids is not None:
+        objects = objects.filter(pk__in=object_ids)
+    translated_fields = [
+        build_localized_fieldname(field, language)
+        for field in fields
+        for language in AVAILABLE_LANGUAGES
+    ]
+    rows = list(
+        objects.values(
+            "pk",
+            *translated_fields,
+            *(["code"] if kind != SearchEntry.Kind.TOPIC else []),
+        )
+    )
+    topics = get_topic_names(kind, [row["pk"] for row in rows])
+
+    entries = []
+    for row in rows:
+        for language in AVAILABLE_LANGUAGES:
+            config = get_search_config(language)
+            name, *texts = [
+                normalize_text(get_translation(row, field, language))
+                for field in fields
+            ]
+            topic_names = " ".join(
+                normalize_text(get_translation(topic, "name", language))
+                for topic in topics.get(row["pk"], [])
+            )
+            code = normalize_text(row.get("code"))
+            entries.append(
+                SearchEntry(
+                    kind=kind,
+                    object_id=row["pk"],
+                    language=language,
+                    code=code,
+                    document=(
+                        SearchVector(Value(f"{code} {name}"), config=config, weight="A")
+                        + SearchVector(Value(topic_names), config=config, weight="B")
+                        + SearchVector(
+                            Value(" ".join(texts)), config=config, weight="C"
+                        )
+                    ),
+                )
+            )
+
+    with transaction.atomic():
+        stale = SearchEntry.objects.filter(kind=kind)
+        if object_ids is not None:
+            stale = stale.filter(object_id__in=object_ids)
+        stale.exclude(object_id__in=[row["pk"] for row in rows]).delete()
+        SearchEntry.objects.bulk_create(
+            entries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["kind", "object_id", "language"],
+            update_fields=["code", "document", "updated_at"],
+        )
+    return len(rows)
+
+
+def get_search_query(term, language):
+    """
+    Returns the full text query of the words of a search term, each of them
+    matching words that start with it, or None if it has no words.
+    """
+    words = [
+        word
+        for word in re.findall(r"\w+", normalize_text(term))
+        if len(word) >= MIN_WORD_LENGTH
+    ]
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=get_search_config(language),
+    )
+
+
+def search(queryset, kind, term, language=None):
+    """
+    Filters a queryset of indicators, sets or topics by a search term, in the
+    given language (the current one by default): objects whose code starts with
+    it, or whose text has all its words. They are ordered by relevance, codes
+    first.
+    """
+    language = get_search_language(language)
+    code = normalize_text(term).strip()
+    condition = Q(code__startswith=code)
+    query = get_search_query(term, language)
+    rank = Case(When(code__startswith=code, then=Value(1.0)), default=Value(0.0))
+    if query is not None:
+        condition |= Q(document=query)
+        rank += SearchRank(F("document"), query)
+
+    # The indexes of the entries select the matching objects, and only those
+    # are ranked
+    entries = SearchEntry.objects.filter(kind=kind, language=language)
+    ranks = (
+        entries.filter(object_id=OuterRef("pk")).annotate(rank=rank).values("rank")[:1]
+    )
+    ordering = queryset.query.order_by or queryset.model._meta.ordering or ["pk"]
+    return (
+        queryset.filter(pk__in=entries.filter(condition).values("object_id"))
+        .annotate(search_rank=Subquery(ranks, output_field=FloatField()))
+        .order_by("-search_rank", *ordering)
+    )
+
+
+class SearchIndexAdminMixin:
+    """
+    Searches the changelist and the autocomplete of an admin with the search
+    index of its kind of objects instead of the search fields.
+    """
+
+    search_index_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        return search(queryset, self.search_index_kind, search_term), False
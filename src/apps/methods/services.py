@@ -1,6 +1,8 @@
 from django.urls import reverse
+from django.utils import translation
 
-from project.post_office import send
+from apps.users.models import User
+from project.post_office import queue, queue_many
 from project.utils.smtp_utils import get_from_email, get_smtp_for_user
 
 from .models import Survey
@@ -21,7 +23,7 @@ def send_invitation(request, invitation):
     smtp = get_smtp_for_user(user=request.user)
     from_email = get_from_email(user=request.user)
 
-    send(
+    queue(
         sender=from_email,
         recipients=[invitation.email],
         template="external_survey_invitation",
@@ -39,7 +41,7 @@ def send_survey_reminder_email(request):
 
     smtp = get_smtp_for_user(user=request.user)
     from_email = get_from_email(user=request.user)
-    send(
+    queue(
         sender=from_email,
         bcc=user_emails,
         template="survey_reminder",
@@ -53,7 +55,7 @@ def send_user_survey_reminder_email(request, survey_id):
 
     smtp = get_smtp_for_user(user=request.user)
     from_email = get_from_email(user=request.user)
-    send(
+    queue(
         sender=from_email,
         recipients=[survey.user.email],
         template="user_survey_reminder",
@@ -62,25 +64,39 @@ def send_user_survey_reminder_email(request, survey_id):
     )
 
 
-def send_survey_status_update_email(request, survey_id, survey_status):
-    template = None
-    if survey_status == Survey.Status.TECH_VALIDATED:
-        template = "survey_tech_validated"
-    elif survey_status == Survey.Status.QUALITY_CHECKED:
-        template = "survey_quality_checked"
-
-    if template:
-        survey = Survey.objects.get(id=survey_id)
-        context = {"user_name": survey.user.name, "method_name": survey.method.name}
-
-        smtp = get_smtp_for_user(user=request.user)
-        from_email = get_from_email(user=request.user)
-        return send(
-            sender=from_email,
-            recipients=[survey.user.email],
-            template=template,
-            context=context,
-            smtp=smtp,
+# Email templates sent to the users of the surveys moved to each status
+SURVEY_STATUS_EMAIL_TEMPLATES = {
+    Survey.Status.TECH_VALIDATED: "survey_tech_validated",
+    Survey.Status.QUALITY_CHECKED: "survey_quality_checked",
+}
+
+
+def send_survey_status_update_emails(survey_ids, survey_status, sender_id, language):
+    """
+    Lets the users of the surveys know that they have moved to a status, if it's
+    configured to send an email, queueing them in a single batch for the SMTP
+    server of the network of the reviewer. Meant to run in the background (see
+    run_in_background).
+    """
+    template = SURVEY_STATUS_EMAIL_TEMPLATES.get(survey_status)
+    if not template:
+        return 0
+
+    sender = User.objects.select_related("profile__organization").get(pk=sender_id)
+    surveys = Survey.objects.filter(pk__in=survey_ids, user__isnull=False).values_list(
+        "user__name", "user__email", "method__name"
+    )
+    from_email = get_from_email(user=sender)
+    with translation.override(language):
+        return queue_many(
+            [
+                {
+                    "sender": from_email,
+                    "recipients": [user_email],
+                    "template": template,
+                    "context": {"user_name": user_name, "method_name": method_name},
+                }
+                for user_name, user_email, method_name in surveys
+            ],
+            smtp=get_smtp_for_user(user=sender),
         )
-    else:
-        return ""  # The survey status is not configured to send an email
@@ -0,0 +1,139 @@
+from django.db import transaction
+
+from project.utils.background import run_in_background
+
+from .changes import get_change, record_changes
+from .helpers import (
+    get_structure_method_ids,
+    invalidate_current_surveys_stats,
+    invalidate_method_structure,
+)
+from .models import (
+    Change,
+    Group,
+    Indicator,
+    IndicatorsSet,
+    List,
+    Method,
+    SearchEntry,
+    Section,
+    Survey,
+    SurveyReport,
+    Topic,
+)
+from .reports import delete_survey_reports, generate_survey_reports
+from .search import update_search_index
+
+
+def survey_saved(sender, instance, **kwargs):
+    if instance.user_id:
+        transaction.on_commit(
+            lambda: invalidate_current_surveys_stats(instance.user_id)
+        )
+
+
+def changed_object_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        operation = Change.Operation.INSERT if created else Change.Operation.UPDATE
+        record_changes([get_change(instance, operation)])
+
+
+def changed_object_deleted(sender, instance, **kwargs):
+    record_changes([get_change(instance, Change.Operation.DELETE)])
+
+
+def survey_report_saved(sender, instance, created, **kwargs):
+    # Only when its data changed (see generate_survey_report)
+    if instance.status == Survey.Status.QUALITY_CHECKED:
+        run_in_background(generate_survey_reports, [instance.pk])
+    elif instance.status_has_changed:
+        run_in_background(delete_survey_reports, [instance.pk])
+
+
+def organization_publication_saved(sender, instance, **kwargs):
+    if not instance.bs_allow_public:
+        revoke_survey_reports(
+            SurveyReport.objects.filter(survey__organization=instance)
+        )
+
+
+def project_publication_saved(sender, instance, **kwargs):
+    if not instance.publish_results:
+        revoke_survey_reports(SurveyReport.objects.filter(survey__project=instance))
+
+
+def revoke_survey_reports(reports):
+    # The reports that can't be published anymore aren't kept in the storage
+    survey_ids = list(reports.values_list("survey_id", flat=True))
+    if survey_ids:
+        run_in_background(delete_survey_reports, survey_ids)
+
+
+def structure_saved(sender, instance, **kwargs):
+    method_ids = get_structure_method_ids(instance)
+    transaction.on_commit(lambda: invalidate_method_structure(method_ids))
+
+
+def structure_changed(sender, instance, action, model, pk_set, **kwargs):
+    # The relations still exist before clearing them, and already exist after
+    # adding them
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    method_ids = get_structure_method_ids(instance)
+    if pk_set and model in (Method, Section, IndicatorsSet, List, Group):
+        for related in model.objects.filter(pk__in=pk_set):
+            method_ids |= get_structure_method_ids(related)
+    transaction.on_commit(lambda: invalidate_method_structure(method_ids))
+
+
+SEARCH_KINDS = {
+    Indicator: SearchEntry.Kind.INDICATOR,
+    IndicatorsSet: SearchEntry.Kind.INDICATORS_SET,
+    Topic: SearchEntry.Kind.TOPIC,
+}
+
+
+def search_object_saved(sender, instance, **kwargs):
+    updates = {SEARCH_KINDS[sender]: [instance.pk]}
+    if sender is Topic:
+        # Their entries have the names of their topics
+        updates[SearchEntry.Kind.INDICATOR] = list(
+            instance.topics.values_list("pk", flat=True)
+        )
+        updates[SearchEntry.Kind.TOPIC] += Topic.objects.filter(
+            parent=instance
+        ).values_list("pk", flat=True)
+    transaction.on_commit(lambda: update_search_objects(updates))
+
+
+def search_topics_changed(sender, instance, action, pk_set, reverse, **kwargs):
+    # The relations still exist before clearing them
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        indicator_ids = [instance.pk]
+    elif action == "pre_clear":
+        indicator_ids = list(instance.topics.values_list("pk", flat=True))
+    else:
+        indicator_ids = list(pk_set)
+    transaction.on_commit(
+        lambda: update_search_objects({SearchEntry.Kind.INDICATOR: indicator_ids})
+    )
+
+
+def update_search_objects(updates):
+    for kind, object_ids in updates.items():
+        if object_ids:
+            update_search_index(kind, object_ids)
+
+
+def search_index_migrated(sender, plan=None, **kwargs):
+    # Built once the migration that adds it is applied, with the current models
+    # (the migration itself can only use the historical ones)
+    if any(
+        (migration.app_label, migration.name) == ("methods", "0018_searchentry")
+        and not backwards
+        for migration, backwards in plan or []
+    ):
+        for kind in SearchEntry.Kind:
+            update_search_index(kind)
@@ -0,0 +1,149 @@
+import gzip
+import json
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+
+from apps.methods.models import Campaign, Indicator, IndicatorResult, Method, Survey
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User
+
+
+@override_settings(LANGUAGE_CODE="en", API_PAGE_SIZE=2, API_MAX_PAGE_SIZE=3)
+class CursorApiTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        legal_structure = LegalStructure.objects.create(name="Cooperative")
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            cls.organization = Organization.objects.create(
+                name="Organization", legal_structure=legal_structure
+            )
+        cls.network = Network.objects.create(name="Network")
+        cls.network.organizations.add(cls.organization)
+        cls.organization.network_managed = cls.network
+        cls.organization.save()
+        cls.manager = User.objects.create_user(
+            "manager@example.com",
+            email_verified=True,
+            user_profile_data={"organization": cls.organization},
+        )
+
+        cls.method = Method.objects.create(name="Balance", description="-")
+        cls.method.networks.add(cls.network)
+        cls.other_method = Method.objects.create(name="Other", description="-")
+        cls.campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        cls.surveys = [
+            Survey.objects.create(
+                method=cls.method,
+                campaign=cls.campaign,
+                organization=cls.organization,
+                status=status,
+            )
+            for status in (
+                Survey.Status.OPEN,
+                Survey.Status.CLOSED,
+                Survey.Status.CLOSED,
+                Survey.Status.OPEN,
+            )
+        ]
+        # Not in the network of the manager
+        Survey.objects.create(method=cls.other_method, campaign=cls.campaign)
+        cls.indicator = Indicator.objects.create(
+            code="IND1",
+            version="1",
+            name="Workers",
+            is_direct_indicator=True,
+            data_type=Indicator.DataType.INTEGER,
+        )
+        cls.result = IndicatorResult.objects.create(
+            survey=cls.surveys[1], indicator=cls.indicator, value="10"
+        )
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages(self):
+        self.client.force_login(self.manager)
+        ids = []
+        page = self.get("/api/surveys/")
+        while True:
+            self.assertLessEqual(len(page["results"]), 2)
+            ids += [survey["id"] for survey in page["results"]]
+            if not page["next"]:
+                break
+            page = self.client.get(page["next"]).json()
+        self.assertEqual(ids, [str(survey.pk) for survey in self.surveys])
+
+        # Updated surveys move to the end
+        self.surveys[0].save()
+        cursor = self.get("/api/surveys/")["cursor"]
+        page = self.get("/api/surveys/", cursor=cursor)
+        self.assertEqual(page["results"][-1]["id"], str(self.surveys[0].pk))
+
+    def test_fields_and_filters(self):
+        self.client.force_login(self.manager)
+        page = self.get(
+            "/api/surveys/", fields="id,status", status=Survey.Status.CLOSED, limit=10
+        )
+        self.assertEqual(
+            page["results"],
+            [
+                {"id": str(survey.pk), "status": Survey.Status.CLOSED}
+                for survey in self.surveys[1:3]
+            ],
+        )
+        self.assertIsNone(page["next"])
+
+        page = self.get(
+            "/api/results/", fields="survey,indicator_code,value", method=self.method.pk
+        )
+        self.assertEqual(
+            page["results"],
+            [
+                {
+                    "survey": str(self.surveys[1].pk),
+                    "indicator_code": "IND1",
+                    "value": "10",
+                }
+            ],
+        )
+
+        for params in ({"fields": "token"}, {"cursor": "x"}, {"status": "closed"}):
+            response = self.client.get("/api/surveys/", params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_scope(self):
+        # The organization of the user doesn't manage a network anymore
+        Organization.objects.filter(pk=self.organization.pk).update(
+            network_managed=None
+        )
+        self.client.force_login(self.manager)
+        self.assertEqual(self.get("/api/surveys/")["results"], [])
+
+        self.manager.groups.add(
+            Group.objects.get_or_create(name="Governance Admins")[0]
+        )
+        page = self.get("/api/surveys/", method=self.other_method.pk)
+        self.assertEqual(len(page["results"]), 1)
+        # At most API_MAX_PAGE_SIZE
+        page = self.get("/api/surveys/", limit=10)
+        self.assertEqual(len(page["results"]), 3)
+        self.assertTrue(page["next"])
+
+    def test_etag_and_gzip(self):
+        self.client.force_login(self.manager)
+        response = self.client.get("/api/results/", headers={"accept-encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.content))["next"], None)
+
+        response = self.client.get(
+            "/api/results/", headers={"if-none-match": response.headers["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,239 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.storage import storages
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.methods.attachments import clean_attachments, get_parts_dir
+from apps.methods.mixins import save_indicator_result
+from apps.methods.models import (
+    Attachment,
+    Campaign,
+    ExternalSurveyInvitation,
+    Indicator,
+    IndicatorResult,
+    Invitation,
+    Method,
+    Survey,
+)
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    ATTACHMENT_CHUNK_SIZE=4,
+    ATTACHMENT_MAX_SIZE=20,
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+        "attachments": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tempfile.mkdtemp()},
+        },
+    },
+)
+class AttachmentUploadTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            legal_structure = LegalStructure.objects.create(name="Cooperative")
+            organization = Organization.objects.create(
+                name="Organization", legal_structure=legal_structure
+            )
+            other_organization = Organization.objects.create(
+                name="Other", legal_structure=legal_structure
+            )
+        cls.user = User.objects.create_user(
+            "user@example.com",
+            email_verified=True,
+            user_profile_data={"organization": organization},
+        )
+        cls.other_user = User.objects.create_user(
+            "other@example.com",
+            email_verified=True,
+            user_profile_data={"organization": other_organization},
+        )
+        cls.indicator = Indicator.objects.create(
+            code="IND1",
+            version="1",
+            name="Statutes",
+            is_direct_indicator=True,
+            data_type=Indicator.DataType.ATTACHMENT,
+        )
+        cls.survey = Survey.objects.create(
+            method=Method.objects.create(name="Balance", description="-"),
+            campaign=Campaign.objects.create(name="2025", year="2025", status=True),
+            user=cls.user,
+            organization=organization,
+        )
+        cls.invitation = Invitation.objects.create(
+            name="Worker",
+            email="worker@example.com",
+            external_survey_invitation=ExternalSurveyInvitation.objects.create(
+                name="Workers",
+                external_survey=cls.survey.method,
+                organization=organization,
+                campaign=cls.survey.campaign,
+            ),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def start_upload(self, name="statutes.pdf", size=10, token=None):
+        url = reverse("methods:create_attachment_upload")
+        if token:
+            url += f"?token={token}"
+        return self.client.post(
+            url, {"indicator": self.indicator.pk, "name": name, "size": size}
+        )
+
+    def send_chunk(self, url, offset, data):
+        return self.client.patch(
+            url,
+            data,
+            content_type="application/octet-stream",
+            headers={"upload-offset": str(offset)},
+        )
+
+    def test_upload(self):
+        response = self.start_upload()
+        self.assertEqual(response.status_code, 201)
+        upload = response.json()
+        self.assertEqual(upload["chunk_size"], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send_chunk(upload["url"], 0, b"%PDF")
+            # Resumed from the offset the server has
+            response = self.send_chunk(upload["url"], 0, b"%PDF")
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()["offset"], 4)
+            self.send_chunk(upload["url"], 4, b"-1.7")
+            response = self.send_chunk(upload["url"], 8, b"\n%")
+
+        self.assertEqual(response.json()["offset"], 10)
+        attachment = Attachment.objects.get(pk=upload["id"])
+        self.assertEqual(attachment.status, Attachment.Status.COMPLETE)
+        self.assertEqual(attachment.content_type, "application/pdf")
+        with storages["attachments"].open(attachment.path) as file:
+            self.assertEqual(file.read(), b"%PDF-1.7\n%")
+        # The parts are joined and deleted
+        self.assertEqual(
+            storages["attachments"].listdir(get_parts_dir(attachment.pk))[1], []
+        )
+
+    def test_limits(self):
+        self.assertEqual(self.start_upload(name="script.exe").status_code, 400)
+        self.assertEqual(self.start_upload(size=21).status_code, 413)
+
+        upload = self.start_upload().json()
+        # Bigger than a chunk, or than the file
+        self.assertEqual(self.send_chunk(upload["url"], 0, b"12345").status_code, 413)
+        self.send_chunk(upload["url"], 0, b"1234")
+        self.send_chunk(upload["url"], 4, b"1234")
+        self.assertEqual(self.send_chunk(upload["url"], 8, b"123").status_code, 413)
+
+    def test_uploaded_by_other_user(self):
+        upload = self.start_upload().json()
+        self.client.logout()
+        self.assertEqual(self.client.get(upload["url"]).status_code, 404)
+        self.assertEqual(self.start_upload().status_code, 403)
+
+    def test_uploaded_with_token(self):
+        self.client.logout()
+        token = self.invitation.token
+        upload = self.start_upload(token=token).json()
+        self.assertEqual(self.client.get(upload["url"]).status_code, 200)
+        url = reverse("methods:attachment_upload", args=[upload["id"]])
+        # Not without the token of the invitation
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(f"{url}?token=other").status_code, 404)
+        response = self.send_chunk(url, 0, b"1234")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.send_chunk(upload["url"], 0, b"1234").status_code, 200)
+        # Nor by users
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(upload["url"]).status_code, 404)
+
+    def test_answer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            upload = self.start_upload(size=4).json()
+            self.send_chunk(upload["url"], 0, b"1234")
+        field_name = f"question_{self.indicator.pk}"
+
+        # Not by other users
+        request = RequestFactory().post("/", {field_name: upload["id"]})
+        request.user = self.other_user
+        save_indicator_result(request, self.survey, self.indicator, field_name)
+        self.assertFalse(IndicatorResult.objects.exists())
+        self.assertIsNone(Attachment.objects.get().survey)
+
+        request.user = self.user
+        save_indicator_result(request, self.survey, self.indicator, field_name)
+
+        result = IndicatorResult.objects.get(survey=self.survey)
+        self.assertEqual(result.value, upload["id"])
+        self.assertEqual(Attachment.objects.get().survey, self.survey)
+
+        # Only uploaded attachments of the indicator are answered
+        request = RequestFactory().post("/", {field_name: "../../etc/passwd"})
+        request.user = self.user
+        save_indicator_result(request, self.survey, self.indicator, field_name)
+        self.assertFalse(IndicatorResult.objects.exists())
+
+    def test_answer_with_token(self):
+        self.client.logout()
+        token = self.invitation.token
+        with self.captureOnCommitCallbacks(execute=True):
+            upload = self.start_upload(size=4, token=token).json()
+            self.send_chunk(upload["url"], 0, b"1234")
+        field_name = f"question_{self.indicator.pk}"
+        request = RequestFactory().post("/", {field_name: upload["id"]})
+        request.user = AnonymousUser()
+
+        # Only the survey of the same invitation
+        survey = Survey.objects.create(
+            method=self.survey.method, campaign=self.survey.campaign, token="other"
+        )
+        save_indicator_result(request, survey, self.indicator, field_name)
+        self.assertFalse(IndicatorResult.objects.exists())
+
+        survey.token = token
+        save_indicator_result(request, survey, self.indicator, field_name)
+        self.assertEqual(IndicatorResult.objects.get(survey=survey).value, upload["id"])
+
+    def test_clean_attachments(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            answered = self.start_upload(size=4).json()
+            self.send_chunk(answered["url"], 0, b"1234")
+            abandoned = self.start_upload().json()
+            self.send_chunk(abandoned["url"], 0, b"1234")
+        IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicator, value=answered["id"]
+        )
+        Attachment.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        recent = self.start_upload().json()
+
+        self.assertEqual(clean_attachments(), 1)
+
+        self.assertQuerySetEqual(
+            Attachment.objects.values_list("pk", flat=True),
+            [answered["id"], recent["id"]],
+            transform=str,
+            ordered=False,
+        )
+        self.assertEqual(
+            storages["attachments"].listdir(get_parts_dir(abandoned["id"]))[1], []
+        )
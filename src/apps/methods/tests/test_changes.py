@@ -0,0 +1,267 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.methods.changes import collect_changes, compact_changes
+from apps.methods.helpers import update_surveys_status
+from apps.methods.models import (
+    Campaign,
+    Change,
+    Indicator,
+    IndicatorResult,
+    Method,
+    Survey,
+)
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    API_PAGE_SIZE=2,
+    CHANGE_FEED_GAP_TIMEOUT=30,
+    CHANGE_LOG_RETENTION=60,
+)
+class ChangeLogTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            cls.organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        cls.network = Network.objects.create(name="Network")
+        cls.organization.network_managed = cls.network
+        cls.organization.save()
+        cls.manager = User.objects.create_user(
+            "manager@example.com",
+            email_verified=True,
+            user_profile_data={"organization": cls.organization},
+        )
+        cls.method = Method.objects.create(name="Balance", description="-")
+        cls.method.networks.add(cls.network)
+        cls.campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        cls.indicators = [
+            Indicator.objects.create(
+                code=f"IND{i}",
+                version="1",
+                name="Workers",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.INTEGER,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.survey = Survey.objects.create(method=self.method, campaign=self.campaign)
+
+    def get_log(self):
+        return list(Change.objects.values_list("kind", "operation", "object_id"))
+
+    def test_collect_changes(self):
+        kept = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[0], value="1"
+        )
+        deleted = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[1], value="2"
+        )
+        Change.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as queries, collect_changes():
+            kept.value = "10"
+            kept.save()
+            IndicatorResult.objects.filter(pk=deleted.pk).delete()
+            created = IndicatorResult.objects.create(
+                survey=self.survey, indicator=self.indicators[2], value="3"
+            )
+            created.save()
+            transient = IndicatorResult.objects.create(
+                survey=self.survey, indicator=self.indicators[2], gender=0
+            )
+            transient.delete()
+            self.assertEqual(Change.objects.count(), 0)
+
+        # Written at once
+        inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "methods_change"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual(
+            self.get_log(),
+            [
+                ("result", "update", kept.pk),
+                ("result", "delete", deleted.pk),
+                ("result", "insert", created.pk),
+            ],
+        )
+        # The method of the results is kept, even once they are deleted
+        self.assertEqual(
+            set(Change.objects.values_list("method_id", flat=True)), {self.method.pk}
+        )
+
+    def test_bulk_status_update(self):
+        Change.objects.all().delete()
+        update_surveys_status(Survey.objects.all(), Survey.Status.CLOSED)
+        self.assertEqual(self.get_log(), [("survey", "update", self.survey.pk)])
+
+    def test_feed(self):
+        result = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[0], value="1"
+        )
+        result_id = result.pk
+        result.delete()
+        self.client.force_login(self.manager)
+
+        page = self.client.get("/api/changes/").json()
+        self.assertEqual(
+            [(change["kind"], change["operation"]) for change in page["results"]],
+            [("survey", "insert"), ("result", "insert")],
+        )
+        page = self.client.get(page["next"]).json()
+        self.assertEqual(
+            page["results"],
+            [
+                {
+                    "seq": page["results"][0]["seq"],
+                    "kind": "result",
+                    "id": str(result_id),
+                    "operation": "delete",
+                    "survey": str(self.survey.pk),
+                    "method": str(self.method.pk),
+                    "created_at": page["results"][0]["created_at"],
+                }
+            ],
+        )
+        self.assertIsNone(page["next"])
+
+        # Syncing again from the last cursor
+        cursor = page["cursor"]
+        self.survey.save()
+        page = self.client.get("/api/changes/", {"cursor": cursor}).json()
+        self.assertEqual(
+            [change["operation"] for change in page["results"]], ["update"]
+        )
+        page = self.client.get("/api/changes/", {"cursor": page["cursor"]}).json()
+        self.assertEqual(page["results"], [])
+
+        # Other networks
+        Survey.objects.create(
+            method=Method.objects.create(name="Other", description="-"),
+            campaign=self.campaign,
+        )
+        page = self.client.get("/api/changes/", {"cursor": page["cursor"]}).json()
+        self.assertEqual(page["results"], [])
+
+    def test_feed_gap(self):
+        results = [
+            IndicatorResult.objects.create(
+                survey=self.survey, indicator=indicator, value="1"
+            )
+            for indicator in self.indicators
+        ]
+        self.client.force_login(self.manager)
+        # A change of a transaction not committed yet
+        running = Change.objects.get(object_id=results[1].pk)
+        seq = running.seq
+        running.delete()
+
+        page = self.client.get("/api/changes/", {"limit": 10}).json()
+        # Not after it, until it's committed
+        self.assertEqual(
+            [change["id"] for change in page["results"]],
+            [str(self.survey.pk), str(results[0].pk)],
+        )
+        page = self.client.get("/api/changes/", {"cursor": page["cursor"]}).json()
+        self.assertEqual(page["results"], [])
+        running.seq = seq
+        running.save()
+        page = self.client.get(
+            "/api/changes/", {"cursor": page["cursor"], "limit": 10}
+        ).json()
+        self.assertEqual(
+            [change["id"] for change in page["results"]],
+            [str(results[1].pk), str(results[2].pk)],
+        )
+
+        # Rolled back, once its timeout is over
+        cursor = page["cursor"]
+        result = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[0], gender=0
+        )
+        result.save()
+        Change.objects.get(object_id=result.pk, operation="insert").delete()
+        page = self.client.get("/api/changes/", {"cursor": cursor}).json()
+        self.assertEqual(page["results"], [])
+        Change.objects.update(created_at=timezone.now() - timedelta(seconds=40))
+        page = self.client.get("/api/changes/", {"cursor": cursor}).json()
+        self.assertEqual(
+            [change["operation"] for change in page["results"]], ["update"]
+        )
+
+    def test_feed_old_changes(self):
+        for indicator in self.indicators:
+            IndicatorResult.objects.create(
+                survey=self.survey, indicator=indicator, value="1"
+            )
+        Change.objects.update(created_at=timezone.now() - timedelta(seconds=120))
+        self.assertEqual(compact_changes(), 0)
+        self.client.force_login(self.manager)
+
+        # The first sync isn't expired by the age of the changes
+        seqs = []
+        page = self.client.get("/api/changes/").json()
+        while page["next"]:
+            seqs += [change["seq"] for change in page["results"]]
+            response = self.client.get(page["next"])
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+        seqs += [change["seq"] for change in page["results"]]
+        self.assertEqual(seqs, list(Change.objects.values_list("seq", flat=True)))
+
+    def test_compaction(self):
+        result = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[0], value="1"
+        )
+        result.save()
+        self.client.force_login(self.manager)
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        deleted = IndicatorResult.objects.create(
+            survey=self.survey, indicator=self.indicators[1], value="2"
+        )
+        deleted_id = deleted.pk
+        deleted.delete()
+        page = self.client.get("/api/changes/", {"limit": 10}).json()
+        last_cursor = page["cursor"]
+
+        # Not the changes a running transaction may still be before
+        self.assertEqual(compact_changes(), 0)
+        Change.objects.update(created_at=timezone.now() - timedelta(seconds=40))
+        self.assertEqual(compact_changes(), 2)
+        self.assertEqual(
+            self.get_log(),
+            [
+                ("survey", "insert", self.survey.pk),
+                ("result", "update", result.pk),
+                ("result", "delete", deleted_id),
+            ],
+        )
+
+        # Deletes are dropped after the retention, and the cursors before them
+        Change.objects.update(created_at=timezone.now() - timedelta(seconds=120))
+        self.assertEqual(compact_changes(), 1)
+        response = self.client.get("/api/changes/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 410)
+        response = self.client.get("/api/changes/", {"cursor": last_cursor})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,416 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.geodata.models import Country, Region1
+from apps.methods.helpers import (
+    clone_method,
+    get_current_surveys_stats,
+    get_methods_structure_versions,
+    get_surveys_progress,
+    update_indicator_comparisons,
+    update_surveys_status,
+)
+from apps.methods.models import (
+    Campaign,
+    Indicator,
+    IndicatorComparison,
+    IndicatorResult,
+    IndicatorsSet,
+    Method,
+    Section,
+    Survey,
+)
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User
+from project.utils.cache import get_cache_version
+
+
+class CloneMethodTestCase(TestCase):
+    def setUp(self):
+        self.indicators = [
+            Indicator.objects.create(
+                code=f"IND{i}",
+                version="1",
+                name=f"Indicator {i}",
+                is_direct_indicator=True,
+            )
+            for i in range(3)
+        ]
+        self.indicators_set = IndicatorsSet.objects.create(code="SET1", version="1")
+        self.indicators_set.indicators.set(self.indicators[:2])
+        region1 = Region1.objects.create(
+            name="Catalonia", country=Country.objects.create(name="Spain")
+        )
+
+        self.method = Method.objects.create(
+            name="Balance", description="Social balance", version="2024"
+        )
+        self.method.indicators.set(self.indicators)
+        self.method.indicators_sets.set([self.indicators_set])
+        self.method.region1.set([region1])
+        self.network = Network.objects.create(name="Network")
+        self.network.methods.add(self.method)
+
+        self.section = Section.objects.create(title="Section", method=self.method)
+        self.section.indicators.set([self.indicators[2], self.indicators[0]])
+        self.subsection = Section.objects.create(
+            title="Subsection", method=self.method, parent=self.section, order=1
+        )
+        self.subsection.indicators_sets.set([self.indicators_set])
+
+    def test_clone_method(self):
+        with self.assertNumQueries(21):
+            clone = clone_method(self.method, version="2025")
+
+        self.assertNotEqual(clone.pk, self.method.pk)
+        self.assertEqual(clone.name, "Balance")
+        self.assertEqual(clone.version, "2025")
+        self.assertEqual(set(clone.indicators.all()), set(self.indicators))
+        self.assertEqual(list(clone.indicators_sets.all()), [self.indicators_set])
+        self.assertEqual(list(clone.region1.all()), list(self.method.region1.all()))
+        self.assertEqual(list(clone.networks.all()), [self.network])
+
+        section, subsection = clone.section_set.all()
+        self.assertNotEqual(section.pk, self.section.pk)
+        self.assertEqual(subsection.parent, section)
+        self.assertEqual(
+            list(section.indicators.all()), [self.indicators[2], self.indicators[0]]
+        )
+        self.assertEqual(list(subsection.indicators_sets.all()), [self.indicators_set])
+
+        # The original method is left untouched
+        self.assertEqual(self.method.section_set.count(), 2)
+        self.assertEqual(list(self.section.indicators.all())[0], self.indicators[2])
+
+    def test_command(self):
+        campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        # Parsing the arguments as from the command line
+        call_command(
+            "clone_method",
+            str(self.method.pk),
+            "--new-version=2025",
+            "--name=Balance 2025",
+            f"--campaign={campaign.pk}",
+            stdout=io.StringIO(),
+        )
+        clone = Method.objects.get(version="2025")
+        self.assertEqual(clone.name, "Balance 2025")
+        self.assertEqual(list(campaign.methods.all()), [clone])
+
+
+class CurrentSurveysStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        geocoding = mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        )
+        geocoding.start()
+        self.addCleanup(geocoding.stop)
+
+        self.organization = Organization.objects.create(
+            name="Coop",
+            legal_structure=LegalStructure.objects.create(name="Cooperative"),
+        )
+        self.user = User.objects.create_user(
+            email="test@test.com",
+            user_profile_data={"organization": self.organization},
+        )
+        self.campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        self.indicators = [
+            Indicator.objects.create(
+                code=f"IND{i}", version="1", is_direct_indicator=True
+            )
+            for i in range(4)
+        ]
+
+    def add_method(self, name):
+        method = Method.objects.create(name=name, description="-")
+        for i, indicator in enumerate(self.indicators):
+            section = Section.objects.create(title=f"S{i}", method=method, order=i)
+            section.indicators.add(indicator)
+        self.organization.methods.add(method)
+        self.campaign.methods.add(method)
+        return method
+
+    def test_current_surveys_stats(self):
+        method = self.add_method("Balance")
+        survey = Survey.objects.create(
+            method=method, campaign=self.campaign, user=self.user
+        )
+        IndicatorResult.objects.create(
+            survey=survey, indicator=self.indicators[0], value="1"
+        )
+        IndicatorResult.objects.create(
+            survey=survey, indicator=self.indicators[1], not_applicable=True
+        )
+        IndicatorResult.objects.create(
+            survey=survey, indicator=self.indicators[2], value="", is_total=True
+        )
+
+        (stats,) = get_current_surveys_stats(self.user)
+        self.assertEqual(stats["survey"], survey)
+        self.assertEqual(stats["campaign"]["id"], self.campaign.id)
+        self.assertEqual(stats["totalProgress"], 50)
+        self.assertEqual(stats["totalCompleted"], 2)
+        self.assertEqual(stats["totalToDo"], 2)
+
+    def test_current_surveys_stats_queries(self):
+        self.add_method("Balance")
+        with self.assertNumQueries(10):
+            get_current_surveys_stats(User.objects.get(pk=self.user.pk))
+
+        # The number of queries doesn't depend on the number of methods
+        cache.clear()
+        self.add_method("Balance 2")
+        self.add_method("Balance 3")
+        with self.assertNumQueries(10):
+            stats = get_current_surveys_stats(User.objects.get(pk=self.user.pk))
+        self.assertEqual(len(stats), 3)
+
+        with self.assertNumQueries(0):
+            get_current_surveys_stats(self.user)
+
+
+class SurveysStatusTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            self.organization = Organization.objects.create(
+                name="Coop",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        self.user = User.objects.create_user(
+            email="test@test.com",
+            user_profile_data={"organization": self.organization},
+        )
+        self.campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        self.indicators = [
+            Indicator.objects.create(
+                code=f"IND{i}", version="1", is_direct_indicator=True
+            )
+            for i in range(2)
+        ]
+        self.method = Method.objects.create(name="Balance", description="-")
+        self.section = Section.objects.create(title="S", method=self.method)
+        self.section.indicators.add(self.indicators[0])
+        self.surveys = [
+            Survey.objects.create(
+                method=self.method,
+                campaign=self.campaign,
+                user=self.user,
+                organization=self.organization,
+                status=status,
+                modified_date=timezone.now(),
+            )
+            for status in [Survey.Status.CLOSED, Survey.Status.TECH_VALIDATED]
+        ]
+
+    def test_update_surveys_status(self):
+        versions = [
+            get_cache_version(f"home-dashboard:{self.user.pk}"),
+            get_cache_version(f"documents:{self.organization.pk}"),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            # The SELECT FOR UPDATE, the UPDATE and the INSERT of their changes,
+            # in a savepoint
+            with self.assertNumQueries(5):
+                updated_ids = update_surveys_status(
+                    Survey.objects.all(), Survey.Status.TECH_VALIDATED
+                )
+
+        self.assertEqual(updated_ids, [self.surveys[0].pk])
+        closed, validated = [
+            Survey.objects.get(pk=survey.pk) for survey in self.surveys
+        ]
+        self.assertEqual(closed.status, Survey.Status.TECH_VALIDATED)
+        self.assertIsNotNone(closed.validated_date)
+        self.assertIsNone(closed.evaluated_date)
+        # Surveys already in the status aren't touched
+        self.assertIsNone(validated.validated_date)
+        self.assertEqual(validated.updated_at, self.surveys[1].updated_at)
+
+        # The home dashboard and documents summary are invalidated
+        self.assertNotEqual(
+            get_cache_version(f"home-dashboard:{self.user.pk}"), versions[0]
+        )
+        self.assertNotEqual(
+            get_cache_version(f"documents:{self.organization.pk}"), versions[1]
+        )
+
+        self.assertEqual(
+            update_surveys_status(Survey.objects.all(), Survey.Status.TECH_VALIDATED),
+            [],
+        )
+
+    def test_surveys_progress(self):
+        IndicatorResult.objects.create(
+            survey=self.surveys[0], indicator=self.indicators[0], value="1"
+        )
+        surveys = list(
+            Survey.objects.select_related("method").prefetch_related(
+                "method__external_surveys"
+            )
+        )
+        # And the structure version of the method, until it's cached
+        with self.assertNumQueries(5):
+            progress = get_surveys_progress(surveys)
+        self.assertEqual(progress, {self.surveys[0].pk: 100, self.surveys[1].pk: 0})
+
+        # Cached until the survey is modified
+        IndicatorResult.objects.create(
+            survey=self.surveys[1], indicator=self.indicators[0], value="1"
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(get_surveys_progress(surveys), progress)
+        surveys[1].modified_date = timezone.now()
+        with self.assertNumQueries(4):
+            self.assertEqual(get_surveys_progress(surveys)[self.surveys[1].pk], 100)
+
+        # or the structure of its method changes
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.indicators.add(self.indicators[1])
+        self.assertEqual(
+            get_surveys_progress(surveys),
+            {self.surveys[0].pk: 50, self.surveys[1].pk: 50},
+        )
+
+    def test_methods_structure_versions(self):
+        other = Method.objects.create(name="Other", description="-")
+        Method.objects.filter(pk=other.pk).update(structure_version=3)
+        method_ids = {self.method.pk, other.pk}
+        # The ones not cached yet, together
+        with self.assertNumQueries(1):
+            versions = get_methods_structure_versions(method_ids)
+        self.assertEqual(versions, {self.method.pk: 0, other.pk: 3})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_methods_structure_versions(method_ids), versions)
+
+
+class IndicatorComparisonsTestCase(TestCase):
+    def setUp(self):
+        geocoding = mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        )
+        geocoding.start()
+        self.addCleanup(geocoding.stop)
+
+        legal_structure = LegalStructure.objects.create(name="Cooperative")
+        self.organizations = [
+            Organization.objects.create(
+                name=f"Organization {i}", legal_structure=legal_structure
+            )
+            for i in range(2)
+        ]
+        self.campaigns = []
+        for year in ["2023", "2024", "2025"]:
+            self.campaigns.append(
+                Campaign.objects.create(
+                    name=year,
+                    year=year,
+                    status=True,
+                    previous_campaign=self.campaigns[-1] if self.campaigns else None,
+                )
+            )
+        self.method = Method.objects.create(name="Balance", description="-")
+        self.workers = Indicator.objects.create(
+            code="WORKERS",
+            version="1",
+            is_direct_indicator=True,
+            data_type=Indicator.DataType.INTEGERGENDER,
+        )
+        self.income = Indicator.objects.create(
+            code="INCOME",
+            version="1",
+            is_direct_indicator=True,
+            data_type=Indicator.DataType.DECIMAL,
+        )
+        self.name = Indicator.objects.create(
+            code="NAME",
+            version="1",
+            is_direct_indicator=True,
+            data_type=Indicator.DataType.STRING,
+        )
+
+    def add_survey(self, organization, campaign, results, **kwargs):
+        survey = Survey.objects.create(
+            method=kwargs.pop("method", self.method),
+            campaign=campaign,
+            organization=organization,
+            status=kwargs.pop("status", Survey.Status.CLOSED),
+        )
+        for indicator, value, gender in results:
+            IndicatorResult.objects.create(
+                survey=survey, indicator=indicator, value=value, gender=gender
+            )
+        return survey
+
+    def test_update_indicator_comparisons(self):
+        female = IndicatorResult.Gender.FEMALE
+        first, second = self.organizations
+        old, previous, current = self.campaigns
+        self.add_survey(first, old, [(self.income, "10", None)])
+        self.add_survey(first, previous, [(self.workers, "2", female)])
+        self.add_survey(
+            first,
+            current,
+            [
+                (self.income, "16.5", None),
+                (self.workers, "3", female),
+                (self.name, "Coop", None),
+            ],
+        )
+        # Not closed
+        self.add_survey(
+            second, current, [(self.income, "1", None)], status=Survey.Status.OPEN
+        )
+
+        # One query per campaign of the chain, and one for all the results
+        with self.assertNumQueries(7):
+            self.assertEqual(update_indicator_comparisons(current), 2)
+
+        income, workers = IndicatorComparison.objects.filter(campaign=current).order_by(
+            "indicator__code"
+        )
+        self.assertEqual(income.organization, first)
+        self.assertEqual(income.values, [10, None, 16.5])
+        self.assertIsNone(income.previous_value)
+        self.assertIsNone(income.delta)
+        self.assertEqual(income.trend, 3.25)
+        self.assertEqual(workers.item, "female")
+        self.assertEqual(workers.previous_value, 2)
+        self.assertEqual(workers.delta, 1)
+        self.assertEqual(workers.relative_delta, 0.5)
+
+        # Comparisons are replaced
+        IndicatorResult.objects.filter(value="3").update(value="4")
+        update_indicator_comparisons(current)
+        self.assertEqual(
+            IndicatorComparison.objects.get(indicator=self.workers).delta, 2
+        )
+
+    def test_method_versions(self):
+        first = self.organizations[0]
+        previous, current = self.campaigns[1:]
+        self.method.indicators.set([self.income])
+        self.add_survey(first, previous, [(self.income, "10", None)])
+        # A new version of the method in the campaign, which shares the
+        # indicators of the previous one
+        method = clone_method(self.method, version="2025")
+        self.add_survey(first, current, [(self.income, "12", None)], method=method)
+
+        self.assertEqual(update_indicator_comparisons(current), 1)
+        comparison = IndicatorComparison.objects.get()
+        self.assertEqual(comparison.indicator, self.income)
+        self.assertEqual(comparison.values, [None, 10, 12])
+        self.assertEqual(comparison.delta, 2)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.methods.mixins import get_survey_snapshot
+from apps.methods.models import (
+    Campaign,
+    Indicator,
+    IndicatorResult,
+    Method,
+    Survey,
+    SurveySnapshot,
+)
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+
+
+class SurveySnapshotTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        user = User.objects.create_user(
+            "user@example.com", user_profile_data={"organization": organization}
+        )
+        cls.indicator = Indicator.objects.create(
+            code="IND1", version="1", name="Indicator", is_direct_indicator=True
+        )
+        cls.method = Method.objects.create(name="Balance", description="-")
+        cls.method.indicators.set([cls.indicator])
+        cls.survey = Survey.objects.create(
+            method=cls.method,
+            campaign=Campaign.objects.create(name="2025", year="2025", status=True),
+            user=user,
+            organization=organization,
+            status=Survey.Status.CLOSED,
+            modified_date=timezone.now(),
+        )
+        IndicatorResult.objects.create(
+            survey=cls.survey, indicator=cls.indicator, value="10"
+        )
+
+    def test_snapshot(self):
+        snapshot = get_survey_snapshot(self.survey)
+        self.assertEqual(snapshot.modified_date, self.survey.modified_date)
+        self.assertEqual(
+            snapshot.initial_values,
+            {
+                str(self.indicator.pk): {
+                    "value": "10",
+                    "not_applicable": None,
+                    "instance_number": -1,
+                }
+            },
+        )
+
+        # Further reads don't look at the results
+        IndicatorResult.objects.update(value="20")
+        with self.assertNumQueries(1):
+            self.assertEqual(get_survey_snapshot(self.survey), snapshot)
+
+    def test_snapshot_survey_modified(self):
+        get_survey_snapshot(self.survey)
+        IndicatorResult.objects.update(value="20")
+        self.survey.modified_date += timedelta(minutes=1)
+
+        snapshot = get_survey_snapshot(self.survey)
+
+        self.assertEqual(SurveySnapshot.objects.count(), 1)
+        self.assertEqual(snapshot.modified_date, self.survey.modified_date)
+        self.assertEqual(snapshot.initial_values[str(self.indicator.pk)]["value"], "20")
+
+    def test_snapshot_structure_changed(self):
+        snapshot = get_survey_snapshot(self.survey)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.method.indicators.clear()
+
+        self.assertGreater(
+            get_survey_snapshot(self.survey).structure_version,
+            snapshot.structure_version,
+        )
+
+        # Even if the method was loaded before, and saved afterwards
+        method = Method.objects.get(pk=self.method.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.method.indicators.set([self.indicator])
+            method.save()
+        self.assertEqual(
+            Method.objects.get(pk=self.method.pk).structure_version,
+            method.structure_version + 2,
+        )
+
+    def test_snapshot_cache_cleared(self):
+        snapshot = get_survey_snapshot(self.survey)
+        IndicatorResult.objects.update(value="20")
+        cache.clear()
+
+        # The structure version is kept in the database
+        snapshot = get_survey_snapshot(self.survey)
+        self.assertEqual(snapshot.initial_values[str(self.indicator.pk)]["value"], "10")
@@ -0,0 +1,201 @@
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import default_storage, storages
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.methods.models import (
+    Campaign,
+    Indicator,
+    IndicatorResult,
+    Method,
+    Section,
+    Survey,
+    SurveyReport,
+)
+from apps.methods.reports import generate_survey_report, get_report_path
+from apps.organizations.models import Organization, Project
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    STORAGES={
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tempfile.mkdtemp()},
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+        "attachments": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tempfile.mkdtemp()},
+        },
+    },
+)
+class SurveyReportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            cls.organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+                bs_allow_public=True,
+            )
+        user = User.objects.create_user(
+            "user@example.com", user_profile_data={"organization": cls.organization}
+        )
+        cls.method = Method.objects.create(name="Balance", description="-")
+        section = Section.objects.create(method=cls.method, title="Economy")
+        cls.indicators = [
+            Indicator.objects.create(
+                code="IND1",
+                version="1",
+                name="Turnover",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.DECIMAL,
+            ),
+            Indicator.objects.create(
+                code="IND2",
+                version="1",
+                name="Workers",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.INTEGERGENDER,
+            ),
+            Indicator.objects.create(
+                code="IND3",
+                version="1",
+                name="Comments",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.TEXT,
+            ),
+        ]
+        cls.method.indicators.set(cls.indicators)
+        section.indicators.set(cls.indicators)
+        cls.survey = Survey.objects.create(
+            method=cls.method,
+            campaign=Campaign.objects.create(name="2025", year="2025", status=True),
+            user=user,
+            organization=cls.organization,
+            status=Survey.Status.TECH_VALIDATED,
+            modified_date=timezone.now(),
+        )
+        turnover, workers, comments = cls.indicators
+        IndicatorResult.objects.create(
+            survey=cls.survey, indicator=turnover, value="1250.5"
+        )
+        for gender, value in [
+            (IndicatorResult.Gender.FEMALE, "3"),
+            (IndicatorResult.Gender.MALE, "2"),
+        ]:
+            IndicatorResult.objects.create(
+                survey=cls.survey, indicator=workers, gender=gender, value=value
+            )
+        IndicatorResult.objects.create(
+            survey=cls.survey, indicator=comments, value="Private"
+        )
+        cls.url = reverse("methods:survey_report", args=[cls.survey.pk])
+
+    def set_quality_checked(self):
+        self.survey.status = Survey.Status.QUALITY_CHECKED
+        with self.captureOnCommitCallbacks(execute=True):
+            self.survey.save()
+
+    def test_generated_on_quality_checked(self):
+        self.assertIsNone(generate_survey_report(self.survey.pk))
+        self.set_quality_checked()
+
+        report = SurveyReport.objects.get(survey=self.survey)
+        for language in ["en", "ca"]:
+            path = get_report_path(self.survey.pk, language)
+            self.assertTrue(storages["attachments"].exists(path))
+            # Not in the public media storage
+            self.assertFalse(default_storage.exists(path))
+        with storages["attachments"].open(
+            get_report_path(self.survey.pk, "en")
+        ) as file:
+            content = file.read().decode()
+        self.assertIn("Turnover", content)
+        self.assertIn("1,250.50", content)
+        self.assertIn("<svg", content)
+        self.assertIn("Women", content)
+        # Only numbers are published
+        self.assertNotIn("Private", content)
+
+        # Not rendered again from the same data
+        with mock.patch("apps.methods.reports.render_to_string") as render:
+            self.assertEqual(generate_survey_report(self.survey.pk), report)
+        render.assert_not_called()
+
+    def test_serve(self):
+        self.set_quality_checked()
+
+        # Served from the storage, without reading the results
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn(b"Turnover", b"".join(response.streaming_content))
+        self.assertIn("public", response["Cache-Control"])
+
+        response = self.client.get(
+            self.url, headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_public(self):
+        self.set_quality_checked()
+        Organization.objects.filter(pk=self.organization.pk).update(
+            bs_allow_public=False
+        )
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        # Not quality checked anymore
+        Organization.objects.filter(pk=self.organization.pk).update(
+            bs_allow_public=True
+        )
+        Survey.objects.filter(pk=self.survey.pk).update(status=Survey.Status.CLOSED)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_deleted_when_revoked(self):
+        path = get_report_path(self.survey.pk, "en")
+        self.set_quality_checked()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organization.bs_allow_public = False
+            self.organization.save()
+        self.assertFalse(SurveyReport.objects.exists())
+        self.assertFalse(storages["attachments"].exists(path))
+
+        Organization.objects.filter(pk=self.organization.pk).update(
+            bs_allow_public=True
+        )
+        project = Project.objects.create(
+            organization=self.organization,
+            name="Project",
+            authorize=True,
+            publish_results=True,
+        )
+        self.survey.project = project
+        self.set_quality_checked()
+        self.assertTrue(storages["attachments"].exists(path))
+        with self.captureOnCommitCallbacks(execute=True):
+            project.publish_results = False
+            project.save()
+        self.assertFalse(storages["attachments"].exists(path))
+
+        # Or when the survey isn't quality checked anymore
+        project.publish_results = True
+        project.save()
+        self.set_quality_checked()
+        self.survey.status = Survey.Status.CLOSED
+        with self.captureOnCommitCallbacks(execute=True):
+            self.survey.save()
+        self.assertFalse(SurveyReport.objects.exists())
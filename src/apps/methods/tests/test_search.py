@@ -0,0 +1,174 @@
+from unittest import mock
+
+from django.contrib.auth import models as auth_models
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.methods.models import Indicator, IndicatorsSet, SearchEntry, Topic
+from apps.methods.search import search
+from apps.methods.signals import search_index_migrated
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+
+
+@override_settings(LANGUAGE_CODE="en")
+class SearchIndexTestCase(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic = Topic.objects.create(
+                name="Gender equality", name_ca="Igualtat de gènere", description="-"
+            )
+            self.indicator = Indicator.objects.create(
+                code="GEN-01",
+                version="1",
+                name="<p>Number of <strong>workers</strong> in the cooperative</p>",
+                name_ca="<p>Nombre de persones treballadores</p>",
+                description="<p>Includes the economía &amp; social</p>",
+                is_direct_indicator=True,
+            )
+            self.indicator.topics.set([self.topic])
+            self.other = Indicator.objects.create(
+                code="ENV-01",
+                version="1",
+                name="Energy consumption",
+                is_direct_indicator=True,
+            )
+            self.indicators_set = IndicatorsSet.objects.create(
+                code="SET-01", version="1", name="Salaries of the workers"
+            )
+
+    def search_indicators(self, term, language="en"):
+        return list(
+            search(Indicator.objects.all(), SearchEntry.Kind.INDICATOR, term, language)
+        )
+
+    def test_search(self):
+        # Text without HTML, stemmed and without accents
+        self.assertEqual(
+            self.search_indicators("worker cooperatives"), [self.indicator]
+        )
+        self.assertEqual(self.search_indicators("economia"), [self.indicator])
+        # Prefixes of codes and words
+        self.assertEqual(self.search_indicators("gen-0"), [self.indicator])
+        self.assertEqual(self.search_indicators("ener"), [self.other])
+        # Names of the topics
+        self.assertEqual(self.search_indicators("equality"), [self.indicator])
+        self.assertEqual(self.search_indicators("strong"), [])
+
+        # Codes first
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.topics.add(self.topic)
+            self.other.code = "EQU-01"
+            self.other.save()
+        self.assertEqual(self.search_indicators("equ"), [self.other, self.indicator])
+
+        self.assertEqual(
+            list(
+                search(
+                    IndicatorsSet.objects.all(),
+                    SearchEntry.Kind.INDICATORS_SET,
+                    "salary",
+                    "en",
+                )
+            ),
+            [self.indicators_set],
+        )
+
+    def test_search_language(self):
+        self.assertEqual(
+            self.search_indicators("treballadores", "ca"), [self.indicator]
+        )
+        self.assertEqual(self.search_indicators("genere", "ca"), [self.indicator])
+        self.assertEqual(self.search_indicators("treballadores", "en"), [])
+        # Untranslated fields are searched in the default language
+        self.assertEqual(self.search_indicators("energy", "ca"), [self.other])
+
+    def test_index_updated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic.name = "Diversity"
+            self.topic.save()
+        self.assertEqual(self.search_indicators("diversity"), [self.indicator])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic.topics.clear()
+        self.assertEqual(self.search_indicators("diversity"), [])
+
+        topic_id = self.topic.pk
+        self.assertTrue(SearchEntry.objects.filter(object_id=topic_id).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic.delete()
+        self.assertFalse(SearchEntry.objects.filter(object_id=topic_id).exists())
+
+    def test_index_built_after_migrate(self):
+        SearchEntry.objects.all().delete()
+        migration = MigrationLoader(connection).get_migration(
+            "methods", "0018_searchentry"
+        )
+        search_index_migrated(sender=None, plan=[(migration, True)])
+        search_index_migrated(sender=None, plan=None)
+        self.assertFalse(SearchEntry.objects.exists())
+
+        search_index_migrated(sender=None, plan=[(migration, False)])
+        self.assertEqual(self.search_indicators("energy"), [self.other])
+
+
+@override_settings(LANGUAGE_CODE="en")
+class SearchIndexAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        cls.admin = User.objects.create_user(
+            "admin@example.com",
+            is_staff=True,
+            email_verified=True,
+            user_profile_data={"organization": organization},
+        )
+        cls.admin.groups.add(auth_models.Group.objects.get(name="Governance Admins"))
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.topic = Topic.objects.create(name="Gender equality", description="-")
+            cls.indicator = Indicator.objects.create(
+                code="GEN-01",
+                version="1",
+                name="<p>Number of workers</p>",
+                is_direct_indicator=True,
+            )
+            Indicator.objects.create(
+                code="ENV-01",
+                version="1",
+                name="Energy consumption",
+                is_direct_indicator=True,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_search(self):
+        response = self.client.get(
+            reverse("gov_admin:methods_indicator_changelist"), {"q": "workers"}
+        )
+        self.assertEqual(list(response.context["cl"].result_list), [self.indicator])
+
+    def test_autocomplete(self):
+        response = self.client.get(
+            reverse("gov_admin:autocomplete"),
+            {
+                "app_label": "methods",
+                "model_name": "indicator",
+                "field_name": "topics",
+                "term": "equal",
+            },
+        )
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]],
+            [str(self.topic.pk)],
+        )
@@ -0,0 +1,254 @@
+import json
+import uuid
+from unittest import mock
+
+from django.contrib.auth import models as auth_models
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.methods.helpers import get_method_structure_version
+from apps.methods.mixins import prepare_method_fill_context
+from apps.methods.models import (
+    Campaign,
+    Group,
+    GroupItem,
+    Indicator,
+    IndicatorsSet,
+    List,
+    ListItem,
+    Method,
+    Survey,
+)
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    DEFAULT_FROM_EMAIL="noreply@example.com",
+    POST_OFFICE={
+        "BACKENDS": {"default": "django.core.mail.backends.locmem.EmailBackend"},
+        "DEFAULT_PRIORITY": "now",
+    },
+)
+class BalanceReviewBulkStatusTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("load_email_templates")
+        legal_structure = LegalStructure.objects.create(name="Cooperative")
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organizations = [
+                Organization.objects.create(
+                    name=f"Organization {i}", legal_structure=legal_structure
+                )
+                for i in range(4)
+            ]
+        users = [
+            User.objects.create_user(
+                f"user-{i}@example.com",
+                name=f"User {i}",
+                email_verified=True,
+                user_profile_data={"organization": organization},
+            )
+            for i, organization in enumerate(organizations)
+        ]
+
+        network = Network.objects.create(name="Network", network_type="-")
+        method = Method.objects.create(name="Balance", description="-")
+        other_method = Method.objects.create(name="Other balance", description="-")
+        network.methods.add(method)
+        campaign = Campaign.objects.create(name="2025", year="2025", status=True)
+        cls.surveys = [
+            Survey.objects.create(
+                method=method if i < 3 else other_method,
+                campaign=campaign,
+                user=users[i],
+                organization=organizations[i],
+                status=Survey.Status.TECH_VALIDATED if i == 2 else Survey.Status.CLOSED,
+            )
+            for i in range(1, 4)
+        ]
+
+        # A network admin that only manages the network of the first method
+        cls.admin = users[0]
+        cls.admin.is_staff = True
+        cls.admin.save()
+        cls.admin.groups.add(auth_models.Group.objects.get(name="Network Admins"))
+        organizations[0].network_managed = network
+        organizations[0].save()
+
+    def test_bulk_status_change(self):
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("gov_admin:review_balances"),
+                {
+                    "status-selection": Survey.Status.TECH_VALIDATED,
+                    "_selected_action": [survey.pk for survey in self.surveys],
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        closed, validated, other_network = [
+            Survey.objects.get(pk=survey.pk) for survey in self.surveys
+        ]
+        self.assertEqual(closed.status, Survey.Status.TECH_VALIDATED)
+        self.assertIsNotNone(closed.validated_date)
+        # Already validated, and not managed by the admin
+        self.assertIsNone(validated.validated_date)
+        self.assertEqual(other_network.status, Survey.Status.CLOSED)
+
+        # Only the updated rows are returned
+        self.assertContains(response, f'id="survey-{closed.pk}"')
+        self.assertContains(response, 'hx-swap-oob="true"', count=1)
+        notification = json.loads(response["HX-Trigger"])["notification"]
+        self.assertEqual(notification["text"], "1 balance status updated.")
+
+        [email] = mail.outbox
+        self.assertEqual(email.to, [closed.user.email])
+
+    def test_invalid_status(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse("gov_admin:review_balances"),
+            {"status-selection": 9, "_selected_action": [self.surveys[0].pk]},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Survey.objects.get(pk=self.surveys[0].pk).status, 1)
+
+
+@override_settings(LANGUAGE_CODE="en")
+class ReviewSurveyCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        cls.admin = User.objects.create_user(
+            "admin@example.com",
+            is_staff=True,
+            email_verified=True,
+            user_profile_data={"organization": organization},
+        )
+        cls.admin.groups.add(auth_models.Group.objects.get(name="Governance Admins"))
+        cls.survey = Survey.objects.create(
+            method=Method.objects.create(name="Balance", description="-"),
+            campaign=Campaign.objects.create(name="2025", year="2025", status=True),
+            user=cls.admin,
+            organization=organization,
+            status=Survey.Status.CLOSED,
+        )
+        cls.url = reverse("gov_admin:review_survey_actions", args=[cls.survey.pk])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_cached_render(self):
+        with mock.patch(
+            "apps.methods.admin.prepare_method_fill_context",
+            wraps=prepare_method_fill_context,
+        ) as prepare:
+            first = self.client.get(self.url, {"action": "info"})
+            second = self.client.get(self.url, {"action": "info"})
+            self.assertEqual(prepare.call_count, 1)
+            self.assertEqual(first.content, second.content)
+
+            # Each action is rendered differently
+            self.client.get(self.url, {"action": "edit"})
+            self.assertEqual(prepare.call_count, 2)
+
+            # Saving the answers invalidates it
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.url, {"action": "save"})
+            self.client.get(self.url, {"action": "info"})
+            self.assertEqual(prepare.call_count, 3)
+
+
+@override_settings(LANGUAGE_CODE="en")
+class MethodMetadataTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.list_item = ListItem.objects.create(title="Yes", value=1)
+        options = List.objects.create(title="Options")
+        options.items.set([cls.list_item])
+        group = Group.objects.create(title="Gender")
+        group.items.set([GroupItem.objects.create(title="Women", suffix="women")])
+        indicators = [
+            Indicator.objects.create(
+                code="IND1",
+                version="1",
+                name="Options",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.DROPDOWN,
+                list_options=options,
+            ),
+            Indicator.objects.create(
+                code="IND2",
+                version="1",
+                name="Workers",
+                is_direct_indicator=True,
+                is_group_indicator=True,
+                group=group,
+            ),
+        ]
+        indicators_set = IndicatorsSet.objects.create(code="SET1", version="1")
+        indicators_set.indicators.set(indicators[1:])
+        cls.method = Method.objects.create(name="Balance", description="-")
+        cls.method.indicators.set(indicators)
+        cls.method.indicators_sets.set([indicators_set])
+        cls.url = reverse("methods:method_metadata", args=[cls.method.pk])
+
+    def test_metadata(self):
+        version = get_method_structure_version(self.method.pk)
+        response = self.client.get(self.url, {"v": version})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        metadata = response.json()
+        options, workers = sorted(metadata["indicators"], key=lambda i: i["code"])
+        self.assertEqual(
+            options["options"], [{"id": str(self.list_item.pk), "value": 1}]
+        )
+        self.assertEqual(workers["group_title"], "Gender")
+        self.assertEqual(workers["group_items"][0]["suffix"], "women")
+        [indicators_set] = metadata["indicators_sets"]
+        self.assertEqual(indicators_set["indicators_ids"], [workers["id"]])
+
+        # Cached, and not sent again to browsers that have it
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, {"v": version}, headers={"if-none-match": response["ETag"]}
+            )
+        self.assertEqual(response.status_code, 304)
+
+        # Not versioned
+        response = self.client.get(self.url)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_metadata_structure_changed(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.list_item.value = 2
+            self.list_item.save()
+
+        metadata = self.client.get(self.url).json()
+        [options] = [i for i in metadata["indicators"] if "options" in i]
+        self.assertEqual(options["options"][0]["value"], 2)
+
+    def test_metadata_not_found(self):
+        response = self.client.get(
+            reverse("methods:method_metadata", args=[uuid.uuid4()])
+        )
+        self.assertEqual(response.status_code, 404)
@@ -7,13 +7,17 @@ from .views import (
     MethodFillSuccessView,
     MethodFillView,
     MethodPreviewView,
+    attachment_upload,
+    create_attachment_upload,
     create_invitation_action,
     delete_invitation,
     import_csv,
     invitation_sent_view,
     invitations_sent_view,
     load_ext_surveys,
+    method_metadata,
     survey_reminder_view,
+    survey_report,
     user_survey_reminder_view,
 )
 
@@ -66,6 +70,26 @@ urlpatterns = [
         MethodFillView.as_view(),
         name="method_fill_project",
     ),
+    path(
+        "metadata/<uuid:method_id>/",
+        method_metadata,
+        name="method_metadata",
+    ),
+    path(
+        "attachments/",
+        create_attachment_upload,
+        name="create_attachment_upload",
+    ),
+    path(
+        "attachments/<uuid:attachment_id>/",
+        attachment_upload,
+        name="attachment_upload",
+    ),
+    path(
+        "report/<uuid:survey_id>/",
+        survey_report,
+        name="survey_report",
+    ),
     path(
         _("preview/<uuid:method_id>/"),
         MethodPreviewView.as_view(),
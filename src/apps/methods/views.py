@@ -1,13 +1,25 @@
 import csv
+import json
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_not_required
 from django.db.models import Prefetch, Q
-from django.http import HttpResponse, HttpResponseBadRequest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag, urlencode
+from django.utils.translation import get_language, ngettext
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods, require_POST
 from django.views.generic import ListView, TemplateView
@@ -15,19 +27,40 @@ from unfold.views import UnfoldModelAdminViewMixin
 
 from apps.geodata.models import Region1
 from apps.methods.forms import InvitationCreationForm
-from apps.methods.mixins import MethodFillMixin
+from apps.methods.mixins import MethodFillMixin, is_valid_uuid
+from project.utils.background import run_in_background
 from project.utils.mixins import NetworkFilterMixin
 
+from .attachments import AttachmentError, create_attachment, receive_chunk
 from .helpers import (
     ParseExternalInvitations,
     get_external_survey_filter,
-    get_form_sections,
-    get_survey_stats,
+    get_method_metadata,
+    get_method_structure_version,
+    get_surveys_progress,
+    update_surveys_status,
+)
+from .models import (
+    Attachment,
+    Campaign,
+    ExternalSurveyInvitation,
+    Indicator,
+    Invitation,
+    Method,
+    Survey,
+    SurveyReport,
+)
+from .reports import (
+    generate_survey_reports,
+    get_report_fingerprint_etag,
+    get_report_path,
+    get_reports_storage,
+    is_report_public,
 )
-from .models import Campaign, ExternalSurveyInvitation, Invitation, Method, Survey
 from .services import (
     send_invitation,
     send_survey_reminder_email,
+    send_survey_status_update_emails,
     send_user_survey_reminder_email,
 )
 
@@ -58,6 +91,160 @@ class MethodPreviewView(MethodFillMixin, TemplateView):
         return HttpResponse(status=204)
 
 
+@login_not_required
+@require_http_methods("GET")
+def method_metadata(request, method_id):
+    """
+    Returns the metadata of the indicators of a method for its form (see
+    get_method_metadata). The form requests it with the structure version of
+    the method, so browsers can keep it until the method changes.
+    """
+    metadata = get_method_metadata(method_id)
+    if metadata is None:
+        raise Http404
+    content, etag = metadata
+    etag = quote_etag(etag)
+
+    response = get_conditional_response(request, etag=etag) or HttpResponse(
+        content, content_type="application/json"
+    )
+    response.headers["ETag"] = etag
+    if request.GET.get("v") == str(get_method_structure_version(method_id)):
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.METHOD_METADATA_CACHE_MAX_AGE,
+            immutable=True,
+        )
+    else:
+        # Not versioned, so browsers have to revalidate it
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@login_not_required
+@require_http_methods("GET")
+def survey_report(request, survey_id):
+    """
+    Serves the public report of a survey as rendered to the private storage
+    (see generate_survey_report), so publishing it doesn't touch its results.
+    """
+    report = get_object_or_404(
+        SurveyReport.objects.select_related("survey__organization", "survey__project"),
+        survey_id=survey_id,
+    )
+    if not is_report_public(report.survey):
+        raise Http404
+
+    language = translation.get_supported_language_variant(get_language())
+    path = get_report_path(survey_id, language)
+    storage = get_reports_storage()
+    if not storage.exists(path):
+        raise Http404
+    etag = get_report_fingerprint_etag(report.fingerprint, language)
+
+    response = get_conditional_response(request, etag=etag) or FileResponse(
+        storage.open(path), content_type="text/html; charset=utf-8"
+    )
+    response.headers["ETag"] = etag
+    patch_cache_control(
+        response, public=True, max_age=settings.SURVEY_REPORT_CACHE_MAX_AGE
+    )
+    return response
+
+
+def get_upload_state(attachment):
+    url = reverse("methods:attachment_upload", args=[attachment.pk])
+    # Uploads through an invitation are resumed with its token
+    if attachment.created_by_id is None and attachment.token:
+        url += "?" + urlencode({"token": attachment.token})
+    return {
+        "id": str(attachment.pk),
+        "url": url,
+        "offset": attachment.offset,
+        "size": attachment.size,
+        "chunk_size": settings.ATTACHMENT_CHUNK_SIZE,
+        "status": attachment.get_status_display(),
+    }
+
+
+@login_not_required
+@require_POST
+def create_attachment_upload(request):
+    """
+    Starts the chunked upload of a file for an attachment indicator, by a user
+    or with the token of an invitation to an external survey.
+    """
+    token = request.GET.get("token", "")
+    user = request.user if request.user.is_authenticated else None
+    if user is None and not (token and Invitation.objects.filter(token=token).exists()):
+        return JsonResponse({"error": _("Not allowed.")}, status=403)
+
+    indicator_id = request.POST.get("indicator", "")
+    try:
+        size = int(request.POST.get("size", ""))
+    except ValueError:
+        size = 0
+    indicator = (
+        Indicator.objects.filter(
+            pk=indicator_id, data_type=Indicator.DataType.ATTACHMENT
+        ).first()
+        if is_valid_uuid(indicator_id)
+        else None
+    )
+    if indicator is None:
+        return JsonResponse({"error": _("Invalid indicator.")}, status=400)
+
+    try:
+        attachment = create_attachment(
+            indicator, request.POST.get("name", ""), size, user=user, token=token
+        )
+    except AttachmentError as e:
+        return JsonResponse({"error": str(e)}, status=e.status)
+    return JsonResponse(get_upload_state(attachment), status=201)
+
+
+@login_not_required
+@require_http_methods(["GET", "PATCH"])
+def attachment_upload(request, attachment_id):
+    """
+    Returns the state of an upload (GET), or receives its next chunk (PATCH)
+    as the raw body of the request, starting at the offset of the
+    Upload-Offset header. The chunk is streamed to the storage, never read
+    into memory as a whole.
+    """
+    attachment = get_object_or_404(Attachment, pk=attachment_id)
+    # Only who started it: the same user, or the same invitation token
+    if request.user.is_authenticated:
+        allowed = attachment.created_by_id == request.user.pk
+    else:
+        token = request.GET.get("token")
+        allowed = (
+            attachment.created_by_id is None
+            and bool(token)
+            and token == attachment.token
+        )
+    if not allowed:
+        raise Http404
+
+    if request.method == "PATCH":
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.headers.get("Content-Length", ""))
+        except ValueError:
+            return JsonResponse(
+                {"error": _("Missing chunk offset or length.")}, status=400
+            )
+        try:
+            attachment = receive_chunk(attachment.pk, offset, request, length)
+        except AttachmentError as e:
+            attachment.refresh_from_db()
+            return JsonResponse(
+                {"error": str(e), **get_upload_state(attachment)}, status=e.status
+            )
+    return JsonResponse(get_upload_state(attachment))
+
+
 class ExternalSurveysView(TemplateView):
     template_name = "methods/external_surveys_view.html"
 
@@ -166,14 +353,14 @@ def invitations_sent_view(request, id):
         return redirect(request.META.get("HTTP_REFERER", "/"))
     else:
         return HttpResponse(
-            render(
-                request,
+            render_to_string(
                 "components/methods/invitations_table.html",
                 {
                     "invitations": Invitation.objects.filter(
                         external_survey_invitation_id=id
                     )
                 },
+                request=request,
             ),
             headers={
                 "HX-Trigger": '{"notification": {"type": "success","text": "'
@@ -201,10 +388,10 @@ def invitation_sent_view(request, id):
         msg = _("The invitation has been sent.")
 
         return HttpResponse(
-            render(
-                request,
+            render_to_string(
                 "components/methods/invitation_row.html",
                 {"invitation": invitation},
+                request=request,
             ),
             headers={
                 "HX-Trigger": '{"notification": {"type": "success","text": "'
@@ -241,10 +428,10 @@ def import_csv(request, organization_id, method_id, campaign_id):
             displayed_message = _("There is no CSV file selected to import.")
 
         return HttpResponse(
-            render(
-                request,
+            render_to_string(
                 "components/methods/invitations_imported_rows.html",
                 {"invitationsImported": result["invitations"]},
+                request=request,
             ),
             headers={
                 "HX-Trigger": '{"notification": {"type": "'
@@ -269,6 +456,33 @@ def load_ext_surveys(request):
     return render(request, "organizations/methods_options.html", {"methods": methods})
 
 
+def get_review_surveys():
+    """
+    Returns the queryset of the surveys of the balance review, with what their
+    rows show.
+    """
+    return Survey.objects.select_related(
+        "method", "organization", "project", "user"
+    ).prefetch_related(Prefetch("method__external_surveys"))
+
+
+def prepare_review_rows(surveys):
+    """
+    Adds the total progress (cached, see get_surveys_progress) and the number of
+    external surveys of each category of their method to the surveys of the
+    balance review.
+    """
+    progress = get_surveys_progress(surveys)
+    for survey in surveys:
+        survey.method.external_surveys_c = get_external_surveys(survey.method)
+        survey.totalProgress = progress[survey.pk]
+    return surveys
+
+
+def get_status_options():
+    return [{"id": status.value, "name": status.label} for status in Survey.Status]
+
+
 class BalanceReviewView(UnfoldModelAdminViewMixin, ListView, NetworkFilterMixin):
     title = "Balance review"
     permission_required = ()
@@ -276,32 +490,18 @@ class BalanceReviewView(UnfoldModelAdminViewMixin, ListView, NetworkFilterMixin)
     paginate_by = 20
 
     def get_queryset(self):
-        all_surveys = Survey.objects.filter(self.get_survey_query(self.request.GET))
+        all_surveys = get_review_surveys().filter(
+            self.get_survey_query(self.request.GET)
+        )
 
         all_surveys = self.filter_queryset_by_network(self.request, all_surveys)
-        return (
-            all_surveys.select_related("method")
-            .prefetch_related(Prefetch("method__external_surveys"))
-            .order_by(self.get_survey_order())
-        )
+        return all_surveys.order_by(self.get_survey_order())
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        page = context["page_obj"]
-        processed = []
-        for s in page.object_list:
-            s.status = Survey.Status(s.status).value
-            s.method.sections = get_form_sections(s.method)
-            s.method.external_surveys_c = get_external_surveys(s.method)
+        processed = prepare_review_rows(list(context["page_obj"].object_list))
 
-            stats = get_survey_stats(s, s.method, s.campaign)
-            s.totalProgress = stats["totalProgress"]
-            processed.append(s)
-
-        all_status = []
-        for s in Survey.Status:
-            all_status.append({"id": s.value, "name": s.label})
         unit_of_analysis = []
         for ua in Method.UnitAnalysis:
             unit_of_analysis.append({"id": ua.value, "name": ua.label})
@@ -317,7 +517,7 @@ class BalanceReviewView(UnfoldModelAdminViewMixin, ListView, NetworkFilterMixin)
         context["regions"] = Region1.objects.all()
         context["methods"] = methods
         context["unitanalysis"] = unit_of_analysis
-        context["status"] = all_status
+        context["status"] = get_status_options()
 
         # Set variables to display them back on the survey_review.html
         context["nif_filter"] = self.request.GET.get("nif") or ""
@@ -332,6 +532,55 @@ class BalanceReviewView(UnfoldModelAdminViewMixin, ListView, NetworkFilterMixin)
 
         return context
 
+    def post(self, request, *args, **kwargs):
+        """
+        Moves the selected surveys to a status at once, notifying their users in
+        the background, and returns their rows to be swapped out of band.
+        """
+        try:
+            status = Survey.Status(int(request.POST.get("status-selection")))
+        except (TypeError, ValueError):
+            return HttpResponseBadRequest("Invalid status")
+        survey_ids = [
+            pk for pk in request.POST.getlist("_selected_action") if is_valid_uuid(pk)
+        ]
+
+        surveys = self.filter_queryset_by_network(
+            request, Survey.objects.filter(pk__in=survey_ids)
+        )
+        updated_ids = update_surveys_status(surveys, status)
+        if updated_ids:
+            run_in_background(
+                send_survey_status_update_emails,
+                updated_ids,
+                status,
+                request.user.pk,
+                get_language(),
+            )
+            if status == Survey.Status.QUALITY_CHECKED:
+                run_in_background(generate_survey_reports, updated_ids)
+
+        rows = prepare_review_rows(
+            list(get_review_surveys().filter(pk__in=updated_ids))
+        )
+        msg = ngettext(
+            "%(count)d balance status updated.",
+            "%(count)d balance statuses updated.",
+            len(updated_ids),
+        ) % {"count": len(updated_ids)}
+        return HttpResponse(
+            render_to_string(
+                "admin/methods/survey_review_rows.html",
+                {"surveys": rows, "status": get_status_options()},
+                request=request,
+            ),
+            headers={
+                "HX-Trigger": json.dumps(
+                    {"notification": {"type": "success", "text": msg}}
+                )
+            },
+        )
+
     def get_survey_query(self, get_request):
         nif_filter = get_request.get("nif") or ""
         name_filter = get_request.get("name") or ""
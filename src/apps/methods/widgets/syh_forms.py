@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 
 from .widgets import GenderInputWidget
 
@@ -32,6 +33,13 @@ class DateInput(forms.DateInput):
 class AttachmentInput(forms.ClearableFileInput):
     template_name = "components/methods/file.html"
 
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["accept"] = ",".join(
+            f".{extension}" for extension in settings.ATTACHMENT_EXTENSIONS
+        )
+        return context
+
 
 class CheckboxSelectMultiple(forms.CheckboxSelectMultiple):
     template_name = "components/methods/checkbox.html"
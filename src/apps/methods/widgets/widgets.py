@@ -1,5 +1,31 @@
 from django import forms
+from unfold.widgets import UnfoldAdminFileFieldWidget
 
 
 class GenderInputWidget(forms.Widget):
     template_name = "components/methods/gender.html"
+
+
+class ProtectedFile:
+    # A stored file, linked through the view that checks who can get it
+    def __init__(self, file, url):
+        self.file = file
+        self.url = url
+
+    def __str__(self):
+        return str(self.file)
+
+
+class ProtectedFileWidget(UnfoldAdminFileFieldWidget):
+    """
+    File input of the admin that links the current file with the URL set by the
+    form (see project.views.protected_media), as the files that aren't public
+    aren't served from the URL of their storage.
+    """
+
+    url = ""
+
+    def get_context(self, name, value, attrs):
+        if self.url and self.is_initial(value):
+            value = ProtectedFile(value, self.url)
+        return super().get_context(name, value, attrs)
@@ -157,7 +157,7 @@ class OrganizationAdmin(NetworkFilterMixin, ImportExportModelAdmin):
         # Display only the corresponding methods
         if db_field.name == "methods":
             if hasattr(self, "legal_structure_id"):
-                qs = Method.objects.all()
+                qs = Method.objects.prefetch_related("networks")
                 kwargs["queryset"] = filter_methods_by_legal_structure(
                     qs, self.legal_structure_id
                 )
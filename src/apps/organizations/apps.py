@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class OrganizationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.organizations"
+
+    def ready(self):
+        from apps.methods.models import Method
+        from apps.settings.models import Network
+
+        from .models import Organization
+        from .signals import invalidate_method_catalogue, logo_saved
+
+        # The methods offered in the sign-up form depend on the methods, their
+        # regions and legal structures, and the networks they belong to
+        for model in (Method, Network):
+            post_save.connect(invalidate_method_catalogue, sender=model)
+            post_delete.connect(invalidate_method_catalogue, sender=model)
+        for through in (
+            Method.region1.through,
+            Method.legal_structures.through,
+            Network.methods.through,
+        ):
+            m2m_changed.connect(invalidate_method_catalogue, sender=through)
+
+        # The resized copies of the logos are generated when they change
+        post_save.connect(logo_saved, sender=Organization)
@@ -14,7 +14,6 @@ from apps.settings.models import LegalStructure
 from apps.users.models import User, UserProfile
 from apps.users.services import send_registration_mail
 
-from .helpers import get_coordinates_from_address
 from .models import Organization, Project
 
 
@@ -124,7 +123,7 @@ class OrganizationSignUpForm(forms.ModelForm):
     )
     methods = forms.ModelMultipleChoiceField(
         label=_("Method of impact mesurement"),
-        queryset=Method.objects.all(),
+        queryset=Method.objects.prefetch_related("networks"),
         required=False,
         widget=syh_forms.CheckboxSelectMultiple(
             attrs={
@@ -200,36 +199,13 @@ class OrganizationSignUpForm(forms.ModelForm):
             },
         )
 
-        # Automatically add the organization to the method's networks
-        for method in self.cleaned_data["methods"]:
-            for network in method.networks.all():
-                if network not in organization.networks.all():
-                    organization.networks.add(network)
-
-        full_address = ", ".join(
-            filter(
-                None,
-                [
-                    self.cleaned_data["address"],
-                    str(self.cleaned_data["city"]),
-                    str(self.cleaned_data["region1"]),
-                    str(self.cleaned_data["zip_code"]),
-                ],
-            )
-        )
-
-        coords = get_coordinates_from_address(full_address)
-
-        if coords:
-            lat, lng = coords
-            organization.latitude = lat
-            organization.longitude = lng
-
         if commit:
+            # The address is geocoded when saving the organization
             organization.save()
             # save(commit=False) used before does not save the many to
             # many relations as it needs the instance to be created before
-            # setting their values
+            # setting their values. Adding the methods also adds the
+            # organization to their networks.
             self.save_m2m()
 
             send_registration_mail(user, organization)
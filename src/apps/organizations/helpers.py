@@ -1,6 +1,9 @@
+from django.core.cache import cache
+from django.utils.translation import get_language
 from geopy.geocoders import Nominatim
 
 from apps.methods.models import Method
+from project.utils.cache import bump_cache_version, get_cache_version
 
 
 def get_methods_for_region1(region1):
@@ -17,6 +20,39 @@ def filter_methods_by_legal_structure(qs, legal_structure_id):
     )
 
 
+def get_method_options(region1_id, legal_structure_id=None):
+    """
+    Returns the methods an organization can choose in the sign-up form, already
+    prepared to be rendered. They are cached for every region, legal structure
+    and language until any method (or the networks they belong to) changes.
+    """
+    key = "methods-catalogue:{}:{}:{}:{}".format(
+        region1_id,
+        legal_structure_id,
+        get_language(),
+        get_cache_version("methods-catalogue"),
+    )
+
+    def build_options():
+        methods = get_methods_for_region1(region1_id)
+        if legal_structure_id:
+            methods = filter_methods_by_legal_structure(methods, legal_structure_id)
+        return [
+            {
+                "id": method.id,
+                "name": method.name,
+                "network_owner": ", ".join(n.name for n in method.networks.all()),
+            }
+            for method in methods.prefetch_related("networks").order_by("name")
+        ]
+
+    return cache.get_or_set(key, build_options, timeout=None)
+
+
+def invalidate_method_options():
+    bump_cache_version("methods-catalogue")
+
+
 def get_coordinates_from_address(address: str):
     geolocator = Nominatim(user_agent="organizations")
     location = geolocator.geocode(address, timeout=10)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_organization_network_managed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='logo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
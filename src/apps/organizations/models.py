@@ -1,7 +1,9 @@
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy as _
 
 from apps.users.models import UserProfile
@@ -29,6 +31,9 @@ class Organization(BaseModel):
     name = models.CharField(_("name"), max_length=150)
     description = models.CharField(_("description"), max_length=400)
     logo = models.FileField(upload_to="logos/", null=True, blank=True)
+    # Names of the resized copies of the logo, and of the logo they were
+    # generated from (see apps.organizations.renditions)
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)
     vat_number = models.CharField(_("vat number"), max_length=30)
     website = models.CharField(_("website"), max_length=300, blank=True, default="")
     country = models.ForeignKey(
@@ -80,62 +85,141 @@ class Organization(BaseModel):
         blank=True,
     )
 
+    # Fields whose changes are handled when it's saved
+    ADDRESS_FIELDS = ("address", "city_id", "region1_id", "zip_code_id")
+    TRACKED_FIELDS = ("status", *ADDRESS_FIELDS)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Their values in the database (see snapshot_tracked_fields)
+        self._original_values = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        # Like deferred fields, once they are read
+        self.snapshot_tracked_fields(fields)
+
+    def snapshot_tracked_fields(self, fields=None):
+        # Deferred fields are left out, as reading them would load them
+        deferred = self.get_deferred_fields()
+        for attname in self.TRACKED_FIELDS:
+            if attname not in deferred and (
+                fields is None
+                or attname in fields
+                or attname.removesuffix("_id") in fields
+            ):
+                self._original_values[attname] = getattr(self, attname)
+
+    def has_changed(self, attname):
+        # Fields still deferred weren't changed
+        if attname in self.get_deferred_fields():
+            return False
+        if attname not in self._original_values:
+            return True
+        return getattr(self, attname) != self._original_values[attname]
+
     def __str__(self):
         return self.name
 
     def get_absolute_url(self):
         return "/organizations/sign-up"
 
+    def get_logo_rendition(self, rendition):
+        """
+        Returns the name of a rendition of the logo, or None until it's
+        generated for the current logo.
+        """
+        if self.logo_renditions.get("source") != self.logo.name:
+            return None
+        return self.logo_renditions.get(rendition)
+
+    def get_logo_url(self, rendition=None):
+        # Served checking who can see it (see project.views.protected_media),
+        # the original logo while the rendition isn't available
+        if not self.logo:
+            return ""
+        url = reverse("protected_media", args=["logo", self.pk])
+        if rendition and self.get_logo_rendition(rendition):
+            url += "?" + urlencode({"rendition": rendition})
+        return url
+
     def save(self, *args, sender_user=None, **kwargs):
+        if (
+            not self._state.adding
+            and self.status != Organization.Status.PENDING
+            and self.has_changed("status")
+        ):
+            self.resolution_date = timezone.now()
+
+        # Only geocode the address when it changes
+        if self._state.adding or any(
+            self.has_changed(attname) for attname in self.ADDRESS_FIELDS
+        ):
+            full_address = ", ".join(
+                filter(
+                    None,
+                    [
+                        self.address,
+                        str(self.city),
+                        str(self.region1),
+                        str(self.zip_code),
+                    ],
+                )
+            )
+
+            coords = get_coordinates_from_address(full_address)
+
+            if coords:
+                lat, lng = coords
+                self.latitude = lat
+                self.longitude = lng
+
         super().save(*args, **kwargs)
+        self.snapshot_tracked_fields()
+
         if self.status == Organization.Status.ACCEPTED:
             profile = UserProfile.objects.filter(organization=self).first()
             if profile and not profile.user.email_verified and sender_user:
                 send_welcome_mail(profile.user, sender_user=sender_user)
 
-        # Automatically add the organization to the method's networks
-        for method in self.methods.all():
-            for network in method.networks.all():
-                if network not in self.networks.all():
-                    self.networks.add(network)
-
-        full_address = ", ".join(
-            filter(
-                None,
-                [
-                    self.address,
-                    str(self.city),
-                    str(self.region1),
-                    str(self.zip_code),
-                ],
-            )
+    def add_to_method_networks(self, method_ids):
+        """
+        Adds the organization to the networks of the given methods it doesn't
+        belong to yet, with one query to find them and one bulk insert.
+        """
+        through = self.networks.model.organizations.through
+        network_ids = (
+            self.networks.model.objects.filter(methods__in=method_ids)
+            .exclude(organizations=self)
+            .values_list("id", flat=True)
+            .distinct()
+        )
+        through.objects.bulk_create(
+            [
+                through(network_id=network_id, organization_id=self.pk)
+                for network_id in network_ids
+            ]
         )
-
-        coords = get_coordinates_from_address(full_address)
-
-        if coords:
-            lat, lng = coords
-            self.latitude = lat
-            self.longitude = lng
 
 
-@receiver(pre_save, sender=Organization)
-def set_resolution_date(sender, instance, **kwargs):
-    if (
-        not instance
-        or not instance.pk
-        or instance.status == Organization.Status.PENDING
-    ):
-        # New organization or status getting back to pending
+@receiver(m2m_changed, sender=Organization.methods.through)
+def add_organization_to_method_networks(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    # Automatically add the organization to the method's networks
+    if action != "post_add" or not pk_set:
         return
-
-    # Get the current status
-    try:
-        old_status = sender.objects.only("status").get(pk=instance.pk).status
-        if old_status != instance.status:
-            instance.resolution_date = timezone.now()
-    except Organization.DoesNotExist:
-        pass
+    if reverse:
+        for organization in Organization.objects.filter(pk__in=pk_set):
+            organization.add_to_method_networks([instance.pk])
+    else:
+        instance.add_to_method_networks(pk_set)
 
 
 class Project(BaseModel):
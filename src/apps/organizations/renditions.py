@@ -0,0 +1,85 @@
+import io
+import os
+
+import structlog
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .models import Organization
+
+logger = structlog.get_logger(__name__)
+
+
+def get_rendition_name(logo_name, rendition):
+    # Next to the logo, like "logos/acme.small.webp"
+    return f"{os.path.splitext(logo_name)[0]}.{rendition}.webp"
+
+
+def render_logo(image, size):
+    """
+    Returns a logo resized to fit in a (width, height) size, keeping its
+    aspect ratio and never enlarging it, compressed as WebP.
+    """
+    image = image.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=settings.LOGO_RENDITION_QUALITY, method=6)
+    return buffer.getvalue()
+
+
+def delete_renditions(storage, renditions, keep=()):
+    for rendition, name in renditions.items():
+        if rendition != "source" and name not in keep:
+            storage.delete(name)
+
+
+def generate_logo_renditions(organization_id):
+    """
+    Stores the renditions of the logo of an organization (LOGO_RENDITIONS) next
+    to it, replacing the ones of a previous logo. Logos that aren't images,
+    like SVG or PDF files, have none, so the original is shown instead.
+    """
+    organization = (
+        Organization.objects.filter(pk=organization_id)
+        .only("logo", "logo_renditions")
+        .first()
+    )
+    if organization is None:
+        return
+    source = organization.logo.name or ""
+    previous = organization.logo_renditions
+    if previous.get("source") == source:
+        return
+
+    storage = organization.logo.storage
+    renditions = {"source": source}
+    if source:
+        try:
+            with storage.open(source, "rb") as file, Image.open(file) as image:
+                image = ImageOps.exif_transpose(image)
+                for rendition, size in settings.LOGO_RENDITIONS.items():
+                    renditions[rendition] = storage.save(
+                        get_rendition_name(source, rendition),
+                        ContentFile(render_logo(image, size)),
+                    )
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(
+                "logo_renditions_failed",
+                organization_id=str(organization_id),
+                error=str(e),
+            )
+            delete_renditions(storage, renditions)
+            renditions = {"source": source}
+
+    # Saved without the logic of Organization.save, unless the logo was
+    # replaced meanwhile, and then its own renditions are being generated
+    updated = Organization.objects.filter(pk=organization_id, logo=source).update(
+        logo_renditions=renditions
+    )
+    if updated:
+        delete_renditions(storage, previous, keep=renditions.values())
+    else:
+        delete_renditions(storage, renditions)
@@ -0,0 +1,14 @@
+from project.utils.background import run_in_background
+
+from .helpers import invalidate_method_options
+from .renditions import generate_logo_renditions
+
+
+def invalidate_method_catalogue(sender, **kwargs):
+    invalidate_method_options()
+
+
+def logo_saved(sender, instance, **kwargs):
+    # Only when the logo changed (see generate_logo_renditions)
+    if instance.logo_renditions.get("source", "") != (instance.logo.name or ""):
+        run_in_background(generate_logo_renditions, instance.pk)
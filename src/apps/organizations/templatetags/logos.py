@@ -0,0 +1,13 @@
+from django.template import Library
+
+register = Library()
+
+
+@register.filter
+def logo_url(organization, rendition):
+    """
+    URL of a rendition of the logo of an organization, or of the logo itself
+    until it's generated.
+    Usage: {{ organization|logo_url:"small" }}
+    """
+    return organization.get_logo_url(rendition)
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.methods.models import Method
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+
+
+class OrganizationTestCase(TestCase):
+    def setUp(self):
+        geocoding = mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=("41.98", "2.82"),
+        )
+        self.geocode = geocoding.start()
+        self.addCleanup(geocoding.stop)
+
+        self.organization = Organization.objects.create(
+            name="Coop",
+            address="Carrer Major 1",
+            legal_structure=LegalStructure.objects.create(name="Cooperative"),
+        )
+
+    def test_add_methods_adds_networks(self):
+        methods = [
+            Method.objects.create(name=f"Method {i}", description="-") for i in range(3)
+        ]
+        networks = [Network.objects.create(name=f"Network {i}") for i in range(2)]
+        networks[0].methods.add(methods[0], methods[1])
+        networks[1].methods.add(methods[1])
+        networks[0].organizations.add(self.organization)
+
+        self.organization.methods.add(methods[0], methods[1], methods[2])
+        self.assertEqual(
+            set(self.organization.networks.all()), {networks[0], networks[1]}
+        )
+
+        # Adding the organization from the method side works too
+        other = Organization.objects.create(
+            name="Other", legal_structure=self.organization.legal_structure
+        )
+        methods[1].methods.add(other)
+        self.assertEqual(set(other.networks.all()), {networks[0], networks[1]})
+
+    def test_geocoding_only_when_address_changes(self):
+        self.assertEqual(self.geocode.call_count, 1)
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.latitude, "41.98")
+
+        self.organization.name = "Cooperative"
+        self.organization.save()
+        self.assertEqual(self.geocode.call_count, 1)
+
+        self.organization.address = "Carrer Major 2"
+        self.organization.save()
+        self.assertEqual(self.geocode.call_count, 2)
+
+    def test_resolution_date(self):
+        self.assertIsNone(self.organization.resolution_date)
+        self.organization.status = Organization.Status.ACCEPTED
+        self.organization.save()
+        self.assertIsNotNone(self.organization.resolution_date)
+
+    def test_deferred_fields(self):
+        organization = Organization.objects.only("name").get(pk=self.organization.pk)
+        self.assertEqual(
+            organization.get_deferred_fields() & {"status", "address"},
+            {"status", "address"},
+        )
+        organization.name = "Cooperative"
+        organization.save()
+        self.assertEqual(self.geocode.call_count, 1)
+
+        # Read once deferred, without counting as changed
+        organization = Organization.objects.only("name").get(pk=self.organization.pk)
+        self.assertEqual(organization.status, Organization.Status.PENDING)
+        organization.address = "Carrer Major 2"
+        organization.save()
+        self.assertEqual(self.geocode.call_count, 2)
+        self.assertIsNone(organization.resolution_date)
@@ -0,0 +1,92 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from apps.organizations.models import Organization
+from apps.organizations.renditions import generate_logo_renditions
+from apps.settings.models import LegalStructure
+
+
+def get_image(size, format="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGBA", size, (255, 0, 0, 128)).save(buffer, format)
+    return ContentFile(buffer.getvalue())
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    LOGO_RENDITIONS={"small": (100, 100), "medium": (400, 400)},
+    STORAGES={
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tempfile.mkdtemp()},
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+)
+class LogoRenditionsTestCase(TestCase):
+    def setUp(self):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            self.organization = Organization.objects.create(
+                name="Coop",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+
+    def save_logo(self, name, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organization.logo.save(name, content)
+        self.organization.refresh_from_db()
+
+    def test_renditions(self):
+        self.save_logo("logo.png", get_image((1000, 500)))
+        renditions = self.organization.logo_renditions
+        self.assertEqual(renditions["source"], self.organization.logo.name)
+        self.assertEqual(
+            renditions["small"], renditions["source"].replace(".png", ".small.webp")
+        )
+        with default_storage.open(renditions["small"]) as file:
+            image = Image.open(file)
+            # Fits in the size, keeping the aspect ratio
+            self.assertEqual((image.format, image.size), ("WEBP", (100, 50)))
+        self.assertEqual(
+            self.organization.get_logo_url("small"),
+            f"/protected/logo/{self.organization.pk}/?rendition=small",
+        )
+
+        # Replacing the logo replaces its renditions
+        self.save_logo("new.png", get_image((200, 200)))
+        self.assertFalse(default_storage.exists(renditions["small"]))
+        with default_storage.open(self.organization.logo_renditions["medium"]) as file:
+            # Not enlarged
+            self.assertEqual(Image.open(file).size, (200, 200))
+
+    def test_fallback(self):
+        # While they are being generated
+        with mock.patch("apps.organizations.signals.run_in_background"):
+            self.organization.logo.save("logo.png", get_image((300, 300)))
+        url = f"/protected/logo/{self.organization.pk}/"
+        self.assertEqual(self.organization.get_logo_url("small"), url)
+
+        # Logos that aren't images have none
+        self.save_logo("logo.svg", ContentFile(b"<svg></svg>"))
+        self.assertEqual(
+            self.organization.logo_renditions, {"source": self.organization.logo.name}
+        )
+        self.assertEqual(self.organization.get_logo_url("small"), url)
+
+    def test_up_to_date(self):
+        self.save_logo("logo.png", get_image((300, 300)))
+        with mock.patch("apps.organizations.renditions.render_logo") as render:
+            generate_logo_renditions(self.organization.pk)
+        render.assert_not_called()
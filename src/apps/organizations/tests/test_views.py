@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.geodata.models import City, Country, Region1, ZipCode
+from apps.methods.models import Method
+from apps.settings.models import LegalStructure, Network
+
+
+@override_settings(LANGUAGE_CODE="en")
+class GeodataOptionsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.country = Country.objects.create(name="Spain")
+        self.region1 = Region1.objects.create(name="Catalonia", country=self.country)
+        self.city = City.objects.create(name="Girona", region1=self.region1)
+        ZipCode.objects.create(code="17001", city=self.city)
+
+    def test_load_city_is_cacheable(self):
+        url = reverse("organizations:load_city") + f"?region1={self.region1.id}"
+        response = self.client.get(url)
+        self.assertContains(response, "Girona")
+        self.assertIn("public", response["Cache-Control"])
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # Any change in geodata invalidates the responses
+        City.objects.create(name="Figueres", region1=self.region1)
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, "Figueres")
+
+    def test_load_geodata_bundle(self):
+        response = self.client.get(
+            reverse("organizations:load_geodata_bundle", args=[self.country.id])
+        )
+        data = response.json()
+        self.assertEqual(data["region1"], [[str(self.region1.id), "Catalonia"]])
+        self.assertEqual(
+            data["cities"], [[str(self.city.id), str(self.region1.id), "Girona"]]
+        )
+        self.assertEqual(data["zip_codes"][0][2], "17001")
+
+
+@override_settings(LANGUAGE_CODE="en")
+class MethodOptionsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.region1 = Region1.objects.create(
+            name="Catalonia", country=Country.objects.create(name="Spain")
+        )
+        self.legal_structure = LegalStructure.objects.create(name="Cooperative")
+        self.method = Method.objects.create(name="Balance", description="-")
+        self.method.region1.add(self.region1)
+        self.method.legal_structures.add(self.legal_structure)
+        self.network = Network.objects.create(name="XES")
+        self.network.methods.add(self.method)
+        self.url = (
+            reverse("organizations:load_methods")
+            + f"?region1={self.region1.id}&legal_structure={self.legal_structure.id}"
+        )
+
+    def test_load_methods_is_cached(self):
+        self.assertContains(self.client.get(self.url), "Balance | XES")
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        # Changes in the methods invalidate the catalogue
+        Network.objects.create(name="REAS").methods.add(self.method)
+        self.assertContains(self.client.get(self.url), "Balance | REAS, XES")
+        self.method.legal_structures.clear()
+        self.assertNotContains(self.client.get(self.url), "Balance")
@@ -7,6 +7,7 @@ from apps.organizations.views import (
     UpdateOrganizationView,
     create_project_action,
     load_city,
+    load_geodata_bundle,
     load_methods,
     load_region1,
     load_zip_code,
@@ -25,6 +26,11 @@ urlpatterns = [
     path("sign-up/load_region1/", load_region1, name="load_region1"),
     path("sign-up/load_city/", load_city, name="load_city"),
     path("sign-up/load_zip_code/", load_zip_code, name="load_zip_code"),
+    path(
+        "sign-up/load_geodata/<uuid:country_id>/",
+        load_geodata_bundle,
+        name="load_geodata_bundle",
+    ),
     path(_("update/<pk>"), UpdateOrganizationView.as_view(), name="update"),
     path(
         _("<uuid:organization_id>/project/"),
@@ -1,14 +1,22 @@
+import json
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_not_required
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_http_methods
 from django.views.generic import TemplateView
 from django.views.generic.edit import CreateView, UpdateView
 from unfold.views import UnfoldModelAdminViewMixin
 
+from apps.geodata.helpers import get_geodata_fragment, get_geodata_version
 from apps.geodata.models import City, Region1, ZipCode
 from apps.methods.models import Method
 from apps.organizations.forms import (
@@ -17,7 +25,7 @@ from apps.organizations.forms import (
 )
 from project.utils.mixins import NetworkFilterMixin
 
-from .helpers import filter_methods_by_legal_structure, get_methods_for_region1
+from .helpers import get_method_options
 from .models import Organization, Project
 
 
@@ -51,57 +59,108 @@ class UpdateOrganizationView(UpdateView):
 @method_decorator(login_not_required, name="dispatch")
 @require_http_methods("GET")
 def load_methods(request):
-    methods = Method.objects.none()
+    methods = []
     legal_structure_id = request.GET.get("legal_structure")
     region1_id = request.GET.get("region1")
 
     if region1_id:
-        methods = get_methods_for_region1(region1_id)
-
-    if legal_structure_id:
-        methods = filter_methods_by_legal_structure(methods, legal_structure_id)
+        methods = get_method_options(region1_id, legal_structure_id)
     return render(request, "organizations/methods_options.html", {"methods": methods})
 
 
+def geodata_etag(request, *args, **kwargs):
+    return f"{get_geodata_version()}-{get_language()}"
+
+
 @method_decorator(login_not_required, name="dispatch")
 @require_http_methods("GET")
+@cache_control(public=True, max_age=settings.GEODATA_CACHE_MAX_AGE)
+@condition(etag_func=geodata_etag)
 def load_region1(request):
-    regions = Region1.objects.none()
-    if country_id := request.GET.get("country"):
-        regions = Region1.objects.filter(country_id=country_id).order_by("name")
-
-    return render(
-        request,
-        "organizations/region1_options.html",
-        {"regions": regions},
-    )
+    country_id = request.GET.get("country")
+
+    def render_options():
+        regions = Region1.objects.none()
+        if country_id:
+            regions = Region1.objects.filter(country_id=country_id).order_by("name")
+        return render_to_string(
+            "organizations/region1_options.html", {"regions": regions}
+        )
+
+    return HttpResponse(get_geodata_fragment("region1", country_id, render_options))
 
 
 @method_decorator(login_not_required, name="dispatch")
 @require_http_methods("GET")
+@cache_control(public=True, max_age=settings.GEODATA_CACHE_MAX_AGE)
+@condition(etag_func=geodata_etag)
 def load_city(request):
-    cities = City.objects.none()
-    if region1_id := request.GET.get("region1"):
-        cities = City.objects.filter(region1_id=region1_id).order_by("name")
-
-    return render(
-        request,
-        "organizations/city_options.html",
-        {"cities": cities},
-    )
+    region1_id = request.GET.get("region1")
+
+    def render_options():
+        cities = City.objects.none()
+        if region1_id:
+            cities = City.objects.filter(region1_id=region1_id).order_by("name")
+        return render_to_string("organizations/city_options.html", {"cities": cities})
+
+    return HttpResponse(get_geodata_fragment("city", region1_id, render_options))
 
 
 @method_decorator(login_not_required, name="dispatch")
 @require_http_methods("GET")
+@cache_control(public=True, max_age=settings.GEODATA_CACHE_MAX_AGE)
+@condition(etag_func=geodata_etag)
 def load_zip_code(request):
-    zip_codes = ZipCode.objects.none()
-    if city_id := request.GET.get("city"):
-        zip_codes = ZipCode.objects.filter(city_id=city_id).order_by("code")
-
-    return render(
-        request,
-        "organizations/zip_code_options.html",
-        {"zip_codes": zip_codes},
+    city_id = request.GET.get("city")
+
+    def render_options():
+        zip_codes = ZipCode.objects.none()
+        if city_id:
+            zip_codes = ZipCode.objects.filter(city_id=city_id).order_by("code")
+        return render_to_string(
+            "organizations/zip_code_options.html", {"zip_codes": zip_codes}
+        )
+
+    return HttpResponse(get_geodata_fragment("zip_code", city_id, render_options))
+
+
+@method_decorator(login_not_required, name="dispatch")
+@require_http_methods("GET")
+@cache_control(public=True, max_age=settings.GEODATA_CACHE_MAX_AGE)
+@condition(etag_func=geodata_etag)
+def load_geodata_bundle(request, country_id):
+    """
+    All the regions, cities and zip codes of a country in a compact JSON, so
+    the browser can download it once and filter the options by itself.
+    """
+
+    def render_bundle():
+        return json.dumps(
+            {
+                "version": get_geodata_version(),
+                "region1": list(
+                    Region1.objects.filter(country_id=country_id)
+                    .order_by("name")
+                    .values_list("id", "name")
+                ),
+                "cities": list(
+                    City.objects.filter(region1__country_id=country_id)
+                    .order_by("name")
+                    .values_list("id", "region1_id", "name")
+                ),
+                "zip_codes": list(
+                    ZipCode.objects.filter(city__region1__country_id=country_id)
+                    .order_by("code")
+                    .values_list("id", "city_id", "code")
+                ),
+            },
+            cls=DjangoJSONEncoder,
+            separators=(",", ":"),
+        )
+
+    return HttpResponse(
+        get_geodata_fragment("bundle", country_id, render_bundle),
+        content_type="application/json",
     )
 
 
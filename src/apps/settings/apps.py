@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class SettingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.settings"
+
+    def ready(self):
+        from .signals import survey_deleted, survey_saved
+
+        post_save.connect(survey_saved, sender="methods.Survey")
+        post_delete.connect(survey_deleted, sender="methods.Survey")
@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from apps.methods.models import Survey
+from project.utils.cache import bump_cache_version, get_cache_version
+
+
+def get_documents_summary(organization):
+    """
+    Returns the documents table of an organization: the names of its methods
+    and, for every campaign (most recent first), the method of each survey and
+    whether any of them has been validated or evaluated. It's built from a
+    single query and cached until the status of any of its surveys changes.
+    """
+    key = "documents:{}:{}:{}".format(
+        organization.id,
+        get_language(),
+        get_cache_version(f"documents:{organization.id}"),
+    )
+
+    def build_summary():
+        surveys = (
+            Survey.objects.filter(organization=organization)
+            .order_by("created_at")
+            .values_list(
+                "campaign_id",
+                "campaign__name",
+                "campaign__year",
+                "method_id",
+                "method__name",
+                "validated_date",
+                "evaluated_date",
+            )
+        )
+
+        campaigns = {}
+        cells = {}
+        for (
+            campaign_id,
+            campaign_name,
+            year,
+            method_id,
+            method_name,
+            validated_date,
+            evaluated_date,
+        ) in surveys:
+            campaign = campaigns.setdefault(
+                campaign_id,
+                {
+                    "campaign": {"id": campaign_id, "name": campaign_name},
+                    "year": year,
+                    "has_evaluated": False,
+                    "has_validated": False,
+                },
+            )
+            campaign["has_evaluated"] |= evaluated_date is not None
+            campaign["has_validated"] |= validated_date is not None
+            cells[(campaign_id, method_name)] = {"method_id": method_id}
+
+        survey_names = sorted({method_name for _, method_name in cells})
+        rows = sorted(
+            campaigns.values(),
+            key=lambda row: (row["year"], row["campaign"]["name"]),
+            reverse=True,
+        )
+        for row in rows:
+            row["cells"] = [
+                cells.get((row["campaign"]["id"], name)) for name in survey_names
+            ]
+        return {"survey_names": survey_names, "table_rows": rows}
+
+    return cache.get_or_set(key, build_summary, timeout=None)
+
+
+def invalidate_documents_summary(organization_id):
+    bump_cache_version(f"documents:{organization_id}")
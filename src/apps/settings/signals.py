@@ -3,6 +3,8 @@ from django.contrib.sites.models import Site
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 
+from .helpers import invalidate_documents_summary
+
 
 @receiver(post_migrate)
 def register_sites(sender, **kwargs):
@@ -12,3 +14,13 @@ def register_sites(sender, **kwargs):
 
     for domain, name in expected_sites:
         Site.objects.update_or_create(domain=domain, defaults={"name": name})
+
+
+def survey_saved(sender, instance, created, **kwargs):
+    if instance.organization_id and (created or instance.status_has_changed):
+        invalidate_documents_summary(instance.organization_id)
+
+
+def survey_deleted(sender, instance, **kwargs):
+    if instance.organization_id:
+        invalidate_documents_summary(instance.organization_id)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.methods.models import Campaign, Method, Survey
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+
+
+@override_settings(LANGUAGE_CODE="en")
+class DocumentsViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        geocoding = mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        )
+        geocoding.start()
+        self.addCleanup(geocoding.stop)
+
+        self.organization = Organization.objects.create(
+            name="Coop",
+            legal_structure=LegalStructure.objects.create(name="Cooperative"),
+        )
+        self.user = User.objects.create_user(
+            email="test@test.com",
+            password="password",
+            email_verified=True,
+            user_profile_data={"organization": self.organization},
+        )
+        self.methods = [
+            Method.objects.create(name=name, description="-") for name in ("B", "A")
+        ]
+        self.campaigns = [
+            Campaign.objects.create(name=year, year=year, status=True)
+            for year in ("2023", "2024")
+        ]
+        self.survey = Survey.objects.create(
+            method=self.methods[0],
+            campaign=self.campaigns[1],
+            organization=self.organization,
+        )
+        Survey.objects.create(
+            method=self.methods[1],
+            campaign=self.campaigns[0],
+            organization=self.organization,
+            evaluated_date=timezone.now(),
+        )
+        self.client.force_login(self.user)
+
+    def test_documents_table(self):
+        response = self.client.get(reverse("settings:documents"))
+        self.assertEqual(response.context["survey_names"], ["A", "B"])
+        rows = response.context["table_rows"]
+        # Most recent campaign first
+        self.assertEqual([row["campaign"]["name"] for row in rows], ["2024", "2023"])
+        self.assertEqual(rows[0]["cells"], [None, {"method_id": self.methods[0].id}])
+        self.assertFalse(rows[0]["has_evaluated"])
+        self.assertTrue(rows[1]["has_evaluated"])
+
+    def test_documents_summary_is_cached(self):
+        self.client.get(reverse("settings:documents"))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("settings:documents"))
+        self.assertFalse(
+            any("methods_survey" in query["sql"] for query in queries.captured_queries)
+        )
+
+        # Changing the status of a survey invalidates the summary
+        self.survey.status = Survey.Status.CLOSED
+        self.survey.validated_date = timezone.now()
+        self.survey.save()
+        response = self.client.get(reverse("settings:documents"))
+        self.assertTrue(response.context["table_rows"][0]["has_validated"])
@@ -1,6 +1,7 @@
+from django.core.paginator import Paginator
 from django.views.generic import TemplateView
 
-from apps.methods.models import Campaign, Survey
+from .helpers import get_documents_summary
 
 
 class WhatIsSocialBalanceView(TemplateView):
@@ -13,44 +14,21 @@ class GoodPracticesView(TemplateView):
 
 class DocumentsView(TemplateView):
     template_name = "info/documents.html"
+    paginate_by = 10
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         organization = self.request.user.profile.organization
         context["organization"] = organization
 
-        surveys = Survey.objects.filter(organization=organization).select_related(
-            "campaign", "method"
-        )
-
-        survey_names = sorted({s.method.name for s in surveys})
-        context["survey_names"] = survey_names
-
-        campaigns = Campaign.objects.filter(
-            survey__organization=organization
-        ).distinct()
-
-        table_rows = []
-        for campaign in campaigns:
-            row = {
-                "campaign": campaign,
-                "cells": [],
-                "has_evaluated": False,
-            }
-            for name in survey_names:
-                survey = None
-                for s in surveys:
-                    if s.campaign_id == campaign.id and s.method.name == name:
-                        survey = s
-                        if survey.evaluated_date:
-                            row["has_evaluated"] = True
-                        if survey.validated_date:
-                            row["has_validated"] = True
-
-                row["cells"].append(survey)
-            table_rows.append(row)
-
-        context["table_rows"] = table_rows
+        summary = get_documents_summary(organization)
+        context["survey_names"] = summary["survey_names"]
+
+        # Pagination is done by campaign
+        paginator = Paginator(summary["table_rows"], self.paginate_by)
+        page_obj = paginator.get_page(self.request.GET.get("page"))
+        context["page_obj"] = page_obj
+        context["table_rows"] = page_obj.object_list
         return context
 
 
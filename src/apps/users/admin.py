@@ -91,6 +91,7 @@ class UserAdmin(NetworkFilterMixin, ModelAdmin, BaseUserAdmin):
                     "is_active",
                     "is_superuser",
                     "email_verified",
+                    "profile_requests",
                     "actions_field",
                     "roles_explanation_field",
                     "groups",
@@ -111,6 +112,7 @@ class UserAdmin(NetworkFilterMixin, ModelAdmin, BaseUserAdmin):
     superuser_fields = (
         "is_superuser",
         "email_verified",
+        "profile_requests",
     )
     readonly_fields = (
         "roles_explanation_field",
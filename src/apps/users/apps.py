@@ -1,4 +1,4 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 from django.db.models.signals import post_delete, post_migrate
 
 from apps.users.signals import delete_user_when_profile_deleted, update_user_groups
@@ -9,7 +9,9 @@ class UsersConfig(AppConfig):
     name = "apps.users"
 
     def ready(self):
-        post_migrate.connect(update_user_groups, sender=self)
+        # The groups are updated once the permissions of every app exist, and
+        # project is the last installed app with models
+        post_migrate.connect(update_user_groups, sender=apps.get_app_config("project"))
         post_delete.connect(
             delete_user_when_profile_deleted, sender="users.UserProfile"
         )
@@ -21,7 +21,7 @@ from django.utils.translation import gettext_lazy as _
 from extra_settings.models import Setting
 
 from apps.users.models import User
-from project.post_office import send
+from project.post_office import queue
 from project.utils.smtp_utils import get_from_email, get_smtp_for_user
 
 
@@ -181,7 +181,7 @@ class PasswordResetForm(BasePasswordResetForm):
             "absolute_url": site_absolute_url,
             "password_reset_url": password_reset_url,
         }
-        send(
+        queue(
             sender=from_email,
             recipients=[to_email],
             template="password_reset",
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_user_created_by_alter_user_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_requests',
+            field=models.BooleanField(default=False, help_text="Profiles every request of the user, if it's staff, and stores the results as profile runs", verbose_name='profile requests'),
+        ),
+    ]
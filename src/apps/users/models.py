@@ -93,6 +93,14 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     email_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    profile_requests = models.BooleanField(
+        _("profile requests"),
+        default=False,
+        help_text=_(
+            "Profiles every request of the user, if it's staff, and stores the "
+            "results as profile runs"
+        ),
+    )
 
     objects = UserManager()
 
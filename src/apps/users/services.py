@@ -8,7 +8,7 @@ from extra_settings.models import Setting
 
 from apps.users.utils import email_verification_code_regeneration
 from project.helpers import absolute_url
-from project.post_office import send
+from project.post_office import queue
 from project.utils.smtp_utils import get_from_email, get_smtp_for_user
 
 
@@ -39,7 +39,7 @@ def send_confirmation_mail(user_instance, sender_user):
         "absolute_url": settings.ABSOLUTE_URL,
         "email_verification_url": email_verification_url,
     }
-    send(
+    queue(
         sender=from_email,
         recipients=[
             user_instance.email,
@@ -79,7 +79,7 @@ def send_welcome_mail(user_instance, sender_user):
         "absolute_url": settings.ABSOLUTE_URL,
         "password_reset_url": password_reset_url,
     }
-    send(
+    queue(
         sender=from_email,
         recipients=[
             user_instance.email,
@@ -107,7 +107,7 @@ def send_rejected_mail(user_instance, sender_user):
         "time": str(formats.time_format(timezone.localtime(timezone.now()).time())),
         "user_email": user_instance.email,
     }
-    send(
+    queue(
         sender=from_email,
         recipients=[
             user_instance.email,
@@ -135,7 +135,7 @@ def send_registration_mail(user_instance, organization):
     }
 
     # as the user is not in a network, it can not have a smtp defined
-    send(
+    queue(
         recipients=[
             user_instance.email,
         ],
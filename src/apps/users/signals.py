@@ -36,6 +36,7 @@ def update_user_groups(sender, **kwargs):
         "users": get_permission_codenames("user", "vacd")
         + get_permission_codenames("userprofile", "vacd"),
         "admin": get_permission_codenames("logentry", "c"),
+        "project": get_permission_codenames("profilerun", "vd"),
         "settings": get_permission_codenames("network", "vacd")
         + get_permission_codenames("legalstructure", "vacd")
         + get_permission_codenames("sector", "vacd"),
@@ -49,6 +50,7 @@ def update_user_groups(sender, **kwargs):
         + get_permission_codenames("group", "vacd")
         + get_permission_codenames("groupitem", "vacd")
         + get_permission_codenames("campaign", "vacd")
+        + get_permission_codenames("indicatorcomparison", "v")
         + get_permission_codenames("externalsurveyinvitation", "vacd")
         + get_permission_codenames("invitation", "vacd")
         + get_permission_codenames("section", "vacd"),
@@ -68,6 +70,7 @@ def update_user_groups(sender, **kwargs):
         "methods": get_permission_codenames("method", "v")
         + get_permission_codenames("section", "v")
         + get_permission_codenames("campaign", "vacd")
+        + get_permission_codenames("indicatorcomparison", "v")
         + get_permission_codenames("indicator", "v")
         + get_permission_codenames("list", "v")
         + get_permission_codenames("listitem", "v")
@@ -0,0 +1,101 @@
+const initAttachmentField = () => {
+    // Read when used, as the admin loads the form after the page
+    const getConfig = () => {
+        const element = document.getElementById('attachmentsConfig')
+        return element ? JSON.parse(element.textContent) : { url: '', files: {} }
+    }
+    const uploadedNames = {}
+    const getFileName = attachmentId => uploadedNames[attachmentId] || (getConfig().files[attachmentId] || {}).name || ''
+    // Only the files of the saved answers can be downloaded
+    const getFileUrl = attachmentId => (getConfig().files[attachmentId] || {}).url || ''
+
+    const csrfToken = () => {
+        const input = document.querySelector('[name=csrfmiddlewaretoken]')
+        return input ? input.value : ''
+    }
+
+    const request = async (url, options = {}) => {
+        const response = await fetch(url, {
+            ...options,
+            headers: { 'X-CSRFToken': csrfToken(), ...(options.headers || {}) },
+        })
+        const data = await response.json()
+        return { ok: response.ok, status: response.status, data }
+    }
+
+    // Sends a file in chunks, resuming from the offset the server has when a
+    // chunk is rejected or the connection fails (see apps.methods.attachments)
+    const uploadFile = async (file, indicatorId, onProgress, retries = 3) => {
+        const body = new URLSearchParams({ indicator: indicatorId, name: file.name, size: file.size })
+        let { ok, data } = await request(getConfig().url, { method: 'POST', body })
+        if (!ok) {
+            throw new Error(data.error)
+        }
+        let upload = data
+        while (upload.offset < upload.size) {
+            const chunk = file.slice(upload.offset, upload.offset + upload.chunk_size)
+            let response
+            try {
+                response = await request(upload.url, {
+                    method: 'PATCH',
+                    headers: { 'Upload-Offset': upload.offset, 'Content-Type': 'application/octet-stream' },
+                    body: chunk,
+                })
+            } catch (e) {
+                response = { ok: false, status: 0, data: {} }
+            }
+            if (response.ok) {
+                upload = response.data
+                onProgress(upload.offset / upload.size)
+                continue
+            }
+            if (retries-- <= 0 || (response.status != 0 && response.status != 409)) {
+                throw new Error(response.data.error || gettext('The file could not be uploaded.'))
+            }
+            upload = (await request(upload.url)).data
+        }
+        return upload.id
+    }
+
+    Alpine.data('attachmentField', () => ({
+        uploading: false,
+        progress: 0,
+        error: '',
+        fileName: '',
+        fileUrl: '',
+        init() {
+            this.$watch('state.value', value => {
+                this.fileName = getFileName(value)
+                this.fileUrl = getFileUrl(value)
+            })
+            this.fileName = getFileName(this.state.value)
+            this.fileUrl = getFileUrl(this.state.value)
+        },
+        async upload(event) {
+            const file = event.target.files[0]
+            if (!file) {
+                return
+            }
+            this.uploading = true
+            this.progress = 0
+            this.error = ''
+            try {
+                const attachmentId = await uploadFile(file, this.id, progress => this.progress = progress)
+                uploadedNames[attachmentId] = file.name
+                this.fileName = file.name
+                this.update(attachmentId)
+            } catch (e) {
+                this.error = e.message
+            } finally {
+                this.uploading = false
+                event.target.value = ''
+            }
+        },
+    }))
+}
+
+if (document.readyState === "complete" && Alpine) {
+    initAttachmentField()
+} else {
+    document.addEventListener('alpine:init', initAttachmentField)
+}
@@ -74,6 +74,23 @@ const initIndicatorsStore = () => {
             const initEvent = new Event('indicators-store:init')
             document.dispatchEvent(initEvent)
         },
+        loadIndicators(url) {
+            // The metadata is the same for every survey of the method, and its
+            // url changes with the method structure, so browsers cache it
+            fetch(url)
+                .then(response => response.json())
+                .then(metadata => {
+                    this.indicatorsSets = metadata.indicators_sets
+                    this.initIndicators(metadata.indicators)
+
+                    // Init the fields, sets and sections, which need the metadata
+                    document.querySelectorAll('[data-indicators-metadata]').forEach(el => {
+                        el.removeAttribute('x-ignore')
+                        delete el._x_ignore
+                        Alpine.initTree(el)
+                    })
+                })
+        },
         parseExpression(expr, instanceId, val) {
             const tokens = expr.split(" ")
 
@@ -623,13 +640,9 @@ const initIndicatorsStore = () => {
         const placeholders = JSON.parse(document.getElementById('placeholders').textContent);
         Alpine.store('indicators')["placeholders"] = placeholders
     }
-    if (document.getElementById('indicatorsSets')) {
-        const indicatorsSets = JSON.parse(document.getElementById('indicatorsSets').textContent);
-        Alpine.store('indicators')["indicatorsSets"] = indicatorsSets
-    }
-    if (document.getElementById('indicators')) {
-        const indicators = JSON.parse(document.getElementById('indicators').textContent);
-        Alpine.store('indicators').initIndicators(indicators)
+    if (document.getElementById('indicatorsMetadataUrl')) {
+        const indicatorsMetadataUrl = JSON.parse(document.getElementById('indicatorsMetadataUrl').textContent);
+        Alpine.store('indicators').loadIndicators(indicatorsMetadataUrl)
     }
 
 }
@@ -8,6 +8,8 @@ start_gunicorn() {
 
     # Start Gunicorn
     echo "Starting Gunicorn..."
+    # Before migrate, whose data migrations use the cache
+    python manage.py createcachetable
     python manage.py migrate
     echo yes | python manage.py collectstatic --ignore styles/input.css
     gunicorn --bind 0.0.0.0:8000 --reload --reload-engine=poll $extra_files project.wsgi:application --threads=10
@@ -3,12 +3,16 @@ from django.contrib import admin
 from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.urls import NoReverseMatch, reverse, reverse_lazy
+from django.db.models import Count, Min, Q
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import NoReverseMatch, path, reverse, reverse_lazy
+from django.utils import timezone
 from django.utils.encoding import force_str
-from django.utils.html import escape
+from django.utils.html import escape, format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
-from django.utils.translation import pgettext_lazy
+from django.utils.translation import ngettext, pgettext_lazy
 from import_export.admin import ImportExportModelAdmin
 from post_office.admin import EmailTemplateAdmin
 from post_office.models import EmailTemplate
@@ -18,7 +22,8 @@ from unfold.sites import UnfoldAdminSite
 
 from apps.methods.models import Survey
 from apps.organizations.models import Organization
-from project.decorators import gov_admin_register
+from project.decorators import gov_admin_register, register_with_default_templates
+from project.models import Job, ProfileRun
 from project.utils.mixins import NetworkFilterMixin
 
 from .helpers import available_apps_to_dict
@@ -420,6 +425,7 @@ class GovAdminSite(NetworkFilterMixin, UnfoldAdminSite):
             items = []
             for model_name in [
                 "Campaign",
+                "IndicatorComparison",
                 "Method",
                 "Indicator",
                 "List",
@@ -474,7 +480,7 @@ class GovAdminSite(NetworkFilterMixin, UnfoldAdminSite):
         )
 
         # SETTINGS
-        if "Settings" in apps_dict or "Users" in apps_dict:
+        if "Settings" in apps_dict or "Users" in apps_dict or "Project" in apps_dict:
             items = []
             is_active = False
 
@@ -510,6 +516,26 @@ class GovAdminSite(NetworkFilterMixin, UnfoldAdminSite):
                     )
                     is_active = is_active or relative_path in "users"
 
+            # JOBS AND PROFILE RUNS INSIDE SETTINGS
+            if "Project" in apps_dict:
+                project_app = apps_dict["Project"]
+                models = project_app.get("models_dict", {})
+
+                for model_name in ["Job", "ProfileRun"]:
+                    if model_name in models:
+                        items.append(
+                            {
+                                "name": models[model_name]["name"],
+                                "url": models[model_name]["admin_url"],
+                                "is_active": self.is_model_active(
+                                    models[model_name], request
+                                ),
+                            }
+                        )
+                        is_active = is_active or self.is_app_active(
+                            project_app, request
+                        )
+
             if items:
                 main_menu.append(
                     {
@@ -550,3 +576,179 @@ gov_admin_site = GovAdminSite(name="gov_admin")
 @gov_admin_register(gov_admin_site, model=EmailTemplate)
 class EmailTemplateAdmin(EmailTemplateAdmin):
     pass
+
+
+@register_with_default_templates(admin.site, model=ProfileRun)
+@gov_admin_register(gov_admin_site, model=ProfileRun)
+class ProfileRunAdmin(ModelAdmin):
+    list_display = (
+        "created_at",
+        "created_by",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "queries",
+        "peak_memory",
+    )
+    list_filter = ("method", "status_code", "view_name")
+    search_fields = ("path", "view_name")
+    date_hierarchy = "created_at"
+    fieldsets = (
+        (
+            _("Request"),
+            {
+                "fields": (
+                    "created_by",
+                    "created_at",
+                    "method",
+                    "path",
+                    "view_name",
+                    "status_code",
+                    "duration_ms",
+                    "queries",
+                    "peak_memory",
+                    "download_link",
+                )
+            },
+        ),
+        (_("Stats"), {"fields": ("stats_field",), "classes": ("tab",)}),
+        (_("Allocations"), {"fields": ("allocations",), "classes": ("tab",)}),
+    )
+    readonly_fields = ("download_link", "stats_field")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<uuid:pk>/download/",
+                self.admin_site.admin_view(self.download),
+                name="project_profilerun_download",
+            ),
+        ] + super().get_urls()
+
+    def download(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        run = get_object_or_404(ProfileRun, pk=pk)
+        if run.profile is None:
+            raise Http404
+        return HttpResponse(
+            bytes(run.profile),
+            content_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{run.pk}.prof"'},
+        )
+
+    @admin.display(description=_("Stats"))
+    def stats_field(self, obj):
+        return format_html("<pre>{}</pre>", obj.stats)
+
+    @admin.display(description=_("Profile"))
+    def download_link(self, obj):
+        if obj.profile is None:
+            return _("Over the size limit ({} bytes), not stored").format(
+                obj.profile_size
+            )
+        url = reverse(
+            f"{self.admin_site.name}:project_profilerun_download", args=[obj.pk]
+        )
+        return format_html(
+            '<a href="{}">{}</a> ({} bytes)',
+            url,
+            _("Download (pstats format, for snakeviz, flameprof...)"),
+            obj.profile_size,
+        )
+
+
+@register_with_default_templates(admin.site, model=Job)
+@gov_admin_register(gov_admin_site, model=Job)
+class JobAdmin(ModelAdmin):
+    list_display = (
+        "task",
+        "status",
+        "priority",
+        "attempts",
+        "run_at",
+        "finished_at",
+        "created_at",
+    )
+    list_filter = ("status", "task")
+    search_fields = ("task",)
+    date_hierarchy = "created_at"
+    list_before_template = "admin/project/job_queue.html"
+    actions = ["retry_jobs"]
+    fieldsets = (
+        (
+            _("Job"),
+            {
+                "fields": (
+                    "task",
+                    "args",
+                    "kwargs",
+                    "status",
+                    "priority",
+                    "run_at",
+                    "attempts",
+                    "max_attempts",
+                    "locked_by",
+                    "locked_until",
+                    "finished_at",
+                    "created_at",
+                )
+            },
+        ),
+        (_("Last error"), {"fields": ("last_error_field",), "classes": ("tab",)}),
+    )
+    readonly_fields = ("last_error_field",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queue_stats(self):
+        now = timezone.now()
+        ready = Q(status=Job.Status.PENDING, run_at__lte=now)
+        return Job.objects.aggregate(
+            ready=Count("pk", filter=ready),
+            oldest=Min("run_at", filter=ready),
+            scheduled=Count("pk", filter=Q(status=Job.Status.PENDING, run_at__gt=now)),
+            running=Count("pk", filter=Q(status=Job.Status.RUNNING)),
+            failed=Count("pk", filter=Q(status=Job.Status.FAILED)),
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["queue_stats"] = self.get_queue_stats()
+        return super().changelist_view(request, extra_context)
+
+    @admin.action(description=_("Retry the selected jobs"))
+    def retry_jobs(self, request, queryset):
+        now = timezone.now()
+        count = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.PENDING,
+            attempts=0,
+            run_at=now,
+            locked_until=None,
+            finished_at=None,
+            updated_at=now,
+        )
+        self.message_user(
+            request,
+            ngettext(
+                "%(count)d job will be retried.",
+                "%(count)d jobs will be retried.",
+                count,
+            )
+            % {"count": count},
+        )
+
+    @admin.display(description=_("Last error"))
+    def last_error_field(self, obj):
+        return format_html("<pre>{}</pre>", obj.last_error)
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from project.utils.benchmarks import (
+    BENCHMARKS,
+    BenchmarkError,
+    BenchmarkSuite,
+    build_budgets,
+    check_budgets,
+    load_budgets,
+)
+
+DEFAULT_BUDGETS = Path(settings.BASE_DIR) / "project" / "benchmark_budgets.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the wall time, SQL queries and peak memory of the critical "
+        "views on a synthetic dataset, created in a test database, writes the "
+        "results as JSON and fails when any of them goes over its budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "benchmarks",
+            nargs="*",
+            help="Benchmarks to run (all of them by default): {}".format(
+                ", ".join(BENCHMARKS)
+            ),
+        )
+        parser.add_argument(
+            "--budgets",
+            default=DEFAULT_BUDGETS,
+            type=Path,
+            help="JSON file with the dataset and the budget of each benchmark",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="File the JSON report is written to (defaults to the standard output)",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Ratio wall time and memory can go over their budget",
+        )
+        parser.add_argument(
+            "--update-budgets",
+            action="store_true",
+            help="Stores the results as the new budgets instead of checking them",
+        )
+
+    def handle(self, *args, **options):
+        if unknown := set(options["benchmarks"]) - set(BENCHMARKS):
+            raise CommandError("Unknown benchmarks: {}".format(", ".join(unknown)))
+
+        budgets_path = options["budgets"]
+        budgets = load_budgets(budgets_path) if budgets_path.is_file() else None
+        if budgets is None and not options["update_budgets"]:
+            raise CommandError(f"Budgets file {budgets_path} does not exist")
+
+        # Never touches the data of the configured database
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            suite = BenchmarkSuite(
+                dataset=budgets["dataset"] if budgets else None,
+                repeat=options["repeat"],
+                log=self.stderr.write,
+            )
+            suite.setup()
+            report = suite.run(options["benchmarks"])
+        except BenchmarkError as e:
+            raise CommandError(e) from e
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["update_budgets"]:
+            new_budgets = build_budgets(report)
+            # Keeps the budgets of the benchmarks that weren't run
+            if budgets and budgets["dataset"] == new_budgets["dataset"]:
+                new_budgets["budgets"] = budgets["budgets"] | new_budgets["budgets"]
+            with budgets_path.open("w") as file:
+                json.dump(new_budgets, file, indent=4)
+                file.write("\n")
+            report["regressions"] = []
+        else:
+            report["regressions"] = check_budgets(
+                report, budgets, tolerance=options["tolerance"]
+            )
+
+        output = json.dumps(report, indent=4)
+        if options["output"]:
+            options["output"].write_text(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        for regression in report["regressions"]:
+            self.stderr.write(
+                self.style.ERROR(
+                    "{benchmark}: {metric} is {value} (budget {budget})".format(
+                        **regression
+                    )
+                )
+            )
+        if report["regressions"]:
+            raise CommandError(
+                "{} benchmark budgets exceeded".format(len(report["regressions"]))
+            )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.methods.attachments import clean_attachments
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the unfinished uploads of attachments and the attachments no "
+        "answer refers to, once they expire."
+    )
+
+    def handle(self, *args, **options):
+        count = clean_attachments()
+        self.stdout.write(self.style.SUCCESS(f"{count} attachments deleted"))
@@ -0,0 +1,45 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.methods.helpers import clone_method
+from apps.methods.models import Campaign, Method
+
+
+class Command(BaseCommand):
+    help = (
+        "Clones a method (sections, indicators, sets, networks and regions) as a "
+        "new version, optionally adding it to a campaign."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("method_id", help="Id of the method to clone")
+        # Not --version, which is the version of Django in every command
+        parser.add_argument(
+            "--new-version",
+            dest="new_version",
+            required=True,
+            help="Version of the copy",
+        )
+        parser.add_argument("--name", help="Name of the copy (defaults to the same)")
+        parser.add_argument(
+            "--campaign", help="Id of the campaign the copy is added to"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            method = Method.objects.get(pk=options["method_id"])
+            campaign = (
+                Campaign.objects.get(pk=options["campaign"])
+                if options["campaign"]
+                else None
+            )
+        except (Method.DoesNotExist, Campaign.DoesNotExist, ValidationError) as e:
+            raise CommandError(e) from e
+
+        clone = clone_method(
+            method, version=options["new_version"], name=options["name"]
+        )
+        if campaign:
+            campaign.methods.add(clone)
+
+        self.stdout.write(self.style.SUCCESS(f"Method '{method}' cloned as {clone.pk}"))
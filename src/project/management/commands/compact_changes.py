@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.methods.changes import compact_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the changes of the change log superseded by later ones, and the "
+        "deletes older than the retention."
+    )
+
+    def handle(self, *args, **options):
+        count = compact_changes()
+        self.stdout.write(self.style.SUCCESS(f"{count} changes deleted"))
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from project.utils.synthetic_data import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic dataset of the size of a large deployment "
+        "(networks, organizations, methods with indicators of every data type, "
+        "a chain of campaigns and answered surveys) to test and profile the "
+        "application. Debug mode needs to be enabled to run this command."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--networks", type=int, default=3)
+        parser.add_argument("--organizations", type=int, default=50)
+        parser.add_argument("--methods", type=int, default=2)
+        parser.add_argument(
+            "--indicators", type=int, default=40, help="Number of indicators per method"
+        )
+        parser.add_argument(
+            "--campaigns",
+            type=int,
+            default=3,
+            help="Length of the chain of campaigns (the last one is active)",
+        )
+        parser.add_argument("--surveys", type=int, default=100)
+        parser.add_argument(
+            "--fill-ratio",
+            type=float,
+            default=0.8,
+            help="Ratio of the indicators answered in each survey",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="SYN",
+            help="Prefix of the codes, names and emails of the dataset",
+        )
+        parser.add_argument(
+            "--password", default="synthetic", help="Password of all the users"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of rows written in each batch",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            self.stdout.write(
+                self.style.ERROR("This command can only be run in debug mode.")
+            )
+            return 0
+
+        try:
+            generator = SyntheticDataGenerator(
+                networks=options["networks"],
+                organizations=options["organizations"],
+                methods=options["methods"],
+                indicators=options["indicators"],
+                campaigns=options["campaigns"],
+                surveys=options["surveys"],
+                fill_ratio=options["fill_ratio"],
+                seed=options["seed"],
+                prefix=options["prefix"],
+                password=options["password"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+            stats = generator.generate()
+        except ValueError as e:
+            raise CommandError(e) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{count} {name}" for name, count in stats.items())
+            )
+        )
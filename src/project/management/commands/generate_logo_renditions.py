@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.organizations.models import Organization
+from apps.organizations.renditions import generate_logo_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the resized copies of the logos of the organizations that "
+        "changed since they were generated."
+    )
+
+    def handle(self, *args, **options):
+        organization_ids = Organization.objects.exclude(logo="").values_list(
+            "pk", flat=True
+        )
+        for organization_id in organization_ids:
+            generate_logo_renditions(organization_id)
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(organization_ids)} organizations checked")
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.methods.models import Survey
+from apps.methods.reports import generate_survey_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the public reports of the quality checked surveys whose data "
+        "changed since they were rendered."
+    )
+
+    def handle(self, *args, **options):
+        survey_ids = Survey.objects.filter(
+            status=Survey.Status.QUALITY_CHECKED
+        ).values_list("pk", flat=True)
+        for survey_id in survey_ids:
+            generate_survey_report(survey_id)
+        self.stdout.write(self.style.SUCCESS(f"{len(survey_ids)} surveys checked"))
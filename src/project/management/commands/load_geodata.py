@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.geodata.helpers import GeodataLoader
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads a gazetteer CSV/TSV file into one level of the geodata hierarchy "
+        "(countries, regions, cities or zip codes). Rows that already exist are "
+        "updated, so the same file can be loaded more than once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("level", choices=GeodataLoader.LEVELS.keys())
+        parser.add_argument("path", help="Path of the CSV or TSV file")
+        parser.add_argument(
+            "--delimiter",
+            help="Column delimiter (defaults to tab for .tsv files and comma "
+            "otherwise)",
+        )
+        parser.add_argument("--encoding", default="utf-8")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows written in each batch",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"File {path} does not exist")
+        delimiter = options["delimiter"] or ("\t" if path.suffix == ".tsv" else ",")
+
+        loader = GeodataLoader(options["level"], chunk_size=options["chunk_size"])
+        with path.open(encoding=options["encoding"], newline="") as file:
+            stats = loader.load(file, delimiter=delimiter)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "{created} created, {updated} updated, {unchanged} unchanged, "
+                "{skipped} skipped".format(**stats)
+            )
+        )
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import User
+from project.utils.profiling import get_profiling_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the signed query parameter that profiles a request of a staff "
+        "user (see ProfilerMiddleware)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email of the staff user")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist as e:
+            raise CommandError(f"User {options['email']} does not exist") from e
+        if not user.is_staff:
+            raise CommandError(f"User {user.email} is not staff")
+
+        self.stdout.write(
+            "{}={}".format(settings.PROFILER_QUERY_PARAM, get_profiling_token(user))
+        )
+        self.stdout.write(
+            f"Valid for {settings.PROFILER_TOKEN_MAX_AGE} seconds, only for "
+            f"requests of {user.email}"
+        )
@@ -0,0 +1,32 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from project.utils.jobs import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the background jobs of the queue as they come, in several threads, "
+        "until it's stopped (the running jobs are finished first)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOB_WORKER_CONCURRENCY,
+            help="Number of jobs run at the same time",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Stop once there aren't jobs to run",
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(concurrency=options["concurrency"], burst=options["burst"])
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: worker.stop())
+        worker.run()
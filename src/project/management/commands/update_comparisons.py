@@ -0,0 +1,40 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.methods.helpers import update_indicator_comparisons
+from apps.methods.models import Campaign
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the numeric answers of the organizations in campaigns with "
+        "their answers in the previous campaigns of the chain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "campaign_ids",
+            nargs="*",
+            help="Ids of the campaigns (defaults to the active ones that follow "
+            "another campaign)",
+        )
+
+    def handle(self, *args, **options):
+        if options["campaign_ids"]:
+            try:
+                campaigns = [
+                    Campaign.objects.get(pk=campaign_id)
+                    for campaign_id in options["campaign_ids"]
+                ]
+            except (Campaign.DoesNotExist, ValidationError) as e:
+                raise CommandError(e) from e
+        else:
+            campaigns = Campaign.objects.filter(
+                status=True, previous_campaign__isnull=False
+            )
+
+        for campaign in campaigns:
+            count = update_indicator_comparisons(campaign)
+            self.stdout.write(
+                self.style.SUCCESS(f"Campaign {campaign}: {count} comparisons")
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.methods.models import SearchEntry
+from apps.methods.search import update_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search index of the indicators, sets and topics in every "
+        "language."
+    )
+
+    def handle(self, *args, **options):
+        for kind in SearchEntry.Kind:
+            count = update_search_index(kind)
+            self.stdout.write(self.style.SUCCESS(f"{kind.label}: {count} indexed"))
@@ -1,5 +1,16 @@
+import random
+import time
+
+import structlog
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.shortcuts import redirect
 
+from project.utils.metrics import RequestMetrics
+from project.utils.profiling import RequestProfiler, profiling_lock, should_profile
+
+logger = structlog.get_logger(__name__)
+
 
 class SuperadminRedirectMiddleware:
     def __init__(self, get_response):
@@ -18,3 +29,110 @@ class SuperadminRedirectMiddleware:
                 return redirect("/")
 
         return self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures the SQL queries (number, time and duplicates), template rendering
+    time and view time of every request. The results are added as a
+    Server-Timing header for staff users (see REQUEST_METRICS_SERVER_TIMING)
+    and logged with structlog for a sample of the requests
+    (see REQUEST_METRICS_SAMPLE_RATE and REQUEST_METRICS_VIEW_SAMPLE_RATES), and
+    always for the slow ones, along with their most repeated queries.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        with metrics.capture():
+            request.metrics = metrics
+            response = self.get_response(request)
+
+        timings = metrics.get_timings()
+        user = getattr(request, "user", None)
+        if settings.REQUEST_METRICS_SERVER_TIMING and user and user.is_staff:
+            response.headers["Server-Timing"] = self.get_server_timing(metrics, timings)
+
+        view_name = request.resolver_match.view_name if request.resolver_match else ""
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "view": view_name,
+            "status_code": response.status_code,
+            **timings,
+            "queries": metrics.query_count,
+            "duplicate_queries": metrics.duplicate_count,
+        }
+        if (
+            timings["duration_ms"] >= settings.REQUEST_METRICS_SLOW_REQUEST_MS
+            or metrics.query_count >= settings.REQUEST_METRICS_SLOW_REQUEST_QUERIES
+        ):
+            logger.warning(
+                "slow_request",
+                **fields,
+                top_repeated_queries=metrics.top_repeated_queries(
+                    settings.REQUEST_METRICS_TOP_QUERIES
+                ),
+            )
+        elif random.random() < self.get_sample_rate(view_name):
+            logger.info("request_metrics", **fields)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.view_start = time.perf_counter()
+
+    def get_sample_rate(self, view_name):
+        return settings.REQUEST_METRICS_VIEW_SAMPLE_RATES.get(
+            view_name, settings.REQUEST_METRICS_SAMPLE_RATE
+        )
+
+    def get_server_timing(self, metrics, timings):
+        return ", ".join(
+            [
+                'sql;dur={};desc="{} queries, {} duplicated"'.format(
+                    timings["sql_ms"], metrics.query_count, metrics.duplicate_count
+                ),
+                "template;dur={}".format(timings["template_ms"]),
+                "view;dur={}".format(timings["view_ms"]),
+                "total;dur={}".format(timings["duration_ms"]),
+            ]
+        )
+
+
+class ProfilerMiddleware:
+    """
+    Profiles the requests of staff users that pass a signed token in the
+    PROFILER_QUERY_PARAM query parameter (see get_profiling_token), or that
+    have profile_requests enabled, with cProfile and tracemalloc. The results
+    are stored as a ProfileRun, whose id is returned in the X-Profile-Run
+    header. Must go after the AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+
+        # Requests that arrive while profiling another one aren't profiled
+        if not profiling_lock.acquire(blocking=False):
+            logger.warning("profiler_busy", path=request.path)
+            return self.get_response(request)
+        try:
+            profiler = RequestProfiler()
+            with profiler.profile():
+                response = self.get_response(request)
+        finally:
+            profiling_lock.release()
+
+        run = profiler.save(request, response)
+        response.headers["X-Profile-Run"] = str(run.pk)
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+import django.db.models.deletion
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('project', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('method', models.CharField(max_length=10, verbose_name='method')),
+                ('path', models.CharField(max_length=2048, verbose_name='path')),
+                ('view_name', models.CharField(blank=True, default='', max_length=255, verbose_name='view')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='status code')),
+                ('duration_ms', models.FloatField(verbose_name='duration (ms)')),
+                ('queries', models.PositiveIntegerField(blank=True, null=True, verbose_name='SQL queries')),
+                ('peak_memory', models.PositiveBigIntegerField(verbose_name='peak memory (bytes)')),
+                ('stats', models.TextField(blank=True, default='', verbose_name='stats')),
+                ('allocations', models.JSONField(blank=True, default=list, verbose_name='allocations')),
+                ('profile', models.BinaryField(blank=True, null=True, verbose_name='profile')),
+                ('profile_size', models.PositiveIntegerField(default=0, verbose_name='profile size (bytes)')),
+                ('truncated', models.BooleanField(default=False, help_text="The profile was over the size limit and it wasn't stored", verbose_name='truncated')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+            ],
+            options={
+                'verbose_name': 'profile run',
+                'verbose_name_plural': 'profile runs',
+                'ordering': ['-created_at'],
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
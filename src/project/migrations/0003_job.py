@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:51
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0002_profilerun'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('task', models.CharField(max_length=255, verbose_name='task')),
+                ('args', models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='arguments')),
+                ('kwargs', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='keyword arguments')),
+                ('priority', models.SmallIntegerField(default=0, verbose_name='priority')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Pending'), (1, 'Running'), (2, 'Succeeded'), (3, 'Failed')], default=0, verbose_name='status')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run at')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=1, verbose_name='max attempts')),
+                ('locked_by', models.CharField(blank=True, max_length=255, verbose_name='locked by')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='locked until')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finished at')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+            ],
+            options={
+                'verbose_name': 'job',
+                'verbose_name_plural': 'jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status__in', [0, 1])), fields=['-priority', 'run_at'], name='job_queue_idx')],
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:55
+
+import django.db.models.deletion
+import django.utils.timezone
+import project.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0003_job'),
+        ('settings', '0002_smtpserver_from_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('sender', models.CharField(blank=True, default='', max_length=255, verbose_name='sender')),
+                ('recipients', models.JSONField(blank=True, default=list, verbose_name='recipients')),
+                ('cc', models.JSONField(blank=True, default=list, verbose_name='cc')),
+                ('bcc', models.JSONField(blank=True, default=list, verbose_name='bcc')),
+                ('headers', models.JSONField(blank=True, default=dict, verbose_name='headers')),
+                ('subject', models.CharField(max_length=989, verbose_name='subject')),
+                ('body', models.TextField(blank=True, default='', verbose_name='body')),
+                ('html_body', models.TextField(blank=True, default='', verbose_name='HTML body')),
+                ('send_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='send at')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+                ('created_by', models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to=settings.AUTH_USER_MODEL, verbose_name='created by')),
+                ('smtp', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='settings.smtpserver', verbose_name='SMTP server')),
+            ],
+            options={
+                'verbose_name': 'outbox email',
+                'verbose_name_plural': 'outbox emails',
+                'ordering': ['send_at'],
+                'indexes': [models.Index(fields=['send_at'], name='outbox_email_send_at_idx')],
+            },
+            bases=(project.models.SetBooleanDatetimeMixin, models.Model),
+        ),
+    ]
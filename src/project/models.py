@@ -1,5 +1,6 @@
 import uuid
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -44,3 +45,130 @@ class BaseModel(SetBooleanDatetimeMixin, models.Model):
 
     class Meta:
         abstract = True
+
+
+class ProfileRun(BaseModel):
+    """
+    Profile of a request made by a staff user, either with the profiling query
+    parameter or with profiling enabled in their user (see ProfilerMiddleware).
+    The creator is the profiled user.
+    """
+
+    method = models.CharField(_("method"), max_length=10)
+    path = models.CharField(_("path"), max_length=2048)
+    view_name = models.CharField(_("view"), max_length=255, default="", blank=True)
+    status_code = models.PositiveSmallIntegerField(_("status code"))
+    duration_ms = models.FloatField(_("duration (ms)"))
+    queries = models.PositiveIntegerField(_("SQL queries"), null=True, blank=True)
+    peak_memory = models.PositiveBigIntegerField(_("peak memory (bytes)"))
+    stats = models.TextField(_("stats"), default="", blank=True)
+    allocations = models.JSONField(_("allocations"), default=list, blank=True)
+    # Raw pstats data, which flamegraph tools (snakeviz, flameprof...) can read
+    profile = models.BinaryField(_("profile"), null=True, blank=True)
+    profile_size = models.PositiveIntegerField(_("profile size (bytes)"), default=0)
+    truncated = models.BooleanField(
+        _("truncated"),
+        default=False,
+        help_text=_("The profile was over the size limit and it wasn't stored"),
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("profile run")
+        verbose_name_plural = _("profile runs")
+
+    def __str__(self):
+        return f"{self.method} {self.path}"
+
+
+class Job(BaseModel):
+    """
+    Function run in the background by the workers (see project.utils.jobs and
+    the runworker command), with its arguments stored as JSON. Jobs run once
+    their time comes, highest priority first. Failed attempts are retried later
+    and later, and the jobs of a worker that died are claimed again once their
+    lock expires.
+    """
+
+    class Status(models.IntegerChoices):
+        PENDING = 0, _("Pending")
+        RUNNING = 1, _("Running")
+        SUCCEEDED = 2, _("Succeeded")
+        FAILED = 3, _("Failed")
+
+    # Import path of the function
+    task = models.CharField(_("task"), max_length=255)
+    args = models.JSONField(
+        _("arguments"), default=list, blank=True, encoder=DjangoJSONEncoder
+    )
+    kwargs = models.JSONField(
+        _("keyword arguments"), default=dict, blank=True, encoder=DjangoJSONEncoder
+    )
+    priority = models.SmallIntegerField(_("priority"), default=0)
+    status = models.PositiveSmallIntegerField(
+        _("status"), choices=Status.choices, default=Status.PENDING
+    )
+    run_at = models.DateTimeField(_("run at"), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_("max attempts"), default=1)
+    # Worker running it, and until when other workers can't claim it
+    locked_by = models.CharField(_("locked by"), max_length=255, blank=True)
+    locked_until = models.DateTimeField(_("locked until"), null=True, blank=True)
+    last_error = models.TextField(_("last error"), default="", blank=True)
+    finished_at = models.DateTimeField(_("finished at"), null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+        indexes = [
+            # The queue, as the workers claim jobs (see claim_job)
+            models.Index(
+                fields=["-priority", "run_at"],
+                # Pending and running
+                condition=models.Q(status__in=[0, 1]),
+                name="job_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.task
+
+
+class OutboxEmail(BaseModel):
+    """
+    Email written in the same transaction as the changes it tells about, and
+    sent in the background once it's committed (see project.post_office), so
+    requests don't wait for the SMTP server and nothing is sent if the
+    transaction is rolled back. It's rendered when it's written, and deleted
+    once it's sent.
+    """
+
+    # The SMTP server of the network of the sender, or Post Office
+    smtp = models.ForeignKey(
+        "settings.SMTPServer",
+        verbose_name=_("SMTP server"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    sender = models.CharField(_("sender"), max_length=255, default="", blank=True)
+    recipients = models.JSONField(_("recipients"), default=list, blank=True)
+    cc = models.JSONField(_("cc"), default=list, blank=True)
+    bcc = models.JSONField(_("bcc"), default=list, blank=True)
+    headers = models.JSONField(_("headers"), default=dict, blank=True)
+    subject = models.CharField(_("subject"), max_length=989)
+    body = models.TextField(_("body"), default="", blank=True)
+    html_body = models.TextField(_("HTML body"), default="", blank=True)
+    send_at = models.DateTimeField(_("send at"), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    last_error = models.TextField(_("last error"), default="", blank=True)
+
+    class Meta:
+        ordering = ["send_at"]
+        verbose_name = _("outbox email")
+        verbose_name_plural = _("outbox emails")
+        indexes = [models.Index(fields=["send_at"], name="outbox_email_send_at_idx")]
+
+    def __str__(self):
+        return self.subject
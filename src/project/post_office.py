@@ -1,109 +1,278 @@
 import re
+from datetime import timedelta
+from itertools import groupby
 
 from django.apps import apps
-from django.core.mail import EmailMessage, get_connection
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.db.backends.utils import logger
+from django.db.models import Min
 from django.template import Context, Template
+from django.utils import timezone
 from django.utils.html import strip_tags
 from django.utils.translation import get_language
 from post_office import mail as base_mail
+from post_office.models import STATUS
 
+from project.models import Job, OutboxEmail
+from project.utils.background import run_in_background
+from project.utils.jobs import enqueue, get_task_name
 
-def send(
+
+def get_smtp_connection(smtp):
+    return get_connection(
+        backend="django.core.mail.backends.smtp.EmailBackend",
+        host=smtp.host,
+        port=smtp.port,
+        username=smtp.username,
+        password=smtp.password,
+        use_tls=(smtp.protocol == "TLS"),
+        use_ssl=(smtp.protocol == "SSL"),
+        timeout=5,
+    )
+
+
+def get_translated_templates(names):
+    """
+    Returns the email templates with the given names in the current language
+    (or English, if they aren't translated) by name, with a single query.
+    """
+    template_mail_model = apps.get_model("post_office", "EmailTemplate")
+    language = get_language()
+    templates = {}
+    for template in template_mail_model.objects.filter(
+        name__in=names, language__in=[language, "en"]
+    ):
+        if template.language == language or template.name not in templates:
+            templates[template.name] = template
+    return templates
+
+
+def textify(html):
+    # Remove html tags and continuous whitespaces
+    text_only = re.sub("[ \t]+", " ", strip_tags(html))
+    # Strip single spaces in the beginning of each line
+    return text_only.replace("\n ", "\n").strip()
+
+
+def queue(
     recipients=None,
     sender=None,
     template=None,
     context=None,
-    subject="",
-    message="",
-    html_message="",
-    scheduled_time=None,
-    expires_at=None,
-    headers=None,
-    priority=None,
-    attachments=None,
-    render_on_delivery=False,
-    log_level=None,
-    commit=True,
     cc=None,
     bcc=None,
-    language="",
-    backend="",
+    headers=None,
     smtp=None,
 ):
-    if not language:
-        language = get_language()
+    """
+    Writes an email rendered with a template to the outbox, to be sent through
+    the SMTP server of a network (or Post Office) once the current transaction
+    is committed (see queue_many).
+    """
+    return queue_many(
+        [
+            {
+                "recipients": recipients,
+                "sender": sender,
+                "template": template,
+                "context": context,
+                "cc": cc,
+                "bcc": bcc,
+                "headers": headers,
+            }
+        ],
+        smtp=smtp,
+    )
+
+
+def queue_many(kwargs_list, smtp=None):
+    """
+    Writes several emails, each one with the arguments of queue(), to the
+    outbox in the current transaction, rendered with their templates in the
+    current language (or English). They are sent in the background once it's
+    committed, through the SMTP server of a network or Post Office. Returns the
+    number of queued emails.
+    """
+    if not kwargs_list:
+        return 0
 
     template_mail_model = apps.get_model("post_office", "EmailTemplate")
-    translated_template = template_mail_model.objects.filter(
-        name=template, language=language
+    templates = get_translated_templates({kwargs["template"] for kwargs in kwargs_list})
+    emails = []
+    for kwargs in kwargs_list:
+        template = templates.get(kwargs["template"])
+        if template is None:
+            raise template_mail_model.DoesNotExist(
+                f"Email template {kwargs['template']} doesn't exist"
+            )
+        context = Context(kwargs.get("context"))
+        emails.append(
+            OutboxEmail(
+                smtp=smtp,
+                sender=kwargs.get("sender") or settings.DEFAULT_FROM_EMAIL or "",
+                recipients=list(kwargs.get("recipients") or []),
+                cc=list(kwargs.get("cc") or []),
+                bcc=list(kwargs.get("bcc") or []),
+                headers=kwargs.get("headers") or {},
+                subject=" ".join(
+                    Template(template.subject).render(context).splitlines()
+                ),
+                body=Template(template.content).render(context),
+                html_body=Template(template.html_content).render(context)
+                if template.html_content
+                else "",
+            )
+        )
+    OutboxEmail.objects.bulk_create(emails)
+    run_in_background(dispatch_outbox)
+    return len(emails)
+
+
+def get_outbox_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.sender or None,
+        to=email.recipients,
+        cc=email.cc,
+        bcc=email.bcc,
+        headers=email.headers,
+        connection=connection,
     )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
 
-    if not translated_template:
-        # Set English as the template language
-        language = "en"
-        translated_template = template_mail_model.objects.filter(
-            name=template, language="en"
-        )
 
-    if smtp:
-        connection = get_connection(
-            backend="django.core.mail.backends.smtp.EmailBackend",
-            host=smtp.host,
-            port=smtp.port,
-            username=smtp.username,
-            password=smtp.password,
-            use_tls=(smtp.protocol == "TLS"),
-            use_ssl=(smtp.protocol == "SSL"),
-            timeout=5,
+def send_with_post_office(email):
+    """
+    Sends an email of the outbox with Post Office right away. Returns whether it
+    was sent, or sets why it wasn't.
+    """
+    try:
+        message = base_mail.send(
+            recipients=email.recipients,
+            sender=email.sender or None,
+            subject=email.subject,
+            message=email.body,
+            html_message=email.html_body,
+            headers=email.headers,
+            cc=email.cc,
+            bcc=email.bcc,
+            priority="now",
         )
+    except Exception as e:
+        logger.exception("Post Office send failed for outbox email %s", email.pk)
+        email.last_error = str(e)
+        return False
+    # Post Office logs the errors of its backend instead of raising them
+    if message.status != STATUS.sent:
+        email.last_error = "Post Office failed to send it, see its logs"
+        return False
+    return True
 
-        subject = Template(translated_template[0].subject).render(Context(context))
-        body = Template(translated_template[0].content).render(Context(context))
-
-        email = EmailMessage(
-            subject=subject,
-            body=body,
-            from_email=sender,
-            to=recipients,
-            cc=cc,
-            bcc=bcc,
-            headers=headers,
-            connection=connection,
-        )
-        try:
-            return email.send()
-        except Exception:
-            logger.exception(
-                "Network SMTP send failed for host=%s, falling back to Post Office",
-                smtp.host,
+
+def send_outbox_emails(smtp, emails):
+    """
+    Sends some emails of the outbox through the same SMTP server, with a
+    single connection, or Post Office. Returns the ones that failed, to be
+    retried.
+    """
+    if smtp is None:
+        return [email for email in emails if not send_with_post_office(email)]
+
+    failed = []
+    connection = get_smtp_connection(smtp)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.exception("Network SMTP connection failed for host=%s", smtp.host)
+        for email in emails:
+            email.last_error = str(e)
+        return emails
+    try:
+        for email in emails:
+            try:
+                get_outbox_message(email, connection).send()
+            except Exception as e:
+                logger.exception("Network SMTP send failed for host=%s", smtp.host)
+                email.last_error = str(e)
+                failed.append(email)
+    finally:
+        connection.close()
+    return failed
+
+
+def dispatch_outbox():
+    """
+    Sends the emails of the outbox whose time has come, in batches of
+    OUTBOX_BATCH_SIZE grouped by SMTP server. Emails locked by another
+    dispatcher are skipped, so they are only sent once. Failed emails are
+    retried later, up to OUTBOX_MAX_ATTEMPTS times, and then sent with Post
+    Office one last time (or dropped, if it fails too). Returns the number of
+    sent emails.
+    """
+    sent = 0
+    while True:
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True, of=("self",))
+                .filter(send_at__lte=timezone.now())
+                .select_related("smtp")
+                .order_by("smtp_id", "send_at")[: settings.OUTBOX_BATCH_SIZE]
             )
+            if not emails:
+                break
 
-    # Otherwise use Post Office as before
-    return base_mail.send(
-        recipients=recipients,
-        sender=sender,
-        template=template,
-        context=context,
-        message=message,
-        html_message=html_message,
-        scheduled_time=scheduled_time,
-        expires_at=expires_at,
-        headers=headers,
-        priority=priority,
-        attachments=attachments,
-        render_on_delivery=render_on_delivery,
-        log_level=log_level,
-        commit=commit,
-        cc=cc,
-        bcc=bcc,
-        language=language,
-        backend=backend,
-    )
+            failed = []
+            for _smtp_id, group in groupby(emails, key=lambda email: email.smtp_id):
+                group = list(group)
+                failed += send_outbox_emails(group[0].smtp, group)
 
+            retried = []
+            dropped = 0
+            for email in failed:
+                email.attempts += 1
+                if email.attempts < settings.OUTBOX_MAX_ATTEMPTS:
+                    retried.append(email)
+                elif not send_with_post_office(email):
+                    logger.error(
+                        "Outbox email %s dropped after %s attempts: %s",
+                        email.pk,
+                        email.attempts,
+                        email.last_error,
+                    )
+                    dropped += 1
+            OutboxEmail.objects.exclude(pk__in=[email.pk for email in retried]).filter(
+                pk__in=[email.pk for email in emails]
+            ).delete()
+            sent += len(emails) - len(retried) - dropped
 
-def textify(html):
-    # Remove html tags and continuous whitespaces
-    text_only = re.sub("[ \t]+", " ", strip_tags(html))
-    # Strip single spaces in the beginning of each line
-    return text_only.replace("\n ", "\n").strip()
+            for email in retried:
+                email.send_at = timezone.now() + timedelta(
+                    seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+                )
+            OutboxEmail.objects.bulk_update(
+                retried, ["attempts", "last_error", "send_at"]
+            )
+
+    schedule_outbox_retry()
+    return sent
+
+
+def schedule_outbox_retry():
+    # Dispatches the outbox again when the next email to retry is due, unless
+    # another dispatch comes before, which will do it then
+    next_send_at = OutboxEmail.objects.aggregate(next_send_at=Min("send_at"))[
+        "next_send_at"
+    ]
+    if next_send_at is None:
+        return
+    if not Job.objects.filter(
+        task=get_task_name(dispatch_outbox),
+        status=Job.Status.PENDING,
+        run_at__lte=next_send_at,
+    ).exists():
+        enqueue(dispatch_outbox, run_at=next_send_at)
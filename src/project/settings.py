@@ -79,6 +79,17 @@ LANGUAGES = [
     ("fr", _("French")),
 ]
 
+# PostgreSQL text search configuration of each language, for the stemming of
+# the catalogue search (the others use "simple")
+SEARCH_CONFIGS = {
+    "en": "english",
+    "ca": "catalan",
+    "eu": "basque",
+    "es": "spanish",
+    "nl": "dutch",
+    "fr": "french",
+}
+
 # https://docs.djangoproject.com/en/4.2/ref/settings/#use-i18n
 USE_I18N = True
 
@@ -104,6 +115,84 @@ DATABASES = {
     }
 }
 
+################################################################################
+#                                  Cache                                       #
+################################################################################
+
+# https://docs.djangoproject.com/en/4.2/ref/settings/#caches
+# The local memory cache is per process, use a shared backend (i.e.
+# dbcache://django_cache, see docker/.env.example) when running more than one
+# process, like the app and the worker, as the cache versions of the fragments
+# and the throttles of the background jobs have to be shared.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Seconds browsers can reuse the geodata options of the sign-up form before
+# revalidating them
+GEODATA_CACHE_MAX_AGE = env.int("GEODATA_CACHE_MAX_AGE", default=60 * 60)
+
+# Seconds browsers can reuse the metadata of the indicators of a method (its url
+# changes anyway when the structure of the method changes)
+METHOD_METADATA_CACHE_MAX_AGE = env.int(
+    "METHOD_METADATA_CACHE_MAX_AGE", default=60 * 60 * 24 * 365
+)
+
+# Seconds browsers and proxies can reuse the public report of a survey before
+# revalidating it
+SURVEY_REPORT_CACHE_MAX_AGE = env.int("SURVEY_REPORT_CACHE_MAX_AGE", default=60 * 60)
+
+# Objects in each page of the API (see apps.methods.api), by default and at most
+API_PAGE_SIZE = env.int("API_PAGE_SIZE", default=100)
+API_MAX_PAGE_SIZE = env.int("API_MAX_PAGE_SIZE", default=1000)
+
+# The change log of the surveys and results (see apps.methods.changes): seconds
+# the deletes are kept (consumers of the feed that missed the ones deleted have
+# to sync again from the start), seconds between its compactions, and seconds the
+# feed waits for a gap in the log to be filled by the transaction that took it,
+# which must be longer than any transaction that records changes
+CHANGE_LOG_RETENTION = env.int("CHANGE_LOG_RETENTION", default=30 * 24 * 60 * 60)
+CHANGE_LOG_COMPACTION_INTERVAL = env.int(
+    "CHANGE_LOG_COMPACTION_INTERVAL", default=24 * 60 * 60
+)
+CHANGE_FEED_GAP_TIMEOUT = env.int("CHANGE_FEED_GAP_TIMEOUT", default=10 * 60)
+
+# Seconds the progress of the surveys shown in the home page is cached (it's
+# invalidated anyway when the user saves a survey)
+HOME_DASHBOARD_CACHE_TIMEOUT = env.int("HOME_DASHBOARD_CACHE_TIMEOUT", default=60 * 5)
+
+# Seconds the progress of each survey shown in the balance review is cached (its
+# key changes anyway when the survey or the structure of its method change)
+SURVEY_PROGRESS_CACHE_TIMEOUT = env.int(
+    "SURVEY_PROGRESS_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# Seconds the read-only forms of the surveys opened in the balance review are
+# cached (their key changes anyway when their answers are saved)
+SURVEY_RENDER_CACHE_TIMEOUT = env.int(
+    "SURVEY_RENDER_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# Run the background tasks (see run_in_background) in the thread of the request
+# instead of queueing them for the workers
+BACKGROUND_TASKS_EAGER = env.bool("BACKGROUND_TASKS_EAGER", default=False)
+
+# Background jobs (see project.utils.jobs), run by "python manage.py runworker"
+# with JOB_WORKER_CONCURRENCY threads, which poll the queue every
+# JOB_POLL_INTERVAL seconds while it's empty
+JOB_WORKER_CONCURRENCY = env.int("JOB_WORKER_CONCURRENCY", default=4)
+JOB_POLL_INTERVAL = env.float("JOB_POLL_INTERVAL", default=1.0)
+# Failed jobs are retried after JOB_RETRY_DELAY seconds, doubled on every
+# attempt up to JOB_MAX_RETRY_DELAY
+JOB_MAX_ATTEMPTS = env.int("JOB_MAX_ATTEMPTS", default=5)
+JOB_RETRY_DELAY = env.int("JOB_RETRY_DELAY", default=30)
+JOB_MAX_RETRY_DELAY = env.int("JOB_MAX_RETRY_DELAY", default=60 * 60)
+# Seconds a worker has to run a job before it's considered dead, and the job
+# can be claimed by other workers
+JOB_VISIBILITY_TIMEOUT = env.int("JOB_VISIBILITY_TIMEOUT", default=15 * 60)
+# Seconds succeeded jobs are kept, deleted by the workers at most every
+# JOB_CLEANUP_INTERVAL seconds
+JOB_RETENTION = env.int("JOB_RETENTION", default=7 * 24 * 60 * 60)
+JOB_CLEANUP_INTERVAL = env.int("JOB_CLEANUP_INTERVAL", default=60 * 60)
+
 
 ################################################################################
 #                                  Apps                                        #
@@ -152,6 +241,7 @@ INSTALLED_APPS = [
 
 # https://docs.djangoproject.com/en/4.2/ref/settings/#std-setting-MIDDLEWARE
 MIDDLEWARE = [
+    "project.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -159,6 +249,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "project.middleware.ProfilerMiddleware",
     "django.contrib.auth.middleware.LoginRequiredMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -261,7 +352,9 @@ production_loaders = [
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django templates, reporting their rendering time to RequestMetrics
+        "BACKEND": "project.utils.metrics.InstrumentedDjangoTemplates",
+        "NAME": "django",
         "DIRS": [
             "templates",
         ],
@@ -291,6 +384,78 @@ MEDIA_ROOT = env.str("MEDIA_ROOT", default="")
 # https://docs.djangoproject.com/en/4.2/ref/settings/#media-url
 MEDIA_URL = env.str("MEDIA_URL", default="")
 
+# Private files, like the attachments of the surveys, which aren't served from
+# MEDIA_URL
+PRIVATE_MEDIA_ROOT = env.str("PRIVATE_MEDIA_ROOT", default=str(BASE_DIR / "private"))
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Use "project.storage_backends.PrivateMediaStorage" with the Wasabi
+    # configuration below
+    "attachments": {
+        "BACKEND": env.str(
+            "ATTACHMENTS_STORAGE_BACKEND",
+            default="django.core.files.storage.FileSystemStorage",
+        ),
+        "OPTIONS": env.json(
+            "ATTACHMENTS_STORAGE_OPTIONS",
+            default={"location": PRIVATE_MEDIA_ROOT, "base_url": None},
+        ),
+    },
+}
+
+# How the protected media files (see project.views.protected_media) are sent
+# once the user is allowed to get them: "nginx" hands them to nginx with
+# X-Accel-Redirect, "sendfile" to Apache or lighttpd with X-Sendfile, and
+# "python" streams them from Django, for development
+PROTECTED_MEDIA_SERVER = env.str("PROTECTED_MEDIA_SERVER", default="python")
+
+# The internal nginx locations of the storages, for X-Accel-Redirect
+PROTECTED_MEDIA_LOCATIONS = {
+    "default": env.str("PROTECTED_MEDIA_LOCATION", default="/protected/media/"),
+    "attachments": env.str(
+        "PROTECTED_ATTACHMENTS_LOCATION", default="/protected/private/"
+    ),
+}
+
+# Sizes (width, height) the logos of the organizations are resized to fit in,
+# in the background when they are uploaded (see apps.organizations.renditions),
+# and the quality of their WebP compression
+LOGO_RENDITIONS = {"small": (240, 240), "medium": (480, 480)}
+LOGO_RENDITION_QUALITY = env.int("LOGO_RENDITION_QUALITY", default=80)
+
+# Limits of the files answered to attachment indicators, uploaded in chunks of
+# up to ATTACHMENT_CHUNK_SIZE bytes
+ATTACHMENT_MAX_SIZE = env.int("ATTACHMENT_MAX_SIZE", default=50 * 1024 * 1024)
+ATTACHMENT_CHUNK_SIZE = env.int("ATTACHMENT_CHUNK_SIZE", default=5 * 1024 * 1024)
+ATTACHMENT_EXTENSIONS = env.list(
+    "ATTACHMENT_EXTENSIONS",
+    default=[
+        "pdf",
+        "odt",
+        "ods",
+        "doc",
+        "docx",
+        "xls",
+        "xlsx",
+        "csv",
+        "txt",
+        "png",
+        "jpg",
+        "jpeg",
+    ],
+)
+
+# Seconds after which unfinished uploads, and attachments no answer refers to,
+# are deleted, and seconds between the checks
+ATTACHMENT_EXPIRY = env.int("ATTACHMENT_EXPIRY", default=24 * 60 * 60)
+ATTACHMENT_CLEANUP_INTERVAL = env.int("ATTACHMENT_CLEANUP_INTERVAL", default=60 * 60)
+
 # Wasabi cloud storage configuration
 # https://django-storages.readthedocs.io/en/latest/backends/amazon-S3.html
 # AWS_ACCESS_KEY_ID = env.str("AWS_ACCESS_KEY_ID", default="")
@@ -343,6 +508,16 @@ POST_OFFICE = {
     "CELERY_ENABLED": env("POST_OFFICE_CELERY_ENABLED", bool, default=False),
 }
 
+# Emails are written to an outbox in the transaction of the changes they tell
+# about, and sent in the background once it's committed (see
+# project.post_office.dispatch_outbox), in batches of OUTBOX_BATCH_SIZE through
+# the SMTP server of the network of the sender. Failed emails are retried
+# OUTBOX_RETRY_DELAY seconds later, doubled on every attempt, and sent with Post
+# Office after OUTBOX_MAX_ATTEMPTS
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=100)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=3)
+OUTBOX_RETRY_DELAY = env.int("OUTBOX_RETRY_DELAY", default=60)
+
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-from-email
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default=None)
 
@@ -429,6 +604,10 @@ LOGGING = {
             "handlers": ["console"],
             "level": "INFO",
         },
+        "project.middleware": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
     },
 }
 
@@ -449,6 +628,43 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
+# Per request SQL, template and view timings (see RequestMetricsMiddleware)
+REQUEST_METRICS_ENABLED = env.bool("REQUEST_METRICS_ENABLED", default=True)
+# Added as a Server-Timing header to the responses of staff users only, as it
+# tells about the internals of the views
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=DEBUG)
+# Ratio of the requests whose metrics are logged, by default and for some views
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=0.1)
+REQUEST_METRICS_VIEW_SAMPLE_RATES = {
+    "methods:method_fill": 1.0,
+    "methods:method_fill_project": 1.0,
+    "gov_admin:review_balances": 1.0,
+    "gov_admin:review_survey_actions": 1.0,
+}
+# Requests slower or with more queries than these are always logged as warnings
+REQUEST_METRICS_SLOW_REQUEST_MS = env.int(
+    "REQUEST_METRICS_SLOW_REQUEST_MS", default=1000
+)
+REQUEST_METRICS_SLOW_REQUEST_QUERIES = env.int(
+    "REQUEST_METRICS_SLOW_REQUEST_QUERIES", default=200
+)
+REQUEST_METRICS_TOP_QUERIES = 5
+
+# On-demand profiling of the requests of staff users (see ProfilerMiddleware)
+PROFILER_ENABLED = env.bool("PROFILER_ENABLED", default=True)
+PROFILER_QUERY_PARAM = "profile"
+# Seconds the signed tokens of the query parameter are valid
+PROFILER_TOKEN_MAX_AGE = env.int("PROFILER_TOKEN_MAX_AGE", default=60 * 60 * 24)
+# Number of functions and lines of code stored in the stats and allocations
+PROFILER_STATS_LIMIT = 100
+PROFILER_TOP_ALLOCATIONS = 25
+# Bigger raw profiles aren't stored, only their stats and allocations
+PROFILER_MAX_PROFILE_SIZE = env.int(
+    "PROFILER_MAX_PROFILE_SIZE", default=5 * 1024 * 1024
+)
+PROFILER_RETENTION_DAYS = env.int("PROFILER_RETENTION_DAYS", default=14)
+PROFILER_MAX_RUNS = env.int("PROFILER_MAX_RUNS", default=200)
+
 
 ################################################################################
 #                                  Selenium                                    #
@@ -0,0 +1,59 @@
+from django.test import TestCase
+
+from project.utils.benchmarks import (
+    BENCHMARKS,
+    BenchmarkSuite,
+    build_budgets,
+    check_budgets,
+)
+
+
+class BenchmarkSuiteTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.suite = BenchmarkSuite(
+            dataset={
+                "networks": 2,
+                "organizations": 6,
+                "methods": 2,
+                "indicators": 20,
+                "campaigns": 2,
+                "surveys": 12,
+            },
+            repeat=1,
+        )
+        cls.suite.setup()
+
+    def test_run(self):
+        report = self.suite.run()
+
+        self.assertEqual(set(report["results"]), set(BENCHMARKS))
+        for result in report["results"].values():
+            self.assertGreater(result["queries"], 0)
+            self.assertGreater(result["wall_time"], 0)
+            self.assertGreater(result["peak_memory"], 0)
+
+    def test_check_budgets(self):
+        report = self.suite.run(["get_survey_stats"])
+        budgets = build_budgets(report)
+        self.assertEqual(check_budgets(report, budgets), [])
+
+        result = report["results"]["get_survey_stats"]
+        result["queries"] += 1
+        result["wall_time"] *= 1.2
+        self.assertEqual(
+            check_budgets(report, budgets, tolerance=0.5),
+            [
+                {
+                    "benchmark": "get_survey_stats",
+                    "metric": "queries",
+                    "value": result["queries"],
+                    "budget": result["queries"] - 1,
+                }
+            ],
+        )
+        result["wall_time"] = result["wall_time"] * 2 + 0.1
+        self.assertEqual(
+            [r["metric"] for r in check_budgets(report, budgets, tolerance=0.5)],
+            ["queries", "wall_time"],
+        )
@@ -0,0 +1,147 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+from project.models import Job
+from project.utils.background import run_in_background
+from project.utils.jobs import claim_job, clean_jobs, enqueue, run_job
+
+calls = []
+
+
+def record(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+def fail():
+    raise ValueError("Failed")
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=False,
+    JOB_MAX_ATTEMPTS=3,
+    JOB_RETRY_DELAY=10,
+    JOB_VISIBILITY_TIMEOUT=60,
+)
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_run_in_background(self):
+        run_in_background(record, 1, "a", key=[2])
+        job = Job.objects.get()
+        self.assertEqual(job.task, f"{record.__module__}.record")
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(calls, [])
+
+        call_command("runworker", "--burst", "--concurrency", "1")
+        self.assertEqual(calls, [((1, "a"), {"key": [2]})])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_order(self):
+        enqueue(record, ["low"])
+        enqueue(record, ["later"], priority=10, delay=60)
+        enqueue(record, ["high"], priority=10)
+        call_command("runworker", "--burst", "--concurrency", "1")
+        # Scheduled jobs wait for their time
+        self.assertEqual(calls, [(("high",), {}), (("low",), {})])
+
+    def test_retries(self):
+        job = enqueue(fail)
+        run_job(claim_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn("ValueError: Failed", job.last_error)
+        # Retried after a delay, doubled on every attempt
+        self.assertIsNone(claim_job("worker"))
+        delay = job.run_at - timezone.now()
+        self.assertAlmostEqual(delay.total_seconds(), 10, delta=2)
+
+        for _attempt in (2, 3):
+            Job.objects.update(run_at=timezone.now())
+            run_job(claim_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 3)
+
+    def test_visibility_timeout(self):
+        job = enqueue(record, max_attempts=2)
+        claimed = claim_job("dead")
+        self.assertIsNone(claim_job("worker"))
+
+        # Claimed again by another worker once the lock expires
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_job("worker")
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+        # The dead worker can't update it anymore
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+
+        # Failed, once it reached its maximum attempts
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(claim_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    @override_settings(JOB_RETENTION=60)
+    def test_clean_jobs(self):
+        enqueue(record)
+        old = enqueue(record)
+        call_command("runworker", "--burst", "--concurrency", "1")
+        failed = enqueue(fail, max_attempts=1)
+        run_job(claim_job("worker"))
+        Job.objects.update(finished_at=timezone.now() - timedelta(seconds=120))
+        Job.objects.exclude(pk=old.pk).filter(status=Job.Status.SUCCEEDED).update(
+            finished_at=timezone.now()
+        )
+
+        self.assertEqual(clean_jobs(), 1)
+        self.assertFalse(Job.objects.filter(pk=old.pk).exists())
+        self.assertTrue(Job.objects.filter(pk=failed.pk).exists())
+
+    def test_admin(self):
+        job = enqueue(fail, max_attempts=1)
+        run_job(claim_job("worker"))
+        enqueue(record)
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organization = Organization.objects.create(
+                name="Organization",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        self.client.force_login(
+            User.objects.create_user(
+                "admin@example.com",
+                is_staff=True,
+                is_superuser=True,
+                email_verified=True,
+                user_profile_data={"organization": organization},
+            )
+        )
+
+        response = self.client.get("/en/superadmin/project/job/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["queue_stats"]["ready"], 1)
+        self.assertEqual(response.context["queue_stats"]["failed"], 1)
+
+        self.client.post(
+            "/en/superadmin/project/job/",
+            {"action": "retry_jobs", "_selected_action": [job.pk]},
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 0)
@@ -0,0 +1,189 @@
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.test import TestCase, override_settings
+
+from apps.methods.forms import MethodForm
+from apps.methods.models import Attachment, Campaign, Indicator, Method, Survey
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    PROTECTED_MEDIA_SERVER="python",
+    STORAGES={
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": MEDIA_ROOT},
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+        "attachments": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tempfile.mkdtemp()},
+        },
+    },
+)
+class ProtectedMediaTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        legal_structure = LegalStructure.objects.create(name="Cooperative")
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            cls.organization = Organization.objects.create(
+                name="Organization", legal_structure=legal_structure
+            )
+            cls.other_organization = Organization.objects.create(
+                name="Other", legal_structure=legal_structure
+            )
+        cls.network = Network.objects.create(name="Network")
+        cls.network.organizations.add(cls.organization)
+        cls.user = User.objects.create_user(
+            "user@example.com",
+            email_verified=True,
+            user_profile_data={"organization": cls.organization},
+        )
+        cls.other_user = User.objects.create_user(
+            "other@example.com",
+            email_verified=True,
+            user_profile_data={"organization": cls.other_organization},
+        )
+        cls.method = Method.objects.create(name="Balance", description="-")
+        cls.method.networks.add(cls.network)
+        cls.survey = Survey.objects.create(
+            method=cls.method,
+            campaign=Campaign.objects.create(name="2025", year="2025", status=True),
+            user=cls.user,
+            organization=cls.organization,
+        )
+
+    def setUp(self):
+        self.organization.logo.save("logo.png", ContentFile(b"0123456789"))
+        self.method.documentation.save("guide.pdf", ContentFile(b"%PDF-1.7"))
+        self.attachment = Attachment.objects.create(
+            indicator=Indicator.objects.create(
+                code="IND1",
+                version="1",
+                name="Statutes",
+                is_direct_indicator=True,
+                data_type=Indicator.DataType.ATTACHMENT,
+            ),
+            survey=self.survey,
+            name="statutes.pdf",
+            content_type="application/pdf",
+            size=4,
+            offset=4,
+            status=Attachment.Status.COMPLETE,
+            path=storages["attachments"].save("statutes.pdf", ContentFile(b"%PDF")),
+        )
+
+    def test_logo(self):
+        url = self.organization.get_logo_url()
+        self.client.force_login(self.other_user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response.headers["Content-Type"], "image/png")
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+        self.assertIn("private", response.headers["Cache-Control"])
+
+        # Public when the organization shares its data
+        self.client.logout()
+        self.organization.bs_allow_public = True
+        self.organization.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_documentation(self):
+        url = self.method.get_documentation_url()
+        self.client.force_login(self.other_user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # Linked from the admin through the view, not the storage
+        field = str(MethodForm(instance=self.method)["documentation"])
+        self.assertIn(f'href="{url}"', field)
+        self.assertNotIn(self.method.documentation.url, field)
+
+    def test_attachment(self):
+        url = self.attachment.get_url()
+        self.client.force_login(self.other_user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF")
+        self.assertEqual(
+            response.headers["Content-Disposition"],
+            'attachment; filename="statutes.pdf"',
+        )
+
+        # Unfinished uploads aren't served
+        self.attachment.status = Attachment.Status.UPLOADED
+        self.attachment.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_conditional(self):
+        self.client.force_login(self.user)
+        url = self.organization.get_logo_url()
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+        self.assertTrue(response.headers["Last-Modified"])
+
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_range(self):
+        self.client.force_login(self.user)
+        url = self.organization.get_logo_url()
+
+        response = self.client.get(url, headers={"range": "bytes=2-5"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response.headers["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response.headers["Content-Length"], "4")
+
+        response = self.client.get(url, headers={"range": "bytes=-3"})
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.client.get(url, headers={"range": "bytes=20-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["Content-Range"], "bytes */10")
+
+        # The whole file, if it changed since the client got a part of it
+        response = self.client.get(
+            url, headers={"range": "bytes=2-5", "if-range": '"changed"'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(PROTECTED_MEDIA_SERVER="nginx")
+    def test_x_accel_redirect(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.attachment.get_url())
+        self.assertEqual(
+            response.headers["X-Accel-Redirect"],
+            "/protected/private/" + self.attachment.path,
+        )
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+
+    @override_settings(PROTECTED_MEDIA_SERVER="sendfile")
+    def test_x_sendfile(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.organization.get_logo_url())
+        self.assertEqual(
+            response.headers["X-Sendfile"],
+            storages["default"].path(self.organization.logo.name),
+        )
@@ -0,0 +1,114 @@
+from unittest import mock
+
+from django.http import HttpResponse
+from django.template import engines
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from apps.geodata.models import Country, Region1
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+from project.middleware import RequestMetricsMiddleware
+from project.utils.metrics import normalize_sql
+
+
+class NormalizeSqlTestCase(TestCase):
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql(
+                'SELECT "a"."id" FROM "a"  WHERE "a"."region1_id" IN (%s, %s, %s) '
+                "AND \"a\".\"name\" = 'x''y' LIMIT 21"
+            ),
+            'SELECT "a"."id" FROM "a" WHERE "a"."region1_id" IN (...) '
+            'AND "a"."name" = %s LIMIT %s',
+        )
+        self.assertEqual(
+            normalize_sql('SELECT 1 FROM "a" WHERE "a"."id" IN (%s)'),
+            'SELECT %s FROM "a" WHERE "a"."id" IN (...)',
+        )
+
+
+@override_settings(LANGUAGE_CODE="en")
+class RequestMetricsMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.countries = [
+            Country.objects.create(name=name) for name in ["Spain", "France"]
+        ]
+
+    def get_response(self, request):
+        # An N+1 problem, and a template
+        for country in self.countries:
+            list(Region1.objects.filter(country=country))
+        return HttpResponse(engines["django"].from_string("{{ a }}").render({"a": 1}))
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING=True)
+    def test_server_timing(self):
+        region1 = Region1.objects.create(name="Catalonia", country=self.countries[0])
+        url = reverse("organizations:load_city") + f"?region1={region1.id}"
+        # Not for everyone
+        self.assertNotIn("Server-Timing", self.client.get(url))
+
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            organization = Organization.objects.create(
+                name="Coop",
+                legal_structure=LegalStructure.objects.create(name="Cooperative"),
+            )
+        self.client.force_login(
+            User.objects.create_user(
+                "staff@example.com",
+                is_staff=True,
+                email_verified=True,
+                user_profile_data={"organization": organization},
+            )
+        )
+        response = self.client.get(url)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^sql;dur=[\d.]+;desc="\d+ queries, \d+ duplicated", '
+            r"template;dur=[\d.]+, view;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+
+    @override_settings(
+        REQUEST_METRICS_SAMPLE_RATE=1, REQUEST_METRICS_SERVER_TIMING=True
+    )
+    def test_log_metrics(self):
+        middleware = RequestMetricsMiddleware(self.get_response)
+        request = RequestFactory().get("/test/")
+        request.user = mock.Mock(is_staff=True)
+        with mock.patch("project.middleware.logger") as logger:
+            response = middleware(request)
+
+        self.assertIn('desc="2 queries, 1 duplicated"', response["Server-Timing"])
+        logger.info.assert_called_once()
+        event, fields = logger.info.call_args.args[0], logger.info.call_args.kwargs
+        self.assertEqual(event, "request_metrics")
+        self.assertEqual(fields["queries"], 2)
+        self.assertEqual(fields["duplicate_queries"], 1)
+        self.assertGreater(fields["template_ms"], 0)
+        logger.warning.assert_not_called()
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_sampling(self):
+        middleware = RequestMetricsMiddleware(self.get_response)
+        with mock.patch("project.middleware.logger") as logger:
+            middleware(RequestFactory().get("/test/"))
+        logger.info.assert_not_called()
+        logger.warning.assert_not_called()
+
+    @override_settings(
+        REQUEST_METRICS_SAMPLE_RATE=0, REQUEST_METRICS_SLOW_REQUEST_QUERIES=2
+    )
+    def test_log_slow_request(self):
+        middleware = RequestMetricsMiddleware(self.get_response)
+        with mock.patch("project.middleware.logger") as logger:
+            middleware(RequestFactory().get("/test/"))
+
+        logger.warning.assert_called_once()
+        self.assertEqual(logger.warning.call_args.args[0], "slow_request")
+        [query] = logger.warning.call_args.kwargs["top_repeated_queries"]
+        self.assertEqual(query["count"], 2)
+        self.assertIn('FROM "geodata_region1"', query["sql"])
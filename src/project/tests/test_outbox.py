@@ -0,0 +1,140 @@
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase, override_settings
+from post_office.models import EmailTemplate
+
+from apps.settings.models import Network, SMTPServer
+from project.models import Job, OutboxEmail
+from project.post_office import dispatch_outbox, queue, queue_many
+
+POST_OFFICE = {
+    "BACKENDS": {"default": "django.core.mail.backends.locmem.EmailBackend"},
+    "DEFAULT_PRIORITY": "now",
+}
+
+
+@override_settings(
+    LANGUAGE_CODE="en",
+    BACKGROUND_TASKS_EAGER=True,
+    POST_OFFICE=POST_OFFICE,
+    OUTBOX_BATCH_SIZE=2,
+    OUTBOX_MAX_ATTEMPTS=2,
+    OUTBOX_RETRY_DELAY=60,
+)
+class OutboxTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        EmailTemplate.objects.create(
+            name="greeting",
+            language="en",
+            subject="Hello {{ name }}",
+            content="Hi {{ name }}",
+            html_content="<p>Hi {{ name }}</p>",
+        )
+        EmailTemplate.objects.create(
+            name="greeting", language="es", subject="Hola {{ name }}", content="-"
+        )
+        cls.smtp = SMTPServer.objects.create(
+            network=Network.objects.create(name="Network"),
+            host="smtp.example.com",
+            port=587,
+            username="user",
+            password="password",
+        )
+
+    def get_kwargs(self, name):
+        return {
+            "sender": "network@example.com",
+            "recipients": [f"{name}@example.com"],
+            "template": "greeting",
+            "context": {"name": name},
+        }
+
+    def test_sent_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            queue(**self.get_kwargs("ada"))
+            # Not sent until the transaction is committed
+            self.assertEqual(mail.outbox, [])
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.subject, "Hello ada")
+            self.assertEqual(email.html_body, "<p>Hi ada</p>")
+
+        [message] = mail.outbox
+        self.assertEqual(message.subject, "Hello ada")
+        self.assertEqual(message.to, ["ada@example.com"])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_rolled_back(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    queue(**self.get_kwargs("ada"))
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertFalse(OutboxEmail.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_missing_template(self):
+        with self.assertRaises(EmailTemplate.DoesNotExist):
+            queue(**{**self.get_kwargs("ada"), "template": "missing"})
+
+    @mock.patch("project.post_office.get_smtp_connection")
+    def test_smtp_batches(self, get_smtp_connection):
+        queue_many([self.get_kwargs(name) for name in ("a", "b", "c")], smtp=self.smtp)
+        queue(**self.get_kwargs("d"))
+
+        self.assertEqual(dispatch_outbox(), 4)
+        # A connection for each batch of the SMTP server
+        self.assertEqual(get_smtp_connection.call_count, 2)
+        connection = get_smtp_connection.return_value
+        self.assertEqual(connection.send_messages.call_count, 3)
+        # And Post Office for the emails without one
+        self.assertEqual([message.to for message in mail.outbox], [["d@example.com"]])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    @override_settings(BACKGROUND_TASKS_EAGER=False)
+    @mock.patch("project.post_office.get_smtp_connection")
+    def test_retries(self, get_smtp_connection):
+        connection = get_smtp_connection.return_value
+        connection.send_messages.side_effect = SMTPException("Unavailable")
+        queue(**self.get_kwargs("ada"), smtp=self.smtp)
+        Job.objects.all().delete()
+
+        self.assertEqual(dispatch_outbox(), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.attempts, email.last_error), (1, "Unavailable"))
+        # Retried in the background, once the email is due
+        job = Job.objects.get()
+        self.assertEqual(job.run_at, email.send_at)
+        self.assertEqual(dispatch_outbox(), 0)
+        self.assertEqual(Job.objects.count(), 1)
+
+        # Sent with Post Office once it reached its maximum attempts
+        OutboxEmail.objects.update(send_at=email.created_at)
+        self.assertEqual(dispatch_outbox(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["ada@example.com"]])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    @override_settings(BACKGROUND_TASKS_EAGER=False)
+    def test_post_office_retries(self):
+        queue(**self.get_kwargs("ada"))
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=SMTPException("Unavailable"),
+        ):
+            self.assertEqual(dispatch_outbox(), 0)
+            # Retried like the ones of the SMTP servers
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertTrue(email.last_error)
+
+            # And dropped once it reached its maximum attempts
+            OutboxEmail.objects.update(send_at=email.created_at)
+            self.assertEqual(dispatch_outbox(), 0)
+        self.assertFalse(OutboxEmail.objects.exists())
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,145 @@
+import marshal
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure
+from apps.users.models import User
+from project.models import ProfileRun
+from project.utils.profiling import get_profiling_token, prune_profile_runs
+
+
+@override_settings(LANGUAGE_CODE="en")
+class ProfilerMiddlewareTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with mock.patch(
+            "apps.organizations.models.get_coordinates_from_address",
+            return_value=None,
+        ):
+            legal_structure = LegalStructure.objects.create(name="Cooperative")
+            organizations = [
+                Organization.objects.create(
+                    name=f"Organization {i}", legal_structure=legal_structure
+                )
+                for i in range(2)
+            ]
+        cls.staff = User.objects.create_user(
+            "staff@example.com",
+            password="password",
+            is_staff=True,
+            email_verified=True,
+            user_profile_data={"organization": organizations[0]},
+        )
+        cls.staff.groups.add(Group.objects.get(name="Governance Admins"))
+        cls.user = User.objects.create_user(
+            "user@example.com",
+            password="password",
+            email_verified=True,
+            user_profile_data={"organization": organizations[1]},
+        )
+        cls.url = reverse("organizations:load_city")
+
+    def test_profile_with_token(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(
+            self.url, {"profile": get_profiling_token(self.staff)}
+        )
+
+        run = ProfileRun.objects.get()
+        self.assertEqual(response["X-Profile-Run"], str(run.pk))
+        self.assertEqual(run.created_by, self.staff)
+        self.assertEqual(run.method, "GET")
+        self.assertEqual(run.view_name, "organizations:load_city")
+        self.assertEqual(run.status_code, response.status_code)
+        self.assertGreater(run.queries, 0)
+        self.assertGreater(run.peak_memory, 0)
+        self.assertIn("cumulative", run.stats)
+        self.assertTrue(run.allocations)
+        self.assertFalse(run.truncated)
+        # The raw profile has the format of pstats
+        stats = marshal.loads(bytes(run.profile))
+        self.assertTrue(any(name == "load_city" for _, _, name in stats))
+
+    def test_invalid_token(self):
+        self.client.force_login(self.staff)
+        for token in ["", "forged", get_profiling_token(self.user)]:
+            response = self.client.get(self.url, {"profile": token})
+            self.assertNotIn("X-Profile-Run", response)
+
+        # Only staff users can be profiled
+        self.client.force_login(self.user)
+        self.client.get(self.url, {"profile": get_profiling_token(self.user)})
+
+        self.assertFalse(ProfileRun.objects.exists())
+
+    @override_settings(PROFILER_TOKEN_MAX_AGE=60)
+    def test_expired_token(self):
+        token = get_profiling_token(self.staff)
+        self.client.force_login(self.staff)
+        with mock.patch("time.time", return_value=timezone.now().timestamp() + 61):
+            self.client.get(self.url, {"profile": token})
+        self.assertFalse(ProfileRun.objects.exists())
+
+    def test_profile_requests(self):
+        self.staff.profile_requests = True
+        self.staff.save()
+        self.client.force_login(self.staff)
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(ProfileRun.objects.filter(created_by=self.staff).count(), 2)
+
+    @override_settings(PROFILER_MAX_PROFILE_SIZE=10)
+    def test_size_limit(self):
+        self.client.force_login(self.staff)
+        self.client.get(self.url, {"profile": get_profiling_token(self.staff)})
+
+        run = ProfileRun.objects.get()
+        self.assertTrue(run.truncated)
+        self.assertIsNone(run.profile)
+        self.assertGreater(run.profile_size, 10)
+
+    @override_settings(PROFILER_RETENTION_DAYS=7, PROFILER_MAX_RUNS=2)
+    def test_prune_profile_runs(self):
+        runs = [
+            ProfileRun.objects.create(
+                method="GET",
+                path=f"/{i}/",
+                status_code=200,
+                duration_ms=1,
+                peak_memory=1,
+            )
+            for i in range(4)
+        ]
+        now = timezone.now()
+        for days, run in zip([8, 3, 2, 1], runs, strict=True):
+            ProfileRun.objects.filter(pk=run.pk).update(
+                created_at=now - timedelta(days=days)
+            )
+
+        prune_profile_runs()
+
+        self.assertQuerySetEqual(
+            ProfileRun.objects.order_by("created_at"), runs[2:], ordered=True
+        )
+
+    def test_download(self):
+        self.client.force_login(self.staff)
+        self.client.get(self.url, {"profile": get_profiling_token(self.staff)})
+        run = ProfileRun.objects.get()
+
+        response = self.client.get(
+            reverse("gov_admin:project_profilerun_download", args=[run.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, bytes(run.profile))
+
+        response = self.client.get(
+            reverse("gov_admin:project_profilerun_change", args=[run.pk])
+        )
+        self.assertContains(response, "load_city")
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.test import TestCase
+
+from apps.methods.helpers import get_methods_form_sections
+from apps.methods.models import Indicator, IndicatorResult, Method, Survey
+from apps.organizations.models import Organization
+from apps.users.models import User
+from project.utils.synthetic_data import SyntheticDataGenerator
+
+
+class SyntheticDataGeneratorTestCase(TestCase):
+    def generate(self, **kwargs):
+        options = {
+            "networks": 2,
+            "organizations": 5,
+            "methods": 2,
+            "indicators": 30,
+            "campaigns": 3,
+            "surveys": 12,
+            "fill_ratio": 1,
+        }
+        return SyntheticDataGenerator(**options | kwargs).generate()
+
+    def test_generate(self):
+        stats = self.generate()
+
+        self.assertEqual(Organization.objects.count(), 5)
+        self.assertEqual(User.objects.filter(profile__isnull=False).count(), 5)
+        self.assertEqual(Survey.objects.count(), 12)
+        for method in Method.objects.all():
+            self.assertEqual(method.indicators.count(), 30)
+            self.assertTrue(method.indicators.filter(sets__methods=method).exists())
+        self.assertEqual(
+            set(Indicator.objects.values_list("data_type", flat=True)),
+            set(Indicator.DataType.values),
+        )
+        self.assertEqual(stats["indicatorresult"], IndicatorResult.objects.count())
+        # Every survey has gendered, group and set instance results
+        for survey in Survey.objects.all():
+            results = IndicatorResult.objects.filter(survey=survey)
+            self.assertTrue(results.filter(gender__isnull=False).exists())
+            self.assertTrue(results.filter(group_2_item__isnull=False).exists())
+            self.assertTrue(results.filter(instance_number__gt=0).exists())
+
+        sections = get_methods_form_sections(Method.objects.all())
+        for method_sections in sections.values():
+            self.assertTrue(method_sections)
+
+    def test_generate_is_deterministic(self):
+        surveys = []
+        for _ in range(2):
+            with transaction.atomic():
+                self.generate(seed=1)
+                surveys.append(
+                    list(Survey.objects.order_by("id").values_list("id", "status"))
+                )
+                transaction.set_rollback(True)
+        self.assertEqual(surveys[0], surveys[1])
+
+        self.generate(seed=1, prefix="OTHER")
+        self.assertFalse(Survey.objects.filter(id=surveys[0][0][0]).exists())
+
+    def test_prefix_already_used(self):
+        self.generate(fill_ratio=0)
+        with self.assertRaises(ValueError):
+            self.generate(fill_ratio=0)
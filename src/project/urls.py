@@ -22,12 +22,21 @@ from django.urls import include, path
 from django.utils.translation import gettext_lazy as _
 from django.views.i18n import JavaScriptCatalog
 
+from apps.methods.api import ChangeFeedView, IndicatorResultApiView, SurveyApiView
 from project.admin import gov_admin_site
-from project.views import HomeView, RootRedirectView
+from project.views import HomeView, RootRedirectView, protected_media
 
 urlpatterns = [
     path("", RootRedirectView.as_view()),
     path("i18n/", include("django.conf.urls.i18n")),
+    path(
+        "protected/<str:kind>/<uuid:object_id>/",
+        protected_media,
+        name="protected_media",
+    ),
+    path("api/surveys/", SurveyApiView.as_view(), name="api_surveys"),
+    path("api/results/", IndicatorResultApiView.as_view(), name="api_results"),
+    path("api/changes/", ChangeFeedView.as_view(), name="api_changes"),
 ]
 
 urlpatterns += i18n_patterns(
@@ -0,0 +1,31 @@
+import structlog
+from django.conf import settings
+from django.db import transaction
+
+from project.utils.jobs import enqueue
+
+logger = structlog.get_logger(__name__)
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Runs ``func`` in a job of the queue (see project.utils.jobs), so slow work
+    like sending emails doesn't delay the response. The job is only run if the
+    current transaction is committed, and sees the committed data. Arguments
+    must be JSON serializable. Errors are logged, and the job retried.
+
+    With BACKGROUND_TASKS_EAGER the function runs in the same thread once the
+    transaction is committed instead, which is what tests need to see its
+    results.
+    """
+    if not settings.BACKGROUND_TASKS_EAGER:
+        enqueue(func, args, kwargs)
+        return
+
+    def run():
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("background_task_failed", task=func.__qualname__)
+
+    transaction.on_commit(run)
@@ -0,0 +1,402 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+import django
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from apps.methods.helpers import get_form_sections, get_survey_stats
+from apps.methods.models import (
+    ExternalSurveyInvitation,
+    Indicator,
+    IndicatorResult,
+    Invitation,
+    Method,
+    Survey,
+)
+from project.utils.synthetic_data import SyntheticDataGenerator
+
+# Scale of the dataset the benchmarks run on, unless the budgets define another
+DEFAULT_DATASET = {
+    "networks": 3,
+    "organizations": 200,
+    "methods": 3,
+    "indicators": 60,
+    "campaigns": 3,
+    "surveys": 500,
+    "fill_ratio": 0.8,
+    "seed": 0,
+}
+
+# Metrics compared with the budgets. Query counts don't depend on the machine,
+# so they must not grow at all, while time and memory get some tolerance
+METRICS = ["queries", "wall_time", "peak_memory"]
+STRICT_METRICS = ["queries"]
+
+# Absolute margin over the budgets, so the noise of the fastest benchmarks
+# doesn't make them fail
+SLACK = {"wall_time": 0.05, "peak_memory": 256 * 1024}
+
+INVITATIONS = 50
+
+# Emails are sent right away, but not delivered
+POST_OFFICE = {
+    "BACKENDS": {"default": "django.core.mail.backends.locmem.EmailBackend"},
+    "DEFAULT_PRIORITY": "now",
+}
+
+GENDER_SUFFIXES = {
+    IndicatorResult.Gender.MALE: "men",
+    IndicatorResult.Gender.FEMALE: "women",
+    IndicatorResult.Gender.NON_BINARY: "non_binary",
+}
+
+BENCHMARKS = {}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def benchmark(name):
+    """
+    Registers a method of BenchmarkSuite as the benchmark with the given name.
+    """
+
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+class BenchmarkSuite:
+    """
+    Measures the wall time, number of SQL queries and peak memory of the
+    critical views and helpers on a synthetic dataset (see
+    SyntheticDataGenerator).
+
+    Each benchmark runs inside a transaction that is rolled back, so the ones
+    that write (like saving a survey or sending invitations) always start from
+    the same data, and with an empty cache, so cached paths are measured on
+    their worst case.
+    """
+
+    def __init__(self, dataset=None, repeat=5, log=None):
+        self.dataset = DEFAULT_DATASET | (dataset or {})
+        self.repeat = repeat
+        self.log = log or (lambda message: None)
+
+    def setup(self):
+        self.log("Generating the dataset...")
+        SyntheticDataGenerator(log=self.log, **self.dataset).generate()
+        call_command("load_email_templates")
+
+        # An open survey of the active campaign, with answers
+        self.survey = (
+            Survey.objects.filter(campaign__status=True, status=Survey.Status.OPEN)
+            .select_related("user", "organization", "method", "campaign")
+            .order_by("organization__name")
+            .first()
+        )
+        self.user = self.survey.user
+
+        # A network admin that manages the network of the organization
+        network = self.survey.organization.networks.first()
+        self.admin = (
+            Survey.objects.exclude(organization=self.survey.organization)
+            .select_related("user__profile__organization")
+            .order_by("organization__name")
+            .first()
+            .user
+        )
+        self.admin.is_staff = True
+        self.admin.save()
+        self.admin.groups.add(Group.objects.get(name="Network Admins"))
+        organization = self.admin.profile.organization
+        organization.network_managed = network
+        organization.save()
+
+        self.closed_survey = (
+            Survey.objects.filter(status=Survey.Status.CLOSED, method__networks=network)
+            .order_by("organization__name")
+            .first()
+        ) or self.survey
+
+        self.setup_external_survey()
+        self.post_data = self.get_post_data(self.survey)
+
+    def setup_external_survey(self):
+        """
+        Adds an external survey to the method of the survey, with invitations
+        pending to be sent.
+        """
+        self.external_method = Method.objects.create(
+            name=f"{self.survey.method.name} external",
+            description="",
+            unit_of_analysis=Method.UnitAnalysis.EXTERNAL_SURVEY,
+        )
+        self.survey.method.external_surveys.add(self.external_method)
+        self.survey.campaign.methods.add(self.external_method)
+        self.external_survey_invitation = ExternalSurveyInvitation.objects.create(
+            name=self.external_method.name,
+            external_survey=self.external_method,
+            organization=self.survey.organization,
+            campaign=self.survey.campaign,
+        )
+        Invitation.objects.bulk_create(
+            Invitation(
+                name=f"Person {i}",
+                email=f"person-{i}@example.com",
+                token=uuid.uuid4().hex,
+                external_survey_invitation=self.external_survey_invitation,
+            )
+            for i in range(INVITATIONS)
+        )
+
+    def get_post_data(self, survey):
+        """
+        Returns the data the method form posts for the current answers of a
+        survey, named as the form fields.
+        """
+        data = {"action": "save"}
+        results = IndicatorResult.objects.filter(survey=survey).select_related(
+            "indicator", "group_item", "group_2_item"
+        )
+        for result in results:
+            parts = [f"question_{result.indicator_id}"]
+            if result.gender is not None:
+                parts.append(GENDER_SUFFIXES[result.gender])
+            if result.group_item:
+                parts.append(result.group_item.suffix)
+            if result.group_2_item:
+                parts.append(result.group_2_item.suffix)
+            if result.is_total:
+                parts.append("total")
+            # Group totals of tables aren't numbered
+            if result.instance_number and not (
+                result.is_total and result.group_item and not result.group_2_item
+            ):
+                parts.append(str(result.instance_number))
+            name = "_".join(parts)
+            if result.indicator.data_type == Indicator.DataType.CHECKBOX:
+                data[name] = result.value.split("|")
+            else:
+                data[name] = result.value
+        return data
+
+    def run(self, names=None):
+        # Logging in isn't part of the benchmarks
+        self.clients = {}
+        for user in [self.user, self.admin]:
+            self.clients[user] = Client()
+            self.clients[user].force_login(user)
+
+        results = {}
+        for name, func in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            self.log(f"Running {name}...")
+            results[name] = self.measure(func)
+        return {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "dataset": self.dataset,
+            "repeat": self.repeat,
+            "results": results,
+        }
+
+    def measure(self, func):
+        times = []
+        queries = []
+        for _ in range(self.repeat):
+            with self.isolated():
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    func(self)
+                    times.append(time.perf_counter() - start)
+                queries.append(len(context.captured_queries))
+
+        # Memory is measured apart, as tracing slows down the code
+        with self.isolated():
+            tracemalloc.start()
+            try:
+                func(self)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return {
+            "queries": max(queries),
+            "wall_time": round(statistics.median(times), 4),
+            "wall_time_min": round(min(times), 4),
+            "wall_time_max": round(max(times), 4),
+            "peak_memory": peak_memory,
+        }
+
+    @contextmanager
+    def isolated(self):
+        cache.clear()
+        with (
+            transaction.atomic(),
+            override_settings(
+                POST_OFFICE=POST_OFFICE, DEFAULT_FROM_EMAIL="noreply@example.com"
+            ),
+            translation.override("en"),
+        ):
+            yield
+            transaction.set_rollback(True)
+
+    def get(self, user, url, status=200, **kwargs):
+        response = self.clients[user].get(url, **kwargs)
+        self.check_status(url, response, status)
+        return response
+
+    def post(self, user, url, data, status=302, **kwargs):
+        response = self.clients[user].post(url, data, **kwargs)
+        self.check_status(url, response, status)
+        return response
+
+    def check_status(self, url, response, status):
+        # A benchmark of an error page would be meaningless
+        if response.status_code != status:
+            raise BenchmarkError(
+                f"{url} returned {response.status_code} instead of {status}"
+            )
+
+    # Benchmarks
+
+    @benchmark("method_fill_get")
+    def method_fill_get(self):
+        survey = self.survey
+        self.get(
+            self.user,
+            reverse("methods:method_fill", args=[survey.campaign_id, survey.method_id]),
+        )
+
+    @benchmark("method_fill_post")
+    def method_fill_post(self):
+        survey = self.survey
+        self.post(
+            self.user,
+            reverse("methods:method_fill", args=[survey.campaign_id, survey.method_id]),
+            self.post_data,
+        )
+
+    @benchmark("home")
+    def home(self):
+        self.get(self.user, reverse("home"))
+
+    @benchmark("balance_review")
+    def balance_review(self):
+        self.get(self.admin, reverse("gov_admin:review_balances"))
+
+    @benchmark("review_survey_action")
+    def review_survey_action(self):
+        self.get(
+            self.admin,
+            reverse("gov_admin:review_survey_actions", args=[self.closed_survey.pk]),
+            data={"action": "info"},
+        )
+
+    @benchmark("import_csv")
+    def import_csv(self):
+        rows = ["name,email"] + [
+            f"Imported {i},imported-{i}@example.com" for i in range(INVITATIONS)
+        ]
+        survey = self.survey
+        self.post(
+            self.user,
+            reverse(
+                "methods:import_csv",
+                args=[
+                    survey.organization_id,
+                    self.external_method.pk,
+                    survey.campaign_id,
+                ],
+            ),
+            {
+                "csv_file": SimpleUploadedFile(
+                    "invitations.csv", "\n".join(rows).encode()
+                )
+            },
+            status=200,
+        )
+
+    @benchmark("invitations_sent_view")
+    def invitations_sent_view(self):
+        self.get(
+            self.user,
+            reverse(
+                "methods:send_invitations", args=[self.external_survey_invitation.pk]
+            ),
+        )
+
+    @benchmark("get_survey_stats")
+    def get_survey_stats(self):
+        survey = self.survey
+        # With the sections tree, as the home dashboard builds them
+        method = survey.method
+        method.sections = get_form_sections(method)
+        get_survey_stats(survey, method, survey.campaign)
+
+
+def load_budgets(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def build_budgets(report):
+    """
+    Returns the budgets matching the results of a report.
+    """
+    return {
+        "dataset": report["dataset"],
+        "budgets": {
+            name: {metric: result[metric] for metric in METRICS}
+            for name, result in report["results"].items()
+        },
+    }
+
+
+def check_budgets(report, budgets, tolerance=0.5):
+    """
+    Returns the regressions of a report: every metric above its budget, with
+    the given tolerance (as a ratio) and some slack for the metrics that depend
+    on the machine.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        budget = budgets["budgets"].get(name)
+        if budget is None:
+            continue
+        for metric in METRICS:
+            if metric not in budget:
+                continue
+            limit = budget[metric]
+            if metric not in STRICT_METRICS:
+                limit = limit * (1 + tolerance) + SLACK.get(metric, 0)
+            if result[metric] > limit:
+                regressions.append(
+                    {
+                        "benchmark": name,
+                        "metric": metric,
+                        "value": result[metric],
+                        "budget": budget[metric],
+                    }
+                )
+    return regressions
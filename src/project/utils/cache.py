@@ -0,0 +1,17 @@
+import time
+
+from django.core.cache import cache
+
+
+def get_cache_version(namespace):
+    """
+    Returns the current version of a group of cached values. It's meant to be
+    part of their cache keys (and ETags), so bumping it invalidates all of them
+    at once. Versions are timestamps, so they never repeat even if the cache is
+    cleared.
+    """
+    return cache.get_or_set(f"version:{namespace}", time.time_ns, timeout=None)
+
+
+def bump_cache_version(namespace):
+    cache.set(f"version:{namespace}", time.time_ns(), timeout=None)
@@ -0,0 +1,212 @@
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from project.models import Job
+
+logger = structlog.get_logger(__name__)
+
+
+def get_task_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(
+    func, args=(), kwargs=None, priority=0, delay=0, run_at=None, max_attempts=None
+):
+    """
+    Adds a job to run ``func`` with the given arguments, which must be JSON
+    serializable (ids instead of objects). It's added in the current
+    transaction, so it only runs if it's committed, and never sees data that
+    isn't. Jobs with a higher priority run first, and ``delay`` postpones it
+    some seconds, or until ``run_at``.
+    """
+    return Job.objects.create(
+        task=get_task_name(func),
+        args=list(args),
+        kwargs=kwargs or {},
+        priority=priority,
+        run_at=run_at or timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def get_retry_delay(attempts):
+    # Exponential backoff
+    return min(
+        settings.JOB_RETRY_DELAY * 2 ** (attempts - 1), settings.JOB_MAX_RETRY_DELAY
+    )
+
+
+def claim_job(worker_id):
+    """
+    Locks the next job to run for a worker: the pending job with the highest
+    priority whose time has come, or a running one whose worker didn't finish
+    it in JOB_VISIBILITY_TIMEOUT seconds. Jobs locked by other workers are
+    skipped instead of waiting for them, so workers never claim the same job.
+    Returns None when there isn't any.
+    """
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Job.Status.PENDING, run_at__lte=now)
+                    | Q(status=Job.Status.RUNNING, locked_until__lt=now)
+                )
+                .order_by("-priority", "run_at")
+                .first()
+            )
+            if job is None:
+                return None
+
+            if job.status == Job.Status.RUNNING and job.attempts >= job.max_attempts:
+                job.status = Job.Status.FAILED
+                job.last_error = "The worker didn't finish it in time."
+                job.locked_until = None
+                job.finished_at = now
+                job.save(
+                    update_fields=[
+                        "status",
+                        "last_error",
+                        "locked_until",
+                        "finished_at",
+                        "updated_at",
+                    ]
+                )
+                continue
+
+            job.status = Job.Status.RUNNING
+            job.attempts += 1
+            # Unique for every claim, so a worker that was too slow can't
+            # update a job claimed again by another one
+            job.locked_by = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+            job.locked_until = now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+            job.save(
+                update_fields=[
+                    "status",
+                    "attempts",
+                    "locked_by",
+                    "locked_until",
+                    "updated_at",
+                ]
+            )
+            return job
+
+
+def run_job(job):
+    """
+    Runs a claimed job, and records whether it succeeded. Failed jobs are
+    retried after a delay until they reach their maximum attempts.
+    """
+    log = logger.bind(job_id=str(job.pk), task=job.task, attempt=job.attempts)
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        log.exception("job_failed")
+        now = timezone.now()
+        fields = {"last_error": traceback.format_exc(), "locked_until": None}
+        if job.attempts < job.max_attempts:
+            fields.update(
+                status=Job.Status.PENDING,
+                run_at=now + timedelta(seconds=get_retry_delay(job.attempts)),
+            )
+        else:
+            fields.update(status=Job.Status.FAILED, finished_at=now)
+    else:
+        log.info("job_succeeded")
+        fields = {
+            "status": Job.Status.SUCCEEDED,
+            "locked_until": None,
+            "finished_at": timezone.now(),
+        }
+    fields["updated_at"] = timezone.now()
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(**fields)
+
+
+def clean_jobs():
+    """
+    Deletes the jobs that succeeded more than JOB_RETENTION seconds ago. Failed
+    jobs are kept until they are deleted from the admin. Returns the number of
+    deleted jobs.
+    """
+    limit = timezone.now() - timedelta(seconds=settings.JOB_RETENTION)
+    count, _ = Job.objects.filter(
+        status=Job.Status.SUCCEEDED, finished_at__lt=limit
+    ).delete()
+    return count
+
+
+class Worker:
+    """
+    Runs jobs in ``concurrency`` threads, each of them claiming the next job
+    when it finishes one, or polling the queue every ``poll_interval`` seconds
+    while it's empty. In burst mode it stops once the queue is empty.
+    """
+
+    def __init__(self, concurrency=1, poll_interval=None, burst=False):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.burst = burst
+        self.id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.last_cleanup = None
+
+    def stop(self):
+        # Running jobs are finished
+        self.stopping.set()
+
+    def run(self):
+        logger.info("worker_started", worker=self.id, concurrency=self.concurrency)
+        if self.concurrency == 1:
+            self.work()
+        else:
+            threads = [
+                threading.Thread(target=self.work, name=f"worker-{i}")
+                for i in range(self.concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        logger.info("worker_stopped", worker=self.id)
+
+    def work(self):
+        worker_id = f"{self.id}:{threading.current_thread().name}"
+        try:
+            while not self.stopping.is_set():
+                # Like between requests (not in a transaction, as in the tests)
+                if not connection.in_atomic_block:
+                    close_old_connections()
+                job = claim_job(worker_id)
+                if job is not None:
+                    run_job(job)
+                    continue
+                if self.burst:
+                    break
+                self.clean()
+                self.stopping.wait(self.poll_interval)
+        finally:
+            if self.concurrency > 1:
+                connections.close_all()
+
+    def clean(self):
+        # At most once per interval, by any of the threads
+        now = timezone.now()
+        if self.last_cleanup and (now - self.last_cleanup).total_seconds() < (
+            settings.JOB_CLEANUP_INTERVAL
+        ):
+            return
+        self.last_cleanup = now
+        logger.info("jobs_cleaned", count=clean_jobs())
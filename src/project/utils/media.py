@@ -0,0 +1,127 @@
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import storages
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Bytes read at once when streaming a range of a file
+RANGE_BLOCK_SIZE = 64 * 1024
+
+
+def get_range(header, size):
+    """
+    Returns the (start, end) bytes of a single range Range header, end
+    included, None if there's no range to apply, or False if it can't be
+    satisfied. Multiple ranges aren't supported, so the whole file is sent.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if not start:
+        # The last bytes
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end) if end else size - 1, size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def stream_range(file, start, end):
+    try:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = file.read(min(RANGE_BLOCK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        file.close()
+
+
+def serve_file(request, alias, name, filename=None, as_attachment=False):
+    """
+    Sends a file of a storage to a user who was already allowed to get it.
+
+    The transfer is handed to the front proxy when PROTECTED_MEDIA_SERVER is
+    "nginx" (X-Accel-Redirect to the internal location of the storage in
+    PROTECTED_MEDIA_LOCATIONS) or "sendfile" (X-Sendfile with the path of the
+    file), so workers aren't busy while it's downloaded. Otherwise it's
+    streamed by Django, supporting single range requests. Responses can be
+    revalidated with their ETag and Last-Modified, but aren't stored by shared
+    caches.
+    """
+    storage = storages[alias]
+    try:
+        size = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except (FileNotFoundError, OSError) as e:
+        raise Http404 from e
+
+    etag = quote_etag(f"{int(modified.timestamp())}-{size}")
+    last_modified = int(modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = get_file_response(request, storage, alias, name, size, etag)
+
+    filename = filename or name.rsplit("/", 1)[-1]
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Content-Disposition"] = content_disposition_header(
+        as_attachment, filename
+    )
+    response.headers.setdefault(
+        "Content-Type", mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_file_response(request, storage, alias, name, size, etag):
+    server = settings.PROTECTED_MEDIA_SERVER
+    if server == "nginx":
+        # nginx applies the ranges itself
+        response = HttpResponse()
+        response.headers["X-Accel-Redirect"] = settings.PROTECTED_MEDIA_LOCATIONS[
+            alias
+        ] + quote(name)
+        del response.headers["Content-Type"]
+        return response
+    if server == "sendfile":
+        response = HttpResponse()
+        response.headers["X-Sendfile"] = storage.path(name)
+        del response.headers["Content-Type"]
+        return response
+
+    # Ranges are ignored if the file changed since the client got a part of it
+    if_range = request.headers.get("If-Range")
+    byte_range = (
+        get_range(request.headers.get("Range"), size)
+        if not if_range or if_range == etag
+        else None
+    )
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is None:
+        response = FileResponse(storage.open(name, "rb"))
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            stream_range(storage.open(name, "rb"), start, end), status=206
+        )
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response.headers["Content-Length"] = end - start + 1
+    del response.headers["Content-Type"]
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,128 @@
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+# Metrics of the request being processed, if it's instrumented
+current_metrics = ContextVar("request_metrics", default=None)
+
+IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)", re.IGNORECASE)
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Returns the SQL without the values that change between executions of the
+    same query (parameters, literals and the length of IN lists), so repeated
+    queries (like the ones of N+1 problems) can be grouped.
+    """
+    sql = LITERALS.sub("%s", sql)
+    sql = IN_LIST.sub("IN (...)", sql)
+    return SPACES.sub(" ", sql).strip()
+
+
+class RequestMetrics:
+    """
+    Collects the SQL queries and template rendering time of a request.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.sql_time = 0
+        self.template_time = 0
+        self.queries = Counter()
+        self._template_depth = 0
+
+    @contextmanager
+    def capture(self):
+        """
+        Records the queries run on every database connection, and the templates
+        rendered, while the context is active.
+        """
+        token = current_metrics.set(self)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.record_query))
+                yield self
+        finally:
+            current_metrics.reset(token)
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries[normalize_sql(sql)] += 1
+
+    @contextmanager
+    def template_timer(self):
+        # Templates rendered by other templates are already timed by the outer one
+        self._template_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._template_depth -= 1
+            if not self._template_depth:
+                self.template_time += time.perf_counter() - start
+
+    @property
+    def query_count(self):
+        return self.queries.total()
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.queries.values() if count > 1)
+
+    def top_repeated_queries(self, limit):
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.queries.most_common(limit)
+            if count > 1
+        ]
+
+    def get_timings(self):
+        """
+        Returns the durations of the request in milliseconds. The view duration
+        doesn't include the rendering of templates.
+        """
+        end = time.perf_counter()
+        view_time = end - self.view_start if self.view_start else 0
+        return {
+            "duration_ms": round((end - self.start) * 1000, 2),
+            "view_ms": round(max(view_time - self.template_time, 0) * 1000, 2),
+            "template_ms": round(self.template_time * 1000, 2),
+            "sql_ms": round(self.sql_time * 1000, 2),
+        }
+
+
+class Template(DjangoTemplate):
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+        with metrics.template_timer():
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    Django templates backend that reports the rendering time to the metrics of
+    the current request.
+    """
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return Template(template.template, self)
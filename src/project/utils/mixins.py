@@ -32,6 +32,14 @@ class NetworkFilterMixin:
         if hasattr(qs.model, "profile"):
             return qs.filter(profile__organization__networks=user_network)
 
+        # Used in: indicator comparisons
+        if hasattr(qs.model, "organization"):
+            return qs.filter(organization__networks=user_network)
+
+        # Used in: indicator results
+        if hasattr(qs.model, "survey"):
+            return qs.filter(survey__method__networks=user_network)
+
         return qs.none()
 
     def filter_model_by_network(self, request, model, **filters):
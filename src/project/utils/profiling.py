@@ -0,0 +1,155 @@
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from project.models import ProfileRun
+
+TOKEN_SALT = "project.profiling"
+
+# Only one request is profiled at a time, as tracemalloc traces the whole
+# process and profiling concurrent requests would mix their results
+profiling_lock = threading.Lock()
+
+
+def get_profiling_token(user):
+    """
+    Returns the value of the profiling query parameter for a user. It's signed,
+    so it can't be forged, and only valid for that user while it's staff.
+    """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def check_profiling_token(user, token):
+    try:
+        user_id = signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return user_id == str(user.pk)
+
+
+def should_profile(request):
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated or not user.is_staff:
+        return False
+    if user.profile_requests:
+        return True
+    token = request.GET.get(settings.PROFILER_QUERY_PARAM)
+    return bool(token) and check_profiling_token(user, token)
+
+
+class RequestProfiler:
+    """
+    Runs cProfile and tracemalloc while profiling a request, and stores the
+    results as a ProfileRun.
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.duration = 0
+        self.peak_memory = 0
+        self.snapshot = None
+
+    @contextmanager
+    def profile(self):
+        # Doesn't stop the tracing if someone else started it
+        was_tracing = tracemalloc.is_tracing()
+        if was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        start = time.perf_counter()
+        self.profiler.enable()
+        try:
+            yield self
+        finally:
+            self.profiler.disable()
+            self.duration = time.perf_counter() - start
+            _, self.peak_memory = tracemalloc.get_traced_memory()
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                ]
+            )
+            if not was_tracing:
+                tracemalloc.stop()
+
+    def get_stats(self):
+        """
+        Returns the functions that took longer, including the functions they
+        called, as printed by pstats.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            settings.PROFILER_STATS_LIMIT
+        )
+        return stream.getvalue()
+
+    def get_allocations(self):
+        """
+        Returns the lines of code that allocated more memory still in use at the
+        end of the request.
+        """
+        statistics = self.snapshot.statistics("lineno")
+        return [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in statistics[: settings.PROFILER_TOP_ALLOCATIONS]
+        ]
+
+    def get_profile(self):
+        # The format of pstats.Stats.dump_stats
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+    def save(self, request, response):
+        profile = self.get_profile()
+        truncated = len(profile) > settings.PROFILER_MAX_PROFILE_SIZE
+        metrics = getattr(request, "metrics", None)
+        run = ProfileRun.objects.create(
+            created_by=request.user,
+            method=request.method,
+            path=request.get_full_path()[:2048],
+            view_name=(
+                request.resolver_match.view_name if request.resolver_match else ""
+            )[:255],
+            status_code=response.status_code,
+            duration_ms=round(self.duration * 1000, 2),
+            queries=metrics.query_count if metrics else None,
+            peak_memory=self.peak_memory,
+            stats=self.get_stats(),
+            allocations=self.get_allocations(),
+            profile=None if truncated else profile,
+            profile_size=len(profile),
+            truncated=truncated,
+        )
+        prune_profile_runs()
+        return run
+
+
+def prune_profile_runs():
+    """
+    Deletes the profile runs older than the retention period, and the oldest
+    ones over the maximum number of runs.
+    """
+    limit = timezone.now() - timedelta(days=settings.PROFILER_RETENTION_DAYS)
+    ProfileRun.objects.filter(created_at__lt=limit).delete()
+    kept = ProfileRun.objects.values("pk")[: settings.PROFILER_MAX_RUNS]
+    ProfileRun.objects.exclude(pk__in=kept).delete()
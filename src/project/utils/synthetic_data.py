@@ -0,0 +1,740 @@
+import datetime
+import random
+import re
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone, translation
+from modeltranslation.settings import DEFAULT_LANGUAGE
+
+from apps.geodata.helpers import bump_geodata_version
+from apps.geodata.models import City, Country, Region1, ZipCode
+from apps.methods.models import (
+    Campaign,
+    Group,
+    GroupItem,
+    Indicator,
+    IndicatorResult,
+    IndicatorsSet,
+    List,
+    ListItem,
+    Method,
+    Section,
+    Survey,
+    Topic,
+)
+from apps.organizations.helpers import invalidate_method_options
+from apps.organizations.models import Organization
+from apps.settings.models import LegalStructure, Network
+from apps.users.models import User, UserProfile
+
+DataType = Indicator.DataType
+
+# Kinds of indicators the methods cycle through: standard, gendered, group lists
+# ("group") and tables ("table"), so every way of storing results is covered
+INDICATOR_KINDS = [
+    (DataType.STRING, None),
+    (DataType.TEXT, None),
+    (DataType.INTEGER, None),
+    (DataType.DECIMAL, None),
+    (DataType.BOOLEAN, None),
+    (DataType.DATE, None),
+    (DataType.ATTACHMENT, None),
+    (DataType.CHECKBOX, None),
+    (DataType.RADIOBUTTON, None),
+    (DataType.DROPDOWN, None),
+    (DataType.INTEGERGENDER, None),
+    (DataType.DECIMALGENDER, None),
+    (DataType.STRING, "group"),
+    (DataType.INTEGER, "group"),
+    (DataType.INTEGER, "table"),
+    (DataType.DECIMAL, "table"),
+]
+
+# Indicators of each set. Gendered indicators can't be repeated in several
+# instances (results are unique by survey, indicator and gender)
+SET_KINDS = [
+    (DataType.STRING, None),
+    (DataType.INTEGER, None),
+    (DataType.RADIOBUTTON, None),
+]
+
+INDICATORS_PER_SET = len(SET_KINDS)
+INDICATORS_PER_SECTION = 6
+MAX_SET_INSTANCES = 3
+TOPICS = 8
+LISTS = 3
+LIST_ITEMS = 4
+GROUPS = 3
+GROUP_ITEMS = 3
+CITIES = 3
+
+WORDS = [
+    "equity",
+    "cooperation",
+    "sustainability",
+    "transparency",
+    "democracy",
+    "community",
+    "environment",
+    "solidarity",
+    "commitment",
+    "quality",
+]
+
+
+class SyntheticDataGenerator:
+    """
+    Generates a synthetic dataset of the size of a large deployment: networks,
+    organizations (each one with its user), methods whose indicators cover all
+    the data types, a chain of campaigns and surveys answered with a given fill
+    ratio.
+
+    Everything is written with bulk inserts, and ids and values come from a
+    seeded random generator, so the same arguments always generate the same
+    data. The prefix is used in codes, names and emails, so several datasets
+    can live in the same database.
+    """
+
+    def __init__(
+        self,
+        networks=3,
+        organizations=50,
+        methods=2,
+        indicators=40,
+        campaigns=3,
+        surveys=100,
+        fill_ratio=0.8,
+        seed=0,
+        prefix="SYN",
+        password="synthetic",
+        batch_size=2000,
+        log=None,
+    ):
+        if not re.fullmatch(r"[A-Za-z0-9]+", prefix):
+            raise ValueError("The prefix can only contain letters and digits")
+        if not 0 <= fill_ratio <= 1:
+            raise ValueError("The fill ratio must be between 0 and 1")
+        if min(networks, organizations, methods, campaigns) < 1:
+            raise ValueError(
+                "At least one network, organization, method and campaign are needed"
+            )
+        if indicators < len(INDICATOR_KINDS) + INDICATORS_PER_SET:
+            raise ValueError(
+                "Methods need at least {} indicators to cover every data type".format(
+                    len(INDICATOR_KINDS) + INDICATORS_PER_SET
+                )
+            )
+
+        self.networks_count = networks
+        self.organizations_count = organizations
+        self.methods_count = methods
+        self.indicators_count = indicators
+        self.campaigns_count = campaigns
+        self.surveys_count = surveys
+        self.fill_ratio = fill_ratio
+        self.prefix = prefix
+        self.password = password
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        # The prefix is part of the seed, so datasets don't share ids
+        self.rng = random.Random(f"{prefix}:{seed}")
+        self.now = timezone.now()
+        self.stats = {}
+
+    def generate(self):
+        if Indicator.objects.filter(code__startswith=f"{self.prefix}-").exists():
+            raise ValueError(
+                f"There is already a dataset with the prefix '{self.prefix}'"
+            )
+
+        with translation.override(DEFAULT_LANGUAGE), transaction.atomic():
+            self.create_geodata()
+            self.create_catalogues()
+            self.create_methods()
+            self.create_campaigns()
+            self.create_networks()
+            self.create_organizations()
+            self.create_surveys()
+            self.create_results()
+
+        # Bulk operations don't send signals
+        bump_geodata_version()
+        invalidate_method_options()
+        return self.stats
+
+    # Helpers
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def name(self, label, number):
+        return f"{self.prefix} {label} {number}"
+
+    def bulk_create(self, model, objs):
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        key = model._meta.model_name
+        self.stats[key] = self.stats.get(key, 0) + len(objs)
+        return objs
+
+    def link(self, field, rows, sorted_m2m=False):
+        """
+        Creates the rows of a many-to-many field, given as (source, target)
+        pairs of ids. Sorted fields keep the order of the rows.
+        """
+        through = field.through
+        source = field.field.m2m_column_name()
+        target = field.field.m2m_reverse_name()
+        objs = []
+        for position, (source_id, target_id) in enumerate(rows):
+            values = {source: source_id, target: target_id}
+            if sorted_m2m:
+                values["sort_value"] = position
+            objs.append(through(**values))
+        through.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    # Data
+
+    def create_geodata(self):
+        self.log("Creating geodata...")
+        self.country = self.bulk_create(
+            Country, [Country(id=self.uuid(), name=self.name("Country", 1))]
+        )[0]
+        self.region1 = self.bulk_create(
+            Region1,
+            [
+                Region1(
+                    id=self.uuid(),
+                    name=self.name("Region", 1),
+                    country=self.country,
+                )
+            ],
+        )[0]
+        self.cities = self.bulk_create(
+            City,
+            [
+                City(
+                    id=self.uuid(),
+                    name=self.name("City", i),
+                    country=self.country,
+                    region1=self.region1,
+                )
+                for i in range(1, CITIES + 1)
+            ],
+        )
+        self.zip_codes = self.bulk_create(
+            ZipCode,
+            [
+                ZipCode(id=self.uuid(), code=f"{i:05}", city=city)
+                for i, city in enumerate(self.cities, 1)
+            ],
+        )
+        self.legal_structure = self.bulk_create(
+            LegalStructure,
+            [LegalStructure(id=self.uuid(), name=self.name("Legal structure", 1))],
+        )[0]
+
+    def create_catalogues(self):
+        self.log("Creating topics, lists and groups...")
+        self.topics = self.bulk_create(
+            Topic,
+            [
+                Topic(
+                    id=self.uuid(),
+                    name=self.name("Topic", i),
+                    description=self.rng.choice(WORDS),
+                )
+                for i in range(1, TOPICS + 1)
+            ],
+        )
+
+        list_items = self.bulk_create(
+            ListItem,
+            [
+                ListItem(id=self.uuid(), title=self.name("Option", i), value=i)
+                for i in range(1, LISTS * LIST_ITEMS + 1)
+            ],
+        )
+        self.lists = self.bulk_create(
+            List,
+            [
+                List(id=self.uuid(), title=self.name("List", i))
+                for i in range(1, LISTS + 1)
+            ],
+        )
+        self.list_titles = {}
+        rows = []
+        for i, options_list in enumerate(self.lists):
+            items = list_items[i * LIST_ITEMS : (i + 1) * LIST_ITEMS]
+            self.list_titles[options_list.id] = [item.title for item in items]
+            rows += [(options_list.id, item.id) for item in items]
+        self.link(List.items, rows, sorted_m2m=True)
+
+        group_items = self.bulk_create(
+            GroupItem,
+            [
+                GroupItem(
+                    id=self.uuid(),
+                    title=self.name("Item", i),
+                    suffix=f"{self.prefix.lower()}{i}",
+                )
+                for i in range(1, GROUPS * GROUP_ITEMS + 1)
+            ],
+        )
+        self.groups = self.bulk_create(
+            Group,
+            [
+                Group(id=self.uuid(), title=self.name("Group", i))
+                for i in range(1, GROUPS + 1)
+            ],
+        )
+        self.group_items = {}
+        rows = []
+        for i, group in enumerate(self.groups):
+            items = group_items[i * GROUP_ITEMS : (i + 1) * GROUP_ITEMS]
+            self.group_items[group.id] = [item.id for item in items]
+            rows += [(group.id, item.id) for item in items]
+        self.link(Group.items, rows, sorted_m2m=True)
+
+    def build_indicator(self, code, data_type, kind):
+        indicator = Indicator(
+            id=self.uuid(),
+            code=code,
+            version="1",
+            name=f"{code} {self.rng.choice(WORDS)}",
+            is_direct_indicator=True,
+            data_type=data_type,
+            mandatory=self.rng.random() < 0.5,
+        )
+        if data_type in Indicator.list_types:
+            indicator.list_options_id = self.rng.choice(self.lists).id
+        if kind:
+            indicator.is_group_indicator = True
+            indicator.group_id = self.groups[0].id
+            indicator.group_total = data_type in Indicator.numeric_types
+        if kind == "table":
+            indicator.group_2_id = self.groups[1].id
+            indicator.group_2_total = True
+        return indicator
+
+    def create_methods(self):
+        self.log("Creating methods...")
+        sets_count = max(1, (self.indicators_count - len(INDICATOR_KINDS)) // 10)
+        direct_count = self.indicators_count - sets_count * INDICATORS_PER_SET
+
+        self.methods = []
+        self.method_indicators = {}
+        self.method_sets = {}
+        indicators = []
+        indicators_sets = []
+        set_rows = []
+        for m in range(1, self.methods_count + 1):
+            method = Method(
+                id=self.uuid(),
+                name=self.name("Method", m),
+                description=self.rng.choice(WORDS),
+                version="1",
+            )
+            self.methods.append(method)
+            method_indicators = [
+                self.build_indicator(
+                    f"{self.prefix}-M{m}-I{i}",
+                    *INDICATOR_KINDS[i % len(INDICATOR_KINDS)],
+                )
+                for i in range(direct_count)
+            ]
+            self.method_indicators[method.id] = method_indicators
+            indicators += method_indicators
+
+            self.method_sets[method.id] = []
+            for s in range(sets_count):
+                indicators_set = IndicatorsSet(
+                    id=self.uuid(),
+                    code=f"{self.prefix}-M{m}-S{s}",
+                    version="1",
+                    name=self.name("Set", s),
+                    instance_name=self.rng.choice(WORDS),
+                )
+                set_indicators = [
+                    self.build_indicator(
+                        f"{self.prefix}-M{m}-S{s}-I{i}", data_type, kind
+                    )
+                    for i, (data_type, kind) in enumerate(SET_KINDS)
+                ]
+                indicators += set_indicators
+                indicators_sets.append(indicators_set)
+                self.method_sets[method.id].append((indicators_set, set_indicators))
+                set_rows += [
+                    (indicators_set.id, indicator.id) for indicator in set_indicators
+                ]
+
+        self.bulk_create(Method, self.methods)
+        self.bulk_create(Indicator, indicators)
+        self.bulk_create(IndicatorsSet, indicators_sets)
+        self.link(IndicatorsSet.indicators, set_rows, sorted_m2m=True)
+        self.link(
+            Indicator.topics,
+            [
+                (indicator.id, self.rng.choice(self.topics).id)
+                for indicator in indicators
+            ],
+        )
+        # The indicators of the sets are also indicators of the method, as the
+        # form only has fields for the latter
+        self.link(
+            Method.indicators,
+            [
+                (method.id, indicator.id)
+                for method in self.methods
+                for indicator in self.method_indicators[method.id]
+                + [
+                    indicator
+                    for _, set_indicators in self.method_sets[method.id]
+                    for indicator in set_indicators
+                ]
+            ],
+        )
+        self.link(
+            Method.indicators_sets,
+            [
+                (method_id, indicators_set.id)
+                for method_id, sets in self.method_sets.items()
+                for indicators_set, _ in sets
+            ],
+        )
+        self.link(
+            Method.region1, [(method.id, self.region1.id) for method in self.methods]
+        )
+        self.link(
+            Method.legal_structures,
+            [(method.id, self.legal_structure.id) for method in self.methods],
+        )
+        self.create_sections()
+
+    def create_sections(self):
+        """
+        Splits the indicators of every method in sections, every other one being
+        a subsection of the previous section, and adds each set to a section.
+        """
+        sections = []
+        indicator_rows = []
+        set_rows = []
+        for method in self.methods:
+            method_indicators = self.method_indicators[method.id]
+            chunks = [
+                method_indicators[i : i + INDICATORS_PER_SECTION]
+                for i in range(0, len(method_indicators), INDICATORS_PER_SECTION)
+            ]
+            method_sections = []
+            parent = None
+            for order, chunk in enumerate(chunks):
+                section = Section(
+                    id=self.uuid(),
+                    title=self.name("Section", order + 1),
+                    method=method,
+                    order=order,
+                    parent=parent if order % 2 else None,
+                )
+                parent = section
+                method_sections.append(section)
+                indicator_rows += [(section.id, indicator.id) for indicator in chunk]
+            for i, (indicators_set, _) in enumerate(self.method_sets[method.id]):
+                section = method_sections[i % len(method_sections)]
+                set_rows.append((section.id, indicators_set.id))
+            sections += method_sections
+
+        self.bulk_create(Section, sections)
+        self.link(Section.indicators, indicator_rows, sorted_m2m=True)
+        self.link(Section.indicators_sets, set_rows, sorted_m2m=True)
+
+    def create_campaigns(self):
+        """
+        Creates a chain of yearly campaigns linked by their previous campaign,
+        the last one being the active one. All the methods are in every campaign.
+        """
+        self.log("Creating campaigns...")
+        self.campaigns = []
+        previous = None
+        first_year = self.now.year - self.campaigns_count + 1
+        for i in range(self.campaigns_count):
+            year = first_year + i
+            campaign = Campaign(
+                id=self.uuid(),
+                name=self.name("Campaign", year),
+                year=str(year),
+                status=i == self.campaigns_count - 1,
+                previous_campaign=previous,
+                start_date=datetime.date(year, 1, 1),
+                end_date=datetime.date(year, 12, 31),
+            )
+            self.campaigns.append(campaign)
+            previous = campaign
+        self.bulk_create(Campaign, self.campaigns)
+        self.link(
+            Campaign.methods,
+            [
+                (campaign.id, method.id)
+                for campaign in self.campaigns
+                for method in self.methods
+            ],
+        )
+
+    def create_networks(self):
+        self.log("Creating networks...")
+        self.networks = self.bulk_create(
+            Network,
+            [
+                Network(
+                    id=self.uuid(),
+                    name=self.name("Network", i),
+                    network_type=self.prefix,
+                )
+                for i in range(1, self.networks_count + 1)
+            ],
+        )
+        self.link(
+            Network.methods,
+            [
+                (network.id, method.id)
+                for network in self.networks
+                for method in self.methods
+            ],
+        )
+        self.link(
+            Network.campaigns,
+            [
+                (network.id, campaign.id)
+                for network in self.networks
+                for campaign in self.campaigns
+            ],
+        )
+
+    def create_organizations(self):
+        """
+        Creates the accepted organizations with their user and profile. Each one
+        joins a network and answers one or more of the methods.
+        """
+        self.log("Creating organizations and users...")
+        password = make_password(self.password)
+        organizations = []
+        users = []
+        profiles = []
+        method_rows = []
+        network_rows = []
+        self.organization_methods = {}
+        for i in range(1, self.organizations_count + 1):
+            city_index = self.rng.randrange(len(self.cities))
+            organization = Organization(
+                id=self.uuid(),
+                name=self.name("Organization", i),
+                description=self.rng.choice(WORDS),
+                vat_number=f"{self.prefix}{i:08}",
+                country=self.country,
+                region1=self.region1,
+                city=self.cities[city_index],
+                zip_code=self.zip_codes[city_index],
+                address=f"{self.rng.choice(WORDS).title()} street {i}",
+                status=Organization.Status.ACCEPTED,
+                resolution_date=self.now,
+                legal_structure=self.legal_structure,
+                privacy_policy_accepted=self.now,
+            )
+            organizations.append(organization)
+            user = User(
+                id=self.uuid(),
+                name=self.name("User", i),
+                email=f"{self.prefix.lower()}-{i}@example.com",
+                password=password,
+                email_verified=True,
+            )
+            users.append(user)
+            profiles.append(
+                UserProfile(id=self.uuid(), user=user, organization=organization)
+            )
+
+            methods = self.rng.sample(
+                self.methods, self.rng.randint(1, min(2, len(self.methods)))
+            )
+            self.organization_methods[organization.id] = (user, methods)
+            method_rows += [(organization.id, method.id) for method in methods]
+            network = self.networks[i % len(self.networks)]
+            network_rows.append((network.id, organization.id))
+
+        self.bulk_create(Organization, organizations)
+        self.bulk_create(User, users)
+        self.bulk_create(UserProfile, profiles)
+        self.link(Organization.methods, method_rows)
+        self.link(Network.organizations, network_rows)
+        self.organizations = organizations
+
+    def create_surveys(self):
+        """
+        Creates the surveys going through the organizations in turns, so they are
+        spread over the organizations, campaigns and methods. Surveys of past
+        campaigns are closed or validated, and those of the active one are open
+        or closed.
+        """
+        self.log("Creating surveys...")
+        pending = {
+            organization.id: [
+                (campaign, method)
+                for campaign in reversed(self.campaigns)
+                for method in self.organization_methods[organization.id][1]
+            ]
+            for organization in self.organizations
+        }
+        self.surveys = []
+        while len(self.surveys) < self.surveys_count and any(pending.values()):
+            for organization in self.organizations:
+                if len(self.surveys) == self.surveys_count:
+                    break
+                if not pending[organization.id]:
+                    continue
+                campaign, method = pending[organization.id].pop(0)
+                self.surveys.append(self.build_survey(organization, campaign, method))
+        self.bulk_create(Survey, self.surveys)
+
+    def build_survey(self, organization, campaign, method):
+        statuses = Survey.Status
+        if campaign.status:
+            status = self.rng.choice([statuses.OPEN, statuses.OPEN, statuses.CLOSED])
+        else:
+            status = self.rng.choice(
+                [statuses.CLOSED, statuses.TECH_VALIDATED, statuses.QUALITY_CHECKED]
+            )
+        start_date = timezone.make_aware(
+            datetime.datetime(int(campaign.year), 1, 1)
+        ) + datetime.timedelta(days=self.rng.randrange(180))
+        modified_date = start_date + datetime.timedelta(days=self.rng.randrange(60))
+        return Survey(
+            id=self.uuid(),
+            method=method,
+            campaign=campaign,
+            user=self.organization_methods[organization.id][0],
+            organization=organization,
+            status=status,
+            start_date=start_date,
+            modified_date=modified_date,
+            closed_date=modified_date if status >= statuses.CLOSED else None,
+            validated_date=modified_date if status >= statuses.TECH_VALIDATED else None,
+            evaluated_date=(
+                modified_date if status >= statuses.QUALITY_CHECKED else None
+            ),
+        )
+
+    def create_results(self):
+        """
+        Answers each indicator of every survey with the fill ratio probability,
+        storing the same rows as the method form does. Results are written in
+        batches, so memory doesn't grow with the number of surveys.
+        """
+        self.log("Creating indicator results...")
+        batch = []
+        for survey in self.surveys:
+            for indicator in self.method_indicators[survey.method_id]:
+                if self.rng.random() < self.fill_ratio:
+                    batch += self.build_results(survey, indicator)
+            for _, set_indicators in self.method_sets[survey.method_id]:
+                for instance_number in range(
+                    1, self.rng.randint(1, MAX_SET_INSTANCES) + 1
+                ):
+                    for indicator in set_indicators:
+                        if self.rng.random() < self.fill_ratio:
+                            batch += self.build_results(
+                                survey, indicator, instance_number
+                            )
+            if len(batch) >= self.batch_size:
+                self.bulk_create(IndicatorResult, batch)
+                batch = []
+        if batch:
+            self.bulk_create(IndicatorResult, batch)
+        self.stats.setdefault("indicatorresult", 0)
+
+    def build_results(self, survey, indicator, instance_number=0):
+        def result(value, **kwargs):
+            return IndicatorResult(
+                id=self.uuid(),
+                survey=survey,
+                indicator=indicator,
+                instance_number=instance_number,
+                value=value,
+                **kwargs,
+            )
+
+        data_type = indicator.data_type
+        if data_type in (DataType.INTEGERGENDER, DataType.DECIMALGENDER):
+            return [
+                result(self.build_value(data_type), gender=gender)
+                for gender in IndicatorResult.Gender
+            ]
+
+        if not indicator.is_group_indicator:
+            return [result(self.build_value(data_type, indicator.list_options_id))]
+
+        is_numeric = data_type in Indicator.numeric_types
+        group_items = self.group_items[indicator.group_id]
+        if indicator.group_2_id is None:
+            results = [
+                result(self.build_value(data_type), group_item_id=item_id)
+                for item_id in group_items
+            ]
+        else:
+            group_2_items = self.group_items[indicator.group_2_id]
+            results = [
+                result(
+                    self.build_value(data_type),
+                    group_item_id=item_id,
+                    group_2_item_id=item_2_id,
+                )
+                for item_id in group_items
+                for item_2_id in group_2_items
+            ]
+            results += [
+                result(
+                    self.build_total(data_type), group_item_id=item_id, is_total=True
+                )
+                for item_id in group_items
+            ]
+            if is_numeric:
+                results += [
+                    result(
+                        self.build_total(data_type),
+                        group_2_item_id=item_2_id,
+                        is_total=True,
+                    )
+                    for item_2_id in group_2_items
+                ]
+        if is_numeric:
+            results.append(result(self.build_total(data_type), is_total=True))
+        return results
+
+    def build_value(self, data_type, list_id=None):
+        rng = self.rng
+        if data_type in (DataType.INTEGER, DataType.INTEGERGENDER):
+            return str(rng.randint(0, 500))
+        if data_type in (DataType.DECIMAL, DataType.DECIMALGENDER):
+            return f"{rng.uniform(0, 1000):.2f}"
+        if data_type == DataType.BOOLEAN:
+            return rng.choice(["on", ""])
+        if data_type == DataType.DATE:
+            date = self.now.date() - datetime.timedelta(days=rng.randrange(3650))
+            return date.isoformat()
+        if data_type == DataType.ATTACHMENT:
+            return f"{rng.choice(WORDS)}.pdf"
+        if data_type == DataType.CHECKBOX:
+            titles = self.list_titles[list_id]
+            return "|".join(rng.sample(titles, rng.randint(1, len(titles))))
+        if data_type in (DataType.RADIOBUTTON, DataType.DROPDOWN):
+            return rng.choice(self.list_titles[list_id])
+        if data_type == DataType.TEXT:
+            return " ".join(rng.choices(WORDS, k=rng.randint(10, 40)))
+        return " ".join(rng.choices(WORDS, k=rng.randint(1, 4)))
+
+    def build_total(self, data_type):
+        # Totals are computed in the form, the generated ones are only plausible
+        if data_type == DataType.DECIMAL:
+            return f"{self.rng.uniform(0, 3000):.2f}"
+        if data_type == DataType.INTEGER:
+            return str(self.rng.randint(0, 1500))
+        return ""
@@ -1,12 +1,17 @@
+from django.contrib.auth.decorators import login_not_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.urls import NoReverseMatch, reverse, reverse_lazy
 from django.utils.translation import activate, get_language
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_http_methods
 from django.views.generic import RedirectView, TemplateView
 
-from apps.methods.helpers import get_form_sections, get_survey_stats
-from apps.methods.models import Campaign, Survey
+from apps.methods.helpers import get_current_surveys_stats
+from apps.methods.models import Attachment, Method
 from apps.organizations.forms import ProjectCreationForm, ProjectSelectionForm
 from apps.organizations.models import Organization
+from project.utils.media import serve_file
 
 
 class RootRedirectView(RedirectView):
@@ -37,7 +42,6 @@ class HomeView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        method_list = []
         current_surveys_stats = []
         organization_accepted = False
         organization = None
@@ -47,37 +51,7 @@ class HomeView(TemplateView):
                 self.request.user.profile.organization.status
                 == Organization.Status.ACCEPTED
             )
-            open_campaigns = Campaign.objects.filter(status=True).all()
-            for open_campaign in open_campaigns:
-                for method in self.request.user.profile.organization.methods.filter(
-                    id__in=open_campaign.methods.all()
-                ):
-                    method.sections = get_form_sections(method)
-                    method.campaign = {
-                        "id": open_campaign.id,
-                        "name": open_campaign.name,
-                    }
-                    method_list.append(method)
-
-            surveys = Survey.objects.filter(
-                user=self.request.user,
-                campaign__status=True,
-            )
-
-            for method in method_list:
-                survey = next(
-                    (
-                        s
-                        for s in surveys
-                        if s.method_id == method.id
-                        and s.campaign_id == method.campaign["id"]
-                    ),
-                    None,
-                )
-
-                current_surveys_stats.append(
-                    get_survey_stats(survey, method, method.campaign)
-                )
+            current_surveys_stats = get_current_surveys_stats(self.request.user)
 
         self.request.user.is_syh_admin = self.request.user.groups.filter(
             name__in=["Governance Admins", "Network Admins"]
@@ -129,3 +103,102 @@ class StandardSuccess(TemplateView):
 
     def get_link_text(self):
         return self.link_text
+
+
+def is_governance_admin(user):
+    return user.is_superuser or user.groups.filter(name="Governance Admins").exists()
+
+
+def get_user_organization(user):
+    if not user.is_authenticated or not hasattr(user, "profile"):
+        return None
+    return user.profile.organization
+
+
+def can_view_documentation(user, method):
+    # Organizations of the networks of the method, and their admins
+    organization = get_user_organization(user)
+    if organization is None:
+        return False
+    return (
+        is_governance_admin(user)
+        or method.networks.filter(organizations=organization).exists()
+        or method.networks.filter(pk=organization.network_managed_id).exists()
+    )
+
+
+def can_view_logo(user, organization):
+    if organization.bs_allow_public:
+        return True
+    user_organization = get_user_organization(user)
+    if user_organization is None:
+        return False
+    return (
+        user_organization == organization
+        or is_governance_admin(user)
+        or organization.networks.filter(
+            pk=user_organization.network_managed_id
+        ).exists()
+    )
+
+
+def can_view_attachment(request, attachment):
+    user = request.user
+    # Before its survey is saved, only who uploaded it
+    if user.is_authenticated and attachment.created_by_id == user.pk:
+        return True
+    token = request.GET.get("token")
+    if token and token == attachment.token:
+        return True
+    survey = attachment.survey
+    user_organization = get_user_organization(user)
+    if survey is None or user_organization is None:
+        return False
+    return (
+        survey.organization_id == user_organization.pk
+        or is_governance_admin(user)
+        or survey.method.networks.filter(
+            pk=user_organization.network_managed_id
+        ).exists()
+    )
+
+
+@login_not_required
+@require_http_methods(["GET", "HEAD"])
+def protected_media(request, kind, object_id):
+    """
+    Serves the files that aren't public: the documentation of the methods, the
+    logos of the organizations that don't share their data, and the attachments
+    of the surveys, once the user is allowed to get them. Files the user can't
+    get are not found, so their existence isn't leaked.
+    """
+    if kind == "documentation":
+        method = get_object_or_404(Method, pk=object_id)
+        if not method.documentation or not can_view_documentation(request.user, method):
+            raise Http404
+        return serve_file(request, "default", method.documentation.name)
+
+    if kind == "logo":
+        organization = get_object_or_404(Organization, pk=object_id)
+        if not organization.logo or not can_view_logo(request.user, organization):
+            raise Http404
+        rendition = organization.get_logo_rendition(request.GET.get("rendition"))
+        return serve_file(request, "default", rendition or organization.logo.name)
+
+    if kind == "attachment":
+        attachment = get_object_or_404(
+            Attachment.objects.select_related("survey__method"),
+            pk=object_id,
+            status=Attachment.Status.COMPLETE,
+        )
+        if not can_view_attachment(request, attachment):
+            raise Http404
+        return serve_file(
+            request,
+            "attachments",
+            attachment.path,
+            filename=attachment.name,
+            as_attachment=True,
+        )
+
+    raise Http404